@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+집계 모듈 패키지
+"""
+
+from .binning import resolve_bands, bin_codes, band_categorical, binned_totals, quantile_scores
+from .partial import (
+    COUNT_COLUMN,
+    PartialAggregate,
+    summarize_rows,
+    merge_summaries,
+    summary_mean_columns,
+    is_summary,
+    transaction_count,
+)
+from .frame_memo import FrameMemo
+from .cube import build_cube, get_cube, seed_cube
+from .time_index import TimeIndex, date_index, date_range_slice, time_index
+from .time_series import DailySeries, daily_series
+from .cohort import cohort_matrices
+from .concentration import Concentration
+from .kpi_kernel import compute_kpi_totals, distinct_count, frame_distinct, kpi_totals
+from .sketch import DistinctSketch, distinct_sketches, hll_estimate, use_sketch
+from .heavy_hitters import HeavyHitters, SpaceSaving
+from .rollups import ROLLUP_KEYS, compute_rollups, merge_rollups
+
+__all__ = [
+    'resolve_bands',
+    'bin_codes',
+    'band_categorical',
+    'binned_totals',
+    'quantile_scores',
+    'COUNT_COLUMN',
+    'PartialAggregate',
+    'summarize_rows',
+    'merge_summaries',
+    'summary_mean_columns',
+    'is_summary',
+    'transaction_count',
+    'FrameMemo',
+    'build_cube',
+    'compute_kpi_totals',
+    'distinct_count',
+    'kpi_totals',
+    'frame_distinct',
+    'DistinctSketch',
+    'distinct_sketches',
+    'hll_estimate',
+    'use_sketch',
+    'get_cube',
+    'seed_cube',
+    'TimeIndex',
+    'date_index',
+    'date_range_slice',
+    'time_index',
+    'DailySeries',
+    'daily_series',
+    'cohort_matrices',
+    'Concentration',
+    'HeavyHitters',
+    'SpaceSaving',
+    'ROLLUP_KEYS',
+    'compute_rollups',
+    'merge_rollups',
+]
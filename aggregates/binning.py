@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+구간 집계 모듈
+값을 구간(단가대, 할인율 구간 등)으로 나누고 구간별 합계를 계산하는 엔진입니다.
+구간 번호는 정렬된 경계값에 대한 searchsorted로, 구간별 합계는 가중치 bincount로 계산하므로
+데이터프레임을 복사하거나 구간 컬럼을 추가하지 않습니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _format_edge(value):
+    """구간 라벨에 쓸 경계값 문자열을 만듭니다."""
+    if np.isinf(value):
+        return '∞'
+    return f"{value:,.0f}" if abs(value) >= 10 else f"{value:g}"
+
+
+def resolve_bands(bands, values=None):
+    """
+    구간 설정을 (경계값 배열, 라벨 리스트)로 변환합니다.
+
+    Args:
+        bands: {'bins': 경계값, 'labels': 라벨} 또는 {'quantiles': 구간 수}
+               (라벨이 없으면 경계값으로 '하한-상한' 라벨을 만듦)
+        values: 분위수 구간을 계산할 값 배열 (quantiles 설정일 때 필요)
+    """
+    if 'quantiles' in bands:
+        if values is None:
+            raise ValueError("분위수 구간은 값 배열이 있어야 계산할 수 있습니다.")
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        probs = np.linspace(0, 1, int(bands['quantiles']) + 1)
+        edges = np.unique(np.quantile(values, probs)) if len(values) else np.array([0.0, 1.0])
+        if len(edges) == 1:
+            # 모든 값이 같으면 그 값을 포함하는 구간 하나
+            edges = np.r_[edges, edges]
+        # 첫 구간이 최소값을 포함하도록 하한을 바로 아래 값으로 내림 (구간은 (하한, 상한])
+        edges[0] = np.nextafter(edges[0], -np.inf)
+    else:
+        edges = np.asarray(bands['bins'], dtype=np.float64)
+    if len(edges) < 2 or (np.diff(edges) <= 0).any():
+        raise ValueError(f"구간 경계값은 2개 이상이고 증가해야 합니다: {list(edges)}")
+
+    labels = bands.get('labels')
+    if labels is None:
+        labels = [f"{_format_edge(lo)}-{_format_edge(hi)}" for lo, hi in zip(edges[:-1], edges[1:])]
+    if len(labels) != len(edges) - 1:
+        raise ValueError("구간 라벨 수는 경계값 수보다 하나 적어야 합니다.")
+    return edges, list(labels)
+
+
+def bin_codes(values, edges):
+    """
+    값마다 구간 번호를 계산합니다. 구간은 pd.cut과 같이 (하한, 상한]이며,
+    어느 구간에도 속하지 않거나 결측인 값은 -1입니다.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.searchsorted(edges, values, side='left') - 1
+    # 결측(NaN)은 searchsorted에서 맨 뒤로 정렬되어 마지막 경계 밖으로 처리됨
+    codes[(codes < 0) | (codes >= len(edges) - 1)] = -1
+    return codes
+
+
+def band_categorical(values, bands):
+    """값을 구간 라벨 범주형으로 변환합니다. (pd.cut과 같은 결과)"""
+    edges, labels = resolve_bands(bands, values)
+    return pd.Categorical.from_codes(bin_codes(values, edges), categories=labels, ordered=True)
+
+
+def binned_totals(codes, n_bins, weights, mask=None):
+    """
+    구간별 합계를 계산합니다.
+
+    Args:
+        codes: 구간 번호 배열 (-1은 제외)
+        n_bins: 구간 수
+        weights: {결과 이름: 가중치 배열, None이면 행 수}
+        mask: 포함할 행의 불리언 배열 (None이면 전체)
+
+    Returns:
+        {결과 이름: 구간별 합계 배열} (행 수는 정수, 가중치 합계는 결측을 제외한 실수)
+    """
+    valid = codes >= 0
+    if mask is not None:
+        valid &= mask
+    # 모든 행이 대상이면 불리언 인덱싱으로 배열을 복사하지 않음
+    take_all = bool(valid.all())
+    selected = codes if take_all else codes[valid]
+
+    totals = {}
+    for name, w in weights.items():
+        if w is None:
+            totals[name] = np.bincount(selected, minlength=n_bins)[:n_bins]
+            continue
+        w = np.asarray(w, dtype=np.float64)
+        w = w if take_all else w[valid]
+        sums = np.bincount(selected, weights=w, minlength=n_bins)[:n_bins]
+        if np.isnan(sums).any():
+            # 결측이 있을 때만 결측을 0으로 바꾼 사본으로 다시 합산
+            sums = np.bincount(selected, weights=np.nan_to_num(w), minlength=n_bins)[:n_bins]
+        totals[name] = sums
+    return totals
+
+
+def quantile_scores(values, n_scores, higher_is_better=True):
+    """
+    값을 분위수 순위로 1 ~ n_scores 점수로 변환합니다. (정렬 한 번, 동점은 같은 점수)
+
+    Args:
+        values: 값 배열 (결측은 점수 0)
+        n_scores: 점수 단계 수 (예: 5이면 상위 20%가 5점)
+        higher_is_better: False이면 작은 값이 높은 점수 (예: 최근 구매 후 경과 일수)
+    """
+    values = pd.Series(np.asarray(values, dtype=np.float64))
+    pct = values.rank(method='average', pct=True, ascending=higher_is_better).to_numpy()
+    return np.ceil(np.nan_to_num(pct) * n_scores).astype(np.int64)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+코호트 집계 모듈
+거래처를 첫 구매 기간(코호트)으로 묶고 코호트 × 경과 기간별 활성 거래처 수와 매출액을 계산합니다.
+거래처는 범주 코드(정수), 기간은 정수 기간 키로 다루며, 첫 구매 기간은 거래처별 최소값,
+행렬은 (코호트, 경과 기간) 칸 번호의 bincount로 계산하므로 거래처마다 반복하지 않습니다.
+"""
+
+import numpy as np
+
+
+def cohort_matrices(customer_codes, period_keys, weights=None, n_customers=None):
+    """
+    코호트 × 경과 기간 행렬을 계산합니다.
+
+    Args:
+        customer_codes: 행별 거래처 코드 배열 (0 이상, 음수는 결측으로 제외)
+        period_keys: 행별 정수 기간 키 배열 (예: 년월키, 결측 행은 customer_codes를 음수로 표시)
+        weights: 행별 매출액 배열 (None이면 매출 행렬을 계산하지 않음)
+        n_customers: 거래처 코드 수 (None이면 최대 코드 + 1)
+
+    Returns:
+        {
+            'cohorts': 코호트 기간 키 배열 (거래처가 있는 코호트만, 시간순),
+            'sizes': 코호트별 거래처 수,
+            'active': 코호트 × 경과 기간 활성 거래처 수 (float, 관측 기간 밖은 NaN),
+            'revenue': 코호트 × 경과 기간 매출액 (weights가 None이면 None, 관측 기간 밖은 NaN),
+        }
+        경과 기간 0은 첫 구매 기간이며, 관측 기간 밖은 코호트 시작 후 데이터 마지막 기간을 넘는 칸입니다.
+    """
+    codes = np.asarray(customer_codes, dtype=np.int64)
+    keys = np.asarray(period_keys, dtype=np.int64)
+    valid = codes >= 0
+    if not valid.all():
+        codes, keys = codes[valid], keys[valid]
+        weights = None if weights is None else np.asarray(weights)[valid]
+    if len(codes) == 0:
+        empty = np.zeros((0, 0))
+        return {'cohorts': np.array([], dtype=np.int64), 'sizes': np.array([], dtype=np.int64),
+                'active': empty, 'revenue': None if weights is None else empty}
+
+    n_customers = n_customers or int(codes.max()) + 1
+    first_key = int(keys.min())
+    n_periods = int(keys.max()) - first_key + 1
+    offsets = keys - first_key
+
+    # 거래처별 첫 구매 기간 (구매가 없는 거래처는 n_periods)
+    first = np.full(n_customers, n_periods, dtype=np.int64)
+    np.minimum.at(first, codes, offsets)
+    cohort = first[codes]
+    age = offsets - cohort
+
+    # 코호트 × 경과 기간 칸 번호 (코호트와 경과 기간 모두 0 ~ n_periods - 1)
+    cells = cohort * n_periods + age
+    n_cells = n_periods * n_periods
+
+    # 활성 거래처 수: 같은 (거래처, 칸)은 한 번만 세도록 (거래처, 기간) 조합을 정렬해 중복을 제거한 뒤 bincount
+    pairs = np.sort(codes * n_periods + offsets)
+    pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]]
+    pair_codes, pair_offsets = np.divmod(pairs, n_periods)
+    pair_cohort = first[pair_codes]
+    active = np.bincount(pair_cohort * n_periods + (pair_offsets - pair_cohort), minlength=n_cells)
+    active = active.reshape(n_periods, n_periods).astype(np.float64)
+
+    revenue = None
+    if weights is not None:
+        weights = np.nan_to_num(np.asarray(weights, dtype=np.float64))
+        revenue = np.bincount(cells, weights=weights, minlength=n_cells).reshape(n_periods, n_periods)
+
+    # 관측 기간 밖(코호트 시작 + 경과 기간 > 마지막 기간)은 NaN
+    unobserved = np.add.outer(np.arange(n_periods), np.arange(n_periods)) >= n_periods
+    active[unobserved] = np.nan
+    if revenue is not None:
+        revenue[unobserved] = np.nan
+
+    sizes = np.bincount(first[first < n_periods], minlength=n_periods)
+    present = sizes > 0
+    return {
+        'cohorts': np.flatnonzero(present) + first_key,
+        'sizes': sizes[present],
+        'active': active[present],
+        'revenue': None if revenue is None else revenue[present],
+    }
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+집중도 엔진 모듈
+거래처/제품/분류별 매출액을 한 번 내림차순 정렬하고 누적합 배열을 한 번 만들어 두면
+파레토/로렌츠 곡선, ABC 등급 경계, 지니 계수, HHI를 계산하고,
+"상위 N개의 비중"은 누적합 조회(O(1)), "X% 비중에 필요한 개수"는 이진 탐색(O(log n))으로 답합니다.
+"""
+
+import numpy as np
+import pandas as pd
+from config import CONCENTRATION_CONFIG
+
+# ABC 등급 라벨 (등급 경계 수 + 1개까지 사용)
+ABC_LABELS = ['A', 'B', 'C', 'D', 'E']
+
+
+def _result(values):
+    """스칼라 입력이면 스칼라, 배열 입력이면 배열을 반환합니다."""
+    return values.item() if np.ndim(values) == 0 else values
+
+
+class Concentration:
+    """
+    정렬된 누적합 배열 기반 집중도 클래스
+    음수 값(반품이 매출보다 큰 경우)과 결측값은 0으로 보므로 누적 비중은 항상 단조 증가합니다.
+    """
+
+    def __init__(self, values, labels=None):
+        """
+        Args:
+            values: 항목별 값 (pd.Series이면 인덱스를 라벨, 인덱스 이름/시리즈 이름을 컬럼명으로 사용)
+            labels: 항목 라벨 배열 (values가 pd.Series가 아닐 때, None이면 0부터의 번호)
+        """
+        if isinstance(values, pd.Series):
+            self.label_name = values.index.name or '항목'
+            self.value_name = values.name or '값'
+            labels = values.index.to_numpy()
+        else:
+            self.label_name, self.value_name = '항목', '값'
+        raw = np.asarray(values, dtype=np.float64)
+        raw = np.clip(np.nan_to_num(raw), 0, None)
+        labels = np.arange(len(raw)) if labels is None else np.asarray(labels)
+
+        # 한 번의 안정 정렬(값 내림차순, 동점은 입력 순서)과 한 번의 누적합
+        order = np.argsort(-raw, kind='stable')
+        self.values = raw[order]
+        self.labels = labels[order]
+        self.prefix = np.r_[0.0, np.cumsum(self.values)]
+        self.total = float(self.prefix[-1])
+        # 결과 캐시에 저장되어 여러 호출자가 공유하므로 배열을 읽기 전용으로 둠
+        for array in (self.values, self.labels, self.prefix):
+            array.flags.writeable = False
+
+    def __len__(self):
+        return len(self.values)
+
+    def top_share(self, n):
+        """
+        상위 n개 항목의 비중(%)을 반환합니다. n은 정수 또는 정수 배열이며 항목 수를 넘으면 100%입니다.
+        합계가 0이면 NaN입니다.
+        """
+        n = np.clip(np.asarray(n, dtype=np.int64), 0, len(self))
+        if self.total <= 0:
+            return _result(np.full(np.shape(n), np.nan))
+        return _result(self.prefix[n] / self.total * 100)
+
+    def top_percent_share(self, percent):
+        """상위 percent(%) 항목(개수 올림)의 비중(%)을 반환합니다. (예: 상위 20% 거래처의 매출 비중)"""
+        n = np.ceil(np.asarray(percent, dtype=np.float64) / 100 * len(self)).astype(np.int64)
+        return self.top_share(n)
+
+    def count_for_share(self, share):
+        """
+        누적 비중이 share(%) 이상이 되는 데 필요한 최소 항목 수를 반환합니다. (이진 탐색)
+        share가 0 이하이거나 합계가 0이면 0입니다.
+        """
+        share = np.asarray(share, dtype=np.float64)
+        if self.total <= 0:
+            return _result(np.zeros(np.shape(share), dtype=np.int64))
+        # 부동소수점 오차로 100%를 넘지 못하는 일이 없도록 목표를 합계 이하로 제한
+        target = np.minimum(share / 100 * self.total, self.total)
+        counts = np.searchsorted(self.prefix, target, side='left')
+        return _result(np.where(share > 0, counts, 0))
+
+    def abc_counts(self, boundaries=None):
+        """
+        ABC 등급별 항목 수를 반환합니다. 등급 경계를 넘기는 항목까지 앞 등급에 포함합니다.
+
+        Args:
+            boundaries: 누적 비중 경계(%) 리스트 (None이면 CONCENTRATION_CONFIG 설정, 예: (80, 95))
+
+        Returns:
+            등급별 항목 수 배열 (길이 = 경계 수 + 1)
+        """
+        boundaries = CONCENTRATION_CONFIG['abc_boundaries'] if boundaries is None else boundaries
+        cuts = np.r_[0, np.maximum.accumulate(self.count_for_share(np.asarray(boundaries))), len(self)]
+        return np.diff(cuts)
+
+    def abc_summary(self, boundaries=None):
+        """
+        ABC 등급별 요약을 반환합니다.
+
+        Returns:
+            등급, 항목수, 항목비중, 값 합계, 비중 컬럼의 데이터프레임
+        """
+        counts = self.abc_counts(boundaries)
+        cuts = np.r_[0, np.cumsum(counts)]
+        sums = self.prefix[cuts[1:]] - self.prefix[cuts[:-1]]
+        total = self.total if self.total > 0 else np.nan
+        return pd.DataFrame({
+            '등급': ABC_LABELS[:len(counts)],
+            '항목수': counts,
+            '항목비중': np.round(counts / max(len(self), 1) * 100, 1),
+            self.value_name: sums,
+            '비중': np.round(sums / total * 100, 1),
+        })
+
+    def curve(self, boundaries=None):
+        """
+        파레토 곡선(항목별 값 내림차순, 누적 비중)을 반환합니다.
+
+        Returns:
+            순위, 라벨, 값, 비중, 누적비중, 누적항목비중, 등급 컬럼의 데이터프레임
+        """
+        n = len(self)
+        total = self.total if self.total > 0 else np.nan
+        counts = self.abc_counts(boundaries)
+        return pd.DataFrame({
+            '순위': np.arange(1, n + 1),
+            self.label_name: self.labels,
+            self.value_name: self.values,
+            '비중': self.values / total * 100,
+            '누적비중': self.prefix[1:] / total * 100,
+            '누적항목비중': np.arange(1, n + 1) / max(n, 1) * 100,
+            '등급': np.repeat(ABC_LABELS[:len(counts)], counts),
+        })
+
+    def lorenz_curve(self):
+        """
+        로렌츠 곡선 좌표를 반환합니다. 값이 작은 항목부터 누적하며 (0, 0)에서 (100, 100)까지입니다.
+        오름차순 누적합은 내림차순 누적합에서 뺄셈으로 구하므로 다시 정렬하지 않습니다.
+
+        Returns:
+            (누적 항목 비중(%) 배열, 누적 값 비중(%) 배열)
+        """
+        n = len(self)
+        total = self.total if self.total > 0 else np.nan
+        ascending = self.total - self.prefix[::-1]
+        return np.arange(n + 1) / max(n, 1) * 100, ascending / total * 100
+
+    @property
+    def gini(self):
+        """지니 계수 (0 = 모든 항목이 같은 값, 1에 가까울수록 소수 항목에 집중)"""
+        n = len(self)
+        if n == 0 or self.total <= 0:
+            return np.nan
+        # 오름차순 순위 i(1..n)에 대해 G = Σ(2i - n - 1)·x_i / (n·Σx), 내림차순 순위 j = n + 1 - i
+        ranks = np.arange(n, 0, -1)
+        return float(np.dot(2 * ranks - n - 1, self.values) / (n * self.total))
+
+    @property
+    def hhi(self):
+        """허핀달-허쉬만 지수 (비중(%) 제곱합, 0~10,000, 한 항목이 전부이면 10,000)"""
+        if self.total <= 0:
+            return np.nan
+        return float(np.sum((self.values / self.total * 100) ** 2))
+
+    def summary(self, top_n=None, boundaries=None):
+        """
+        주요 집중도 지표를 반환합니다.
+
+        Args:
+            top_n: 비중을 계산할 상위 항목 수 리스트 (None이면 CONCENTRATION_CONFIG 설정)
+            boundaries: abc_counts 참고
+
+        Returns:
+            {'top_5': 상위 5개 비중(%), ..., 'count': 항목 수, 'gini': 지니 계수, 'hhi': HHI,
+             'abc': {'A': 항목 수, ...}} (비중은 소수 첫째 자리 반올림)
+        """
+        top_n = CONCENTRATION_CONFIG['top_n'] if top_n is None else top_n
+        shares = np.atleast_1d(self.top_share(np.asarray(top_n)))
+        result = {f'top_{n}': round(float(share), 1) for n, share in zip(top_n, shares)}
+        result['count'] = len(self)
+        result['gini'] = round(self.gini, 3)
+        result['hhi'] = round(self.hhi, 1)
+        counts = self.abc_counts(boundaries)
+        result['abc'] = dict(zip(ABC_LABELS, counts.tolist()))
+        return result
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+집계 큐브 모듈
+행 단위 판매 데이터를 (일자 × 분류명 × 제품 × 거래처명 × 할인적용 × 할인율 구간 × 단가대) 큐브로
+한 번만 집계하고, 모든 분석기가 이 큐브를 롤업하여 결과를 계산하도록 합니다.
+분석 비용은 원본 행 수가 아니라 큐브의 고유 키 개수에 비례합니다.
+큐브는 일자 순으로 정렬되어 있어 기간 필터와 기간 합계는 시간 인덱스(time_index)의 이진 탐색으로 처리합니다.
+"""
+
+from schema import apply_dtype_plan
+from time_keys import derive_time_keys
+from .frame_memo import FrameMemo
+from .partial import is_summary, summarize_rows
+
+
+def build_cube(df):
+    """
+    행 단위 데이터로부터 집계 큐브를 만듭니다.
+    큐브는 금액, 수량, 할인전금액, 할인액, Discount합 합계와 판매건수, Discount수(결측 아닌 할인율 개수)를 가지며,
+    시간 키(년, 월, 분기, 년월키, 분기키, 요일번호)는 일자 기준으로 다시 계산합니다.
+    이미 요약 데이터이면 그대로 반환합니다.
+    """
+    if is_summary(df):
+        return df
+    cube = summarize_rows(df)
+    for col, values in derive_time_keys(cube['날짜']).items():
+        cube[col] = values
+    return apply_dtype_plan(cube)
+
+
+def get_cube(df):
+    """
+    데이터프레임의 집계 큐브를 반환합니다. 같은 데이터프레임 객체에 대해서는 한 번만 만듭니다.
+    원본 데이터프레임이 메모리에서 사라지면 큐브도 함께 제거됩니다.
+    """
+    if is_summary(df):
+        return df
+    return _cube_memo(df)
+
+
+def seed_cube(df, cube):
+    """
+    디스크 캐시에서 읽은 큐브를 데이터프레임에 연결합니다.
+    이후 get_cube(df)는 큐브를 다시 만들지 않고 이 큐브를 반환합니다.
+    """
+    return _cube_memo.put(df, cube)
+
+
+_cube_memo = FrameMemo(build_cube)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+데이터프레임별 계산 결과 캐시 모듈
+같은 데이터프레임 객체에 대한 계산(큐브, 지문, KPI 합계 등)을 한 번만 수행합니다.
+"""
+
+import threading
+import weakref
+
+
+class FrameMemo:
+    """데이터프레임 객체별로 계산 결과를 보관하는 캐시 클래스 (객체가 사라지면 결과도 제거)"""
+    
+    def __init__(self, compute):
+        """
+        Args:
+            compute: 데이터프레임을 받아 결과를 반환하는 함수
+        """
+        self.compute = compute
+        self._results = {}   # id -> (약한 참조, 결과)
+        self._pending = {}   # id -> 계산 중인 스레드가 잡고 있는 잠금
+        self._lock = threading.Lock()
+    
+    def _lookup(self, df):
+        """저장된 결과를 (찾았는지 여부, 결과)로 반환합니다. (self._lock 안에서 호출)"""
+        entry = self._results.get(id(df))
+        if entry is not None and entry[0]() is df:
+            return True, entry[1]
+        return False, None
+    
+    def __call__(self, df):
+        """
+        데이터프레임의 계산 결과를 반환합니다. 처음 요청될 때만 계산합니다.
+        여러 스레드가 동시에 같은 데이터프레임을 요청하면 한 스레드만 계산하고 나머지는 결과를 기다립니다.
+        """
+        key = id(df)
+        with self._lock:
+            found, result = self._lookup(df)
+            if found:
+                return result
+            pending = self._pending.setdefault(key, threading.Lock())
+        
+        with pending:
+            with self._lock:
+                found, result = self._lookup(df)
+            if found:
+                return result
+            try:
+                return self.put(df, self.compute(df))
+            finally:
+                with self._lock:
+                    self._pending.pop(key, None)
+    
+    def put(self, df, result):
+        """미리 계산된 결과(예: 디스크 캐시에서 읽은 결과)를 데이터프레임에 연결합니다."""
+        key = id(df)
+        with self._lock:
+            self._results[key] = (weakref.ref(df, lambda _, key=key: self._results.pop(key, None)), result)
+        return result
+    
+    def __len__(self):
+        return len(self._results)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+헤비 히터 모듈
+청크 단위 또는 증분 추가로 들어오는 데이터에서 매출액/거래건수 상위 거래처와 제품을
+고정된 크기의 Space-Saving 요약으로 추적합니다.
+요약은 병합할 수 있고, 추정값마다 최대 과대 추정 오차를 함께 보관하므로
+상위 N개의 오차 범위를 제시하고 필요하면 원본 데이터로 정확한 값을 확인할 수 있습니다.
+"""
+
+import numpy as np
+import pandas as pd
+from config import HEAVY_HITTERS_CONFIG
+from .partial import COUNT_COLUMN, is_summary
+
+# 추적할 차원 컬럼
+HEAVY_HITTER_COLUMNS = ['거래처명', '제품명']
+
+# 추적 기준 (이름 -> 가중치 컬럼, None이면 거래 건수)
+HEAVY_HITTER_MEASURES = {
+    '금액': '금액',
+    '건수': None,
+}
+
+
+class SpaceSaving:
+    """
+    가중치 Space-Saving 요약 클래스
+    최대 capacity개의 키만 보관하며, 각 키의 추정값은 실제 값 이상이고
+    (추정값 - 오차)는 실제 값 이하입니다. 보관하지 않은 키의 실제 값은 floor 이하입니다.
+    """
+
+    def __init__(self, capacity=None, exact=False):
+        """
+        Args:
+            capacity: 보관할 최대 키 수 (None이면 HEAVY_HITTERS_CONFIG 설정)
+            exact: 등장한 모든 키의 정확한 값을 담은 요약인지 여부 (예: update의 배치 합계)
+                   정확한 요약에 없는 키의 실제 값은 0이므로 floor가 0입니다.
+        """
+        self.capacity = capacity or HEAVY_HITTERS_CONFIG['capacity']
+        self.exact = exact
+        self.counts = pd.Series(dtype=np.float64)
+        self.errors = pd.Series(dtype=np.float64)
+        self.total = 0.0
+
+    def __len__(self):
+        return len(self.counts)
+
+    @property
+    def floor(self):
+        """보관하지 않은 키가 가질 수 있는 최대 값입니다. 정확한 요약이거나 요약이 가득 차지 않았으면 0입니다."""
+        if self.exact or len(self.counts) < self.capacity:
+            return 0.0
+        return float(self.counts.min())
+
+    def update(self, keys, weights):
+        """
+        키별 가중치를 더합니다. 같은 배치의 키는 먼저 합산한 뒤 한 번에 병합합니다.
+        배치 합계는 정확한 요약이므로 배치에 없는 기존 키의 값과 오차는 늘어나지 않습니다.
+        """
+        batch = pd.Series(np.asarray(weights, dtype=np.float64)).groupby(np.asarray(keys), sort=False).sum()
+        other = SpaceSaving(max(self.capacity, len(batch)), exact=True)
+        other.counts = batch
+        other.errors = pd.Series(0.0, index=batch.index)
+        other.total = float(batch.sum())
+        return self.merge(other)
+
+    def merge(self, other):
+        """
+        다른 요약을 병합합니다.
+        한쪽에만 있는 키는 다른 쪽의 floor를 값과 오차에 더한 뒤, 추정값 상위 capacity개만 남깁니다.
+        """
+        self_floor, other_floor = self.floor, other.floor
+        keys = self.counts.index.union(other.counts.index)
+        counts = (self.counts.reindex(keys, fill_value=self_floor)
+                  + other.counts.reindex(keys, fill_value=other_floor))
+        errors = (self.errors.reindex(keys, fill_value=self_floor)
+                  + other.errors.reindex(keys, fill_value=other_floor))
+        self.exact = self.exact and other.exact and len(counts) <= self.capacity
+        if len(counts) > self.capacity:
+            counts = counts.nlargest(self.capacity, keep='first')
+        self.counts = counts
+        self.errors = errors.reindex(counts.index)
+        self.total += other.total
+        return self
+
+    def top(self, n=10):
+        """
+        추정값 상위 N개를 반환합니다.
+
+        Returns:
+            키, 추정값(상한), 오차, 하한, 확정 여부 컬럼의 데이터프레임
+            확정 여부는 하한이 N+1번째 후보의 추정값(없으면 floor) 이상이라 실제 상위 N에 반드시 드는지를 뜻합니다.
+        """
+        ranked = self.counts.sort_values(ascending=False, kind='stable')
+        head = ranked.head(n)
+        threshold = float(ranked.iloc[n]) if len(ranked) > n else self.floor
+        lower = head - self.errors.reindex(head.index)
+        return pd.DataFrame({
+            '키': head.index,
+            '추정값': head.to_numpy(),
+            '오차': self.errors.reindex(head.index).to_numpy(),
+            '하한': lower.to_numpy(),
+            '확정': (lower >= threshold).to_numpy(),
+        })
+
+    def to_frame(self):
+        """저장용 데이터프레임(키, 추정값, 오차)으로 변환합니다."""
+        return pd.DataFrame({'키': self.counts.index.astype(str),
+                             '추정값': self.counts.to_numpy(), '오차': self.errors.to_numpy()})
+
+    @classmethod
+    def from_frame(cls, frame, capacity, total):
+        """to_frame()으로 저장한 데이터프레임에서 요약을 복원합니다."""
+        summary = cls(capacity)
+        summary.counts = pd.Series(frame['추정값'].to_numpy(dtype=np.float64), index=frame['키'].to_numpy())
+        summary.errors = pd.Series(frame['오차'].to_numpy(dtype=np.float64), index=frame['키'].to_numpy())
+        summary.total = float(total)
+        return summary
+
+
+class HeavyHitters:
+    """거래처명/제품명별 매출액, 거래건수 Space-Saving 요약 모음 클래스"""
+
+    def __init__(self, capacity=None):
+        """
+        Args:
+            capacity: 요약마다 보관할 최대 키 수 (None이면 HEAVY_HITTERS_CONFIG 설정)
+        """
+        self.capacity = capacity or HEAVY_HITTERS_CONFIG['capacity']
+        self.summaries = {
+            (col, measure): SpaceSaving(self.capacity)
+            for col in HEAVY_HITTER_COLUMNS for measure in HEAVY_HITTER_MEASURES
+        }
+
+    def add_rows(self, df):
+        """행 단위 청크 또는 요약 데이터를 반영합니다. 요약 데이터의 거래 건수는 판매건수를 사용합니다."""
+        if len(df) == 0:
+            return self
+        counts = df[COUNT_COLUMN].to_numpy() if is_summary(df) else np.ones(len(df))
+        for (col, measure), summary in self.summaries.items():
+            if col not in df.columns:
+                continue
+            weight_column = HEAVY_HITTER_MEASURES[measure]
+            if weight_column is None:
+                weights = counts
+            else:
+                weights = np.nan_to_num(df[weight_column].to_numpy(dtype=np.float64))
+            keys = df[col]
+            if isinstance(keys.dtype, pd.CategoricalDtype):
+                # 범주 코드별 합계를 bincount로 계산한 뒤 등장한 범주만 병합
+                codes = keys.array.codes
+                valid = codes >= 0
+                sums = np.bincount(codes[valid], weights=weights[valid], minlength=len(keys.cat.categories))
+                seen = np.bincount(codes[valid], minlength=len(keys.cat.categories)) > 0
+                summary.update(keys.cat.categories[seen].to_numpy(dtype=object), sums[seen])
+            else:
+                keys = keys.to_numpy(dtype=object)
+                valid = pd.notna(keys)
+                summary.update(keys[valid], weights[valid])
+        return self
+
+    def merge(self, other):
+        """다른 HeavyHitters를 병합합니다."""
+        for key, summary in self.summaries.items():
+            summary.merge(other.summaries[key])
+        return self
+
+    def top(self, column, n=10, by='금액'):
+        """column의 by 기준 상위 N개와 오차 범위를 반환합니다. (SpaceSaving.top 참고)"""
+        return self.summaries[(column, by)].top(n)
+
+    def confirm(self, column, df, n=10, by='금액'):
+        """
+        상위 N개 후보의 정확한 값을 원본(행 단위 또는 요약) 데이터에서 확인합니다.
+        후보 키에 해당하는 행만 집계하므로 전체 그룹 집계보다 적은 행을 다룹니다.
+
+        Returns:
+            top() 결과에 정확한 값 컬럼을 더하고 정확한 값 내림차순으로 정렬한 데이터프레임
+        """
+        candidates = self.top(column, n, by)
+        rows = df[df[column].isin(candidates['키'])]
+        weight_column = HEAVY_HITTER_MEASURES[by]
+        if weight_column is None:
+            weight_column = COUNT_COLUMN if is_summary(df) else None
+        if weight_column is None:
+            exact = rows.groupby(column, observed=True).size()
+        else:
+            exact = rows.groupby(column, observed=True)[weight_column].sum()
+        candidates['정확한값'] = candidates['키'].map(exact).fillna(0).to_numpy()
+        return candidates.sort_values('정확한값', ascending=False, kind='stable').reset_index(drop=True)
+
+    @staticmethod
+    def summary_name(column, measure):
+        """저장 파일명 등에 쓰는 요약 이름을 만듭니다."""
+        return f"{column}__{measure}"
+
+    def to_frames(self):
+        """저장용 {요약 이름: 데이터프레임}과 메타 정보 {요약 이름: 전체 합계}를 반환합니다."""
+        frames, totals = {}, {}
+        for (col, measure), summary in self.summaries.items():
+            name = self.summary_name(col, measure)
+            frames[name] = summary.to_frame()
+            totals[name] = summary.total
+        return frames, totals
+
+    @classmethod
+    def from_frames(cls, frames, totals, capacity):
+        """to_frames()로 저장한 결과에서 복원합니다."""
+        heavy_hitters = cls(capacity)
+        for (col, measure) in heavy_hitters.summaries:
+            name = cls.summary_name(col, measure)
+            if name in frames:
+                heavy_hitters.summaries[(col, measure)] = SpaceSaving.from_frame(
+                    frames[name], capacity, totals.get(name, 0.0))
+        return heavy_hitters
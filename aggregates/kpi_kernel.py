@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+KPI 커널 모듈
+KPI와 데이터 정보(data_info)에 필요한 합계, 건수, 고유 개수를 컬럼당 한 번의
+NumPy 연산으로 계산합니다. 고유 개수는 해시 대신 범주형 코드로 등장 여부를 표시해 셉니다.
+행 단위 데이터와 요약(큐브) 데이터를 모두 지원합니다.
+"""
+
+import numpy as np
+import pandas as pd
+from .frame_memo import FrameMemo
+from .partial import COUNT_COLUMN, is_summary
+
+# 고유 개수를 세는 차원 컬럼
+DISTINCT_COLUMNS = ['거래처명', '제품명', '분류명']
+
+
+def _sum_and_count(series):
+    """결측을 제외한 합계와 값 개수를 반환합니다. 결측이 없으면 한 번의 합계로 끝납니다."""
+    values = series.to_numpy()
+    total = values.sum()
+    if values.dtype.kind == 'f' and np.isnan(total):
+        valid = ~np.isnan(values)
+        return values[valid].sum(), int(valid.sum())
+    return total, len(values)
+
+
+def distinct_count(series):
+    """결측을 제외한 고유값 개수를 계산합니다. 범주형은 코드로 등장 여부를 표시해 계산합니다."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        size = len(series.cat.categories)
+        # 범주별 등장 여부 표시 (결측 코드 -1은 마지막 여분 칸에 표시되어 개수에서 제외)
+        seen = np.zeros(size + 1, dtype=bool)
+        seen[series.array.codes] = True
+        return int(np.count_nonzero(seen[:size]))
+    return int(series.nunique())
+
+
+def compute_distinct(df):
+    """고유 개수를 세는 차원 컬럼별 정확한 고유 개수를 {컬럼: 개수}로 계산합니다."""
+    return {col: distinct_count(df[col]) if col in df.columns else 0 for col in DISTINCT_COLUMNS}
+
+
+def _discounted_mask(df):
+    """할인이 적용된 거래(또는 요약 행)의 불리언 마스크를 반환합니다. 판단할 컬럼이 없으면 None을 반환합니다."""
+    if is_summary(df):
+        if '할인적용' not in df.columns:
+            return None
+        flags = df['할인적용']
+        if isinstance(flags.dtype, pd.CategoricalDtype):
+            categories = list(flags.cat.categories)
+            if '할인' not in categories:
+                return np.zeros(len(df), dtype=bool)
+            return flags.array.codes == categories.index('할인')
+        return (flags == '할인').to_numpy()
+    if 'Discount' not in df.columns:
+        return None
+    return df['Discount'].to_numpy() > 0
+
+
+def compute_kpi_totals(df):
+    """
+    KPI와 데이터 정보에 필요한 값을 한 번에 계산합니다.
+
+    Returns:
+        {
+            'transactions': 거래 건수,
+            'sales_sum', 'sales_count': 금액 합계와 평균 계산용 건수,
+            'quantity_sum': 수량 합계,
+            'discount_amount_sum': 할인액 합계 (할인액 컬럼이 없으면 None),
+            'discounted_count', 'discount_rate_sum': 할인 거래 건수와 할인율 합계
+                                                    (판단할 컬럼이 없으면 None),
+            'distinct': {'거래처명', '제품명', '분류명': 고유 개수 (frame_distinct 결과)},
+            'date_min', 'date_max': 데이터 시작일/종료일 (날짜 컬럼이 없으면 None),
+        }
+    """
+    summary = is_summary(df)
+    totals = {}
+
+    if summary:
+        weights = df[COUNT_COLUMN].to_numpy()
+        totals['transactions'] = int(weights.sum())
+    else:
+        weights = None
+        totals['transactions'] = len(df)
+
+    sales_sum, sales_count = _sum_and_count(df['금액'])
+    totals['sales_sum'] = sales_sum
+    totals['sales_count'] = totals['transactions'] if summary else sales_count
+    totals['quantity_sum'] = _sum_and_count(df['수량'])[0] if '수량' in df.columns else 0
+    totals['discount_amount_sum'] = _sum_and_count(df['할인액'])[0] if '할인액' in df.columns else None
+
+    mask = _discounted_mask(df)
+    if mask is None:
+        totals['discounted_count'] = totals['discount_rate_sum'] = None
+    elif summary:
+        totals['discounted_count'] = int(weights[mask].sum())
+        totals['discount_rate_sum'] = df['Discount합'].to_numpy()[mask].sum() if 'Discount합' in df.columns else 0.0
+    else:
+        totals['discounted_count'] = int(np.count_nonzero(mask))
+        totals['discount_rate_sum'] = df['Discount'].to_numpy()[mask].sum()
+
+    totals['distinct'] = frame_distinct(df)
+
+    if '날짜' in df.columns:
+        totals['date_min'], totals['date_max'] = df['날짜'].min(), df['날짜'].max()
+    else:
+        totals['date_min'] = totals['date_max'] = None
+    return totals
+
+
+# 같은 데이터프레임 객체에 대해서는 한 번만 계산 (KPI, 사이드바, 데이터 정보가 공유)
+# 필터 단계에서 스케치로 추정한 고유 개수를 frame_distinct.put()으로 넣어 두면 정확한 계산을 건너뜀
+frame_distinct = FrameMemo(compute_distinct)
+kpi_totals = FrameMemo(compute_kpi_totals)
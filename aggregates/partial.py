@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+부분 집계 모듈
+행 단위 판매 데이터를 (일자 × 거래처 × 제품 × 할인 구간 × 단가대) 단위의 요약 데이터로
+집계합니다. 요약 데이터는 서로 병합할 수 있어 청크 단위 스트리밍 로드에 사용되며,
+분석기는 행 단위 데이터와 동일한 방식으로 요약 데이터를 분석할 수 있습니다.
+"""
+
+import numpy as np
+import pandas as pd
+from config import PRICE_BANDS, DISCOUNT_BANDS
+from .binning import band_categorical
+
+# 요약 데이터에서 원본 거래(행) 수를 담는 컬럼
+COUNT_COLUMN = '판매건수'
+
+# 요약 데이터의 그룹 키 (원본에 있는 컬럼만 사용)
+SUMMARY_KEYS = ['날짜', '거래처명', '분류명', '제품코드', '제품명', '할인적용', '할인율구간', '단가대', '출처']
+
+# 합계로 누적하는 측정값 (원본 컬럼 -> 요약 컬럼)
+SUMMARY_MEASURES = {
+    '금액': '금액',
+    '수량': '수량',
+    '할인전금액': '할인전금액',
+    '할인액': '할인액',
+    'Discount': 'Discount합',
+}
+
+# 평균 계산용으로 결측이 아닌 값의 개수를 누적하는 측정값 (원본 컬럼 -> 요약 컬럼)
+# 값이 비어 있는 행도 판매건수에는 포함되므로, 평균은 합계 / 판매건수가 아니라 합계 / 이 개수로 계산
+SUMMARY_COUNTS = {
+    'Discount': 'Discount수',
+}
+
+
+def is_summary(df):
+    """데이터프레임이 부분 집계(요약) 데이터인지 확인합니다."""
+    return COUNT_COLUMN in df.columns
+
+
+def transaction_count(df):
+    """거래 건수를 반환합니다. 요약 데이터는 판매건수의 합계를 사용합니다."""
+    if is_summary(df):
+        return int(df[COUNT_COLUMN].sum())
+    return len(df)
+
+
+def summary_value_columns(columns):
+    """요약 데이터에서 합산하는 값 컬럼(측정값 합계, 결측 아닌 개수, 판매건수)을 반환합니다."""
+    values = list(SUMMARY_MEASURES.values()) + list(SUMMARY_COUNTS.values()) + [COUNT_COLUMN]
+    return [col for col in values if col in columns]
+
+
+def summary_mean_columns(col):
+    """
+    요약 데이터에서 col의 평균을 계산할 (합계 컬럼, 개수 컬럼)을 반환합니다.
+    결측 아닌 개수를 따로 누적하지 않는 컬럼은 판매건수로 나눕니다.
+    """
+    return SUMMARY_MEASURES.get(col, col), SUMMARY_COUNTS.get(col, COUNT_COLUMN)
+
+
+def add_band_columns(df):
+    """단가대, 할인율구간 컬럼을 추가합니다."""
+    if '단가' in df.columns:
+        df['단가대'] = band_categorical(df['단가'], PRICE_BANDS)
+    if 'Discount' in df.columns:
+        df['할인율구간'] = band_categorical(df['Discount'], DISCOUNT_BANDS)
+    return df
+
+
+def summarize_rows(df):
+    """파생 컬럼이 만들어진 행 단위 데이터를 요약 데이터로 집계합니다."""
+    df = add_band_columns(df.copy())
+    df['날짜'] = df['날짜'].dt.normalize()
+
+    keys = [col for col in SUMMARY_KEYS if col in df.columns]
+    measures = {col: name for col, name in SUMMARY_MEASURES.items() if col in df.columns}
+    counts = {col: name for col, name in SUMMARY_COUNTS.items() if col in df.columns}
+    for col, name in counts.items():
+        df[name] = df[col].notna().astype(np.int64)
+
+    df[COUNT_COLUMN] = 1
+    values = list(measures) + list(counts.values()) + [COUNT_COLUMN]
+    summary = df.groupby(keys, observed=True, dropna=False)[values].sum()
+    summary = summary.rename(columns=measures).reset_index()
+    return summary
+
+
+def merge_summaries(summaries):
+    """여러 요약 데이터를 하나로 병합합니다."""
+    summaries = [s for s in summaries if s is not None and len(s) > 0]
+    if not summaries:
+        return None
+    if len(summaries) == 1:
+        return summaries[0]
+
+    combined = pd.concat(summaries, ignore_index=True)
+    keys = [col for col in SUMMARY_KEYS if col in combined.columns]
+    values = summary_value_columns(combined.columns)
+    return combined.groupby(keys, observed=True, dropna=False)[values].sum().reset_index()
+
+
+class PartialAggregate:
+    """청크 단위로 누적되는 병합 가능한 부분 집계 클래스"""
+
+    def __init__(self, compact_every=8):
+        """
+        Args:
+            compact_every: 누적된 부분 집계를 병합(압축)할 청크 간격
+        """
+        self.compact_every = compact_every
+        self.summary = None
+        self.row_count = 0
+        self._pending = []
+
+    def add_rows(self, df):
+        """행 단위 청크를 집계하여 누적합니다."""
+        self.row_count += len(df)
+        self._pending.append(summarize_rows(df))
+        if len(self._pending) >= self.compact_every:
+            self._compact()
+        return self
+
+    def merge(self, other):
+        """다른 부분 집계를 병합합니다."""
+        self.row_count += other.row_count
+        self._pending.append(other.get_summary())
+        self._compact()
+        return self
+
+    def _compact(self):
+        """대기 중인 부분 집계를 누적 요약 데이터에 병합합니다."""
+        self.summary = merge_summaries([self.summary] + self._pending)
+        self._pending = []
+
+    def get_summary(self):
+        """병합이 끝난 요약 데이터를 반환합니다."""
+        if self._pending:
+            self._compact()
+        return self.summary
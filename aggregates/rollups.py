@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+롤업 집계 모듈
+월별, 거래처별, 제품별, 분류별, 할인율 구간별 누적 집계를 만들고 병합합니다.
+롤업은 합계와 판매건수만 담으므로 새로 들어온 행의 롤업을 기존 롤업에
+더하는 것만으로 전체 기간 집계를 갱신할 수 있습니다.
+"""
+
+import pandas as pd
+from time_keys import derive_time_keys
+from .partial import is_summary, summarize_rows, summary_value_columns
+
+# 롤업 이름별 그룹 키
+ROLLUP_KEYS = {
+    'monthly': ['년월키'],
+    'customer': ['거래처명'],
+    'product': ['제품명'],
+    'category': ['분류명'],
+    'discount': ['할인율구간'],
+}
+
+
+def compute_rollups(df):
+    """
+    행 단위 또는 요약 데이터로부터 롤업 집계를 계산합니다.
+    
+    Returns:
+        {롤업 이름: 키 컬럼 + 합계 컬럼 + 판매건수 데이터프레임}
+    """
+    summary = df if is_summary(df) else summarize_rows(df)
+    if '년월키' not in summary.columns:
+        summary = summary.assign(년월키=derive_time_keys(summary['날짜'])['년월키'])
+    
+    values = summary_value_columns(summary.columns)
+    return {
+        name: summary.groupby(keys, observed=True, dropna=False)[values].sum().reset_index()
+        for name, keys in ROLLUP_KEYS.items()
+        if all(key in summary.columns for key in keys)
+    }
+
+
+def merge_rollups(stored, new):
+    """저장된 롤업에 새 롤업을 더합니다. 비용은 롤업 크기(그룹 수)에만 비례합니다."""
+    merged = dict(stored)
+    for name, rollup in new.items():
+        if name not in stored or len(rollup) == 0:
+            merged.setdefault(name, rollup)
+            continue
+        keys = ROLLUP_KEYS[name]
+        combined = pd.concat([stored[name], rollup], ignore_index=True)
+        values = [col for col in combined.columns if col not in keys]
+        merged[name] = combined.groupby(keys, observed=True, dropna=False)[values].sum().reset_index()
+    return merged
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+고유 개수 스케치 모듈
+거래처명/제품명의 고유 개수를 HyperLogLog 스케치로 근사합니다.
+일자 롤업의 (일자 × 분류명) 그룹마다 스케치를 만들어 두고, 기간과 분류 필터 조합은
+해당 그룹의 스케치를 병합(레지스터별 최대값)하여 답하므로 필터를 바꿀 때 행 데이터를 다시 읽지 않습니다.
+스케치는 레지스터가 0이 아닌 칸만 (일자, 분류, 레지스터, 값)으로 보관하는 희소 형식입니다.
+"""
+
+import numpy as np
+import pandas as pd
+from config import DISTINCT_CONFIG
+from .frame_memo import FrameMemo
+from .kpi_kernel import DISTINCT_COLUMNS
+from .time_index import date_index, _to_day
+
+# 스케치를 나누는 분류 컬럼
+SKETCH_GROUP_COLUMN = '분류명'
+
+
+def _value_registers(series, precision):
+    """
+    행마다 (레지스터 번호, 레지스터 값)과 결측이 아닌 행의 마스크를 계산합니다.
+    범주형은 범주마다 한 번만 해시하고 코드로 펼치므로 비용이 범주 수에 비례합니다.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        index, rank = hll_registers(pd.util.hash_array(series.cat.categories.to_numpy(dtype=object)), precision)
+        codes = series.array.codes
+        valid = codes >= 0
+        return index[codes[valid]], rank[codes[valid]], valid
+    values = series.to_numpy(dtype=object)
+    valid = pd.notna(values)
+    index, rank = hll_registers(pd.util.hash_array(values[valid]), precision)
+    return index, rank, valid
+
+
+def _bit_length(values):
+    """부호 없는 정수 배열의 비트 길이를 계산합니다. (부동소수 변환 없이 정확히 계산)"""
+    length = np.zeros(len(values), dtype=np.int64)
+    rest = values.copy()
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = rest >= np.uint64(1 << shift)
+        length[high] += shift
+        rest[high] >>= np.uint64(shift)
+    return length + (rest > 0)
+
+
+def hll_registers(hashes, precision):
+    """
+    해시값마다 (레지스터 번호, 레지스터 값)을 계산합니다.
+    상위 precision 비트가 레지스터 번호, 나머지 비트의 선행 0 개수 + 1이 레지스터 값입니다.
+    """
+    width = 64 - precision
+    index = (hashes >> np.uint64(width)).astype(np.int64)
+    rest = hashes & np.uint64((1 << width) - 1)
+    rank = (width - _bit_length(rest) + 1).astype(np.uint8)
+    return index, rank
+
+
+def hll_estimate(registers):
+    """레지스터 배열로부터 고유 개수를 추정합니다. 작은 값은 선형 계수로 보정합니다."""
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.ldexp(1.0, -registers.astype(np.int64)).sum()
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros > 0:
+        estimate = m * np.log(m / zeros)
+    return int(round(estimate))
+
+
+class DistinctSketch:
+    """(일자 × 분류명) 그룹별 HyperLogLog 스케치를 보관하고 필터 조합별 고유 개수를 추정하는 클래스"""
+
+    def __init__(self, df, columns=None, precision=None):
+        """
+        Args:
+            df: 날짜순 일자 롤업(큐브) 또는 행 단위 데이터프레임
+            columns: 스케치를 만들 컬럼 (None이면 거래처명, 제품명, 분류명 중 있는 컬럼)
+            precision: 레지스터 수 지수 (None이면 DISTINCT_CONFIG 설정)
+        """
+        self.precision = precision or DISTINCT_CONFIG['precision']
+        days, order = date_index(df)
+        if order is not None:
+            df = df.iloc[order]
+        groups = df[SKETCH_GROUP_COLUMN]
+        self.group_categories = groups.cat.categories
+        group_codes = groups.array.codes.astype(np.int64)
+
+        # 날짜가 없는 행은 어느 기간에도 속하지 않으므로 제외
+        dated = ~pd.isna(df['날짜']).to_numpy()
+        first_day = days[dated].min() if dated.any() else 0
+        self.entries = {}
+        for col in columns or [c for c in DISTINCT_COLUMNS if c in df.columns]:
+            index, rank, valid = _value_registers(df[col], self.precision)
+            keep = dated[valid]
+            index, rank = index[keep], rank[keep]
+            day = (days[valid] - first_day)[keep]
+            group = group_codes[valid][keep]
+            self.entries[col] = self._compact(day, group, index, rank, first_day)
+
+    def _compact(self, day, group, index, rank, first_day):
+        """같은 (일자, 분류, 레지스터) 칸은 최대값 하나만 남기고 일자순으로 정렬합니다."""
+        m = 1 << self.precision
+        n_groups = len(self.group_categories) + 1   # 분류 결측(-1)은 마지막 칸
+        key = (day * n_groups + (group % n_groups)) * m + index
+        order = np.argsort(key, kind='stable')
+        key, rank = key[order], rank[order]
+        starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]]) if len(key) else np.array([], dtype=np.int64)
+        key = key[starts]
+        rank = np.maximum.reduceat(rank, starts) if len(starts) else rank[:0]
+        cell, index = np.divmod(key, m)
+        cell_day, cell_group = np.divmod(cell, n_groups)
+        return {
+            'day': cell_day + first_day,
+            'group': np.where(cell_group == n_groups - 1, -1, cell_group),
+            'index': index,
+            'rank': rank,
+        }
+
+    def registers(self, column, start=None, end=None, categories=None):
+        """기간과 분류 조건에 맞는 그룹의 스케치를 병합한 레지스터 배열을 반환합니다."""
+        entries = self.entries[column]
+        lo = 0 if start is None else np.searchsorted(entries['day'], _to_day(start), side='left')
+        hi = len(entries['day']) if end is None else np.searchsorted(entries['day'], _to_day(end), side='right')
+        index, rank = entries['index'][lo:hi], entries['rank'][lo:hi]
+        if categories:
+            # 선택한 분류 코드를 표시한 조회표로 그룹 필터링 (결측 코드 -1은 마지막 여분 칸)
+            selected = np.zeros(len(self.group_categories) + 1, dtype=bool)
+            codes = self.group_categories.get_indexer(list(categories))
+            selected[codes[codes >= 0]] = True
+            mask = selected[entries['group'][lo:hi]]
+            index, rank = index[mask], rank[mask]
+        registers = np.zeros(1 << self.precision, dtype=np.uint8)
+        np.maximum.at(registers, index, rank)
+        return registers
+
+    def estimate(self, column, start=None, end=None, categories=None):
+        """기간(양 끝 포함)과 분류 조건에 맞는 column의 고유 개수를 추정합니다."""
+        return hll_estimate(self.registers(column, start, end, categories))
+
+    def estimate_all(self, start=None, end=None, categories=None):
+        """스케치가 있는 모든 컬럼의 고유 개수를 {컬럼: 추정값}으로 반환합니다."""
+        return {col: self.estimate(col, start, end, categories) for col in self.entries}
+
+
+def use_sketch(df, method=None):
+    """DISTINCT_CONFIG 설정에 따라 df의 고유 개수를 스케치로 추정할지 결정합니다."""
+    method = method or DISTINCT_CONFIG['method']
+    if method == 'exact' or SKETCH_GROUP_COLUMN not in df.columns or '날짜' not in df.columns:
+        return False
+    if not isinstance(df[SKETCH_GROUP_COLUMN].dtype, pd.CategoricalDtype):
+        return False
+    return method == 'sketch' or len(df) >= DISTINCT_CONFIG['sketch_min_rows']
+
+
+# 같은 데이터프레임 객체에 대해서는 스케치를 한 번만 생성
+distinct_sketches = FrameMemo(DistinctSketch)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시간 인덱스 모듈
+데이터를 날짜순으로 한 번 정렬하고 금액, 수량, 할인액, 거래 건수의 누적합 배열을 보관합니다.
+임의 기간의 합계는 이진 탐색 두 번과 뺄셈 한 번으로 계산되므로 행 데이터를 다시 읽지 않습니다.
+"""
+
+import numpy as np
+import pandas as pd
+from .frame_memo import FrameMemo
+from .kpi_kernel import _discounted_mask
+from .partial import COUNT_COLUMN, is_summary
+
+# 누적합으로 보관하는 측정값 (결과 키 -> 컬럼)
+PREFIX_MEASURES = {
+    'sales_sum': '금액',
+    'quantity_sum': '수량',
+    'discount_amount_sum': '할인액',
+}
+
+
+def _to_day(value):
+    """날짜 값을 일 단위 정수(1970-01-01 기준 일수)로 변환합니다."""
+    return np.datetime64(pd.Timestamp(value), 'D').astype(np.int64)
+
+
+def _build_date_index(df):
+    """
+    날짜 컬럼의 정렬된 일 단위 정수 배열과 정렬 순서를 만듭니다.
+    이미 날짜순이면(큐브는 항상 날짜순) 정렬 순서는 None입니다.
+    """
+    days = df['날짜'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    if len(days) < 2 or (days[1:] >= days[:-1]).all():
+        return days, None
+    order = np.argsort(days, kind='stable')
+    return days[order], order
+
+
+def date_range_slice(df, start, end):
+    """
+    날짜가 [start, end] 구간(양 끝 포함, 일 단위)인 행을 반환합니다.
+    정렬된 날짜에서 이진 탐색으로 구간 경계를 찾으므로 전체 행을 비교하지 않습니다.
+    """
+    days, order = date_index(df)
+    lo = np.searchsorted(days, _to_day(start), side='left')
+    hi = np.searchsorted(days, _to_day(end), side='right')
+    if order is None:
+        return df.iloc[lo:hi]
+    return df.iloc[np.sort(order[lo:hi])]
+
+
+def _prefix_sum(values):
+    """앞에 0을 붙인 누적합 배열을 만듭니다. 구간 [lo, hi)의 합은 prefix[hi] - prefix[lo]입니다."""
+    prefix = np.zeros(len(values) + 1, dtype=values.dtype)
+    np.cumsum(values, out=prefix[1:])
+    return prefix
+
+
+class TimeIndex:
+    """날짜순 누적합 배열로 기간 합계를 O(log n)에 계산하는 클래스"""
+
+    def __init__(self, df):
+        """
+        Args:
+            df: 행 단위 또는 요약(큐브) 데이터프레임 (날짜 컬럼 필요)
+        """
+        self.days, order = date_index(df)
+        summary = is_summary(df)
+
+        def column(name):
+            values = df[name].to_numpy()
+            return values if order is None else values[order]
+
+        # 결측은 합계에서 제외 (pandas sum과 동일)
+        self.prefix = {}
+        for key, col in PREFIX_MEASURES.items():
+            if col in df.columns:
+                self.prefix[key] = _prefix_sum(np.nan_to_num(column(col).astype(np.float64)))
+
+        if summary:
+            counts = column(COUNT_COLUMN).astype(np.int64)
+            self.prefix['transactions'] = self.prefix['sales_count'] = _prefix_sum(counts)
+        else:
+            self.prefix['transactions'] = np.arange(len(self.days) + 1, dtype=np.int64)
+            self.prefix['sales_count'] = _prefix_sum((~np.isnan(column('금액').astype(np.float64))).astype(np.int64))
+
+        mask = _discounted_mask(df)
+        if mask is not None:
+            mask = mask if order is None else mask[order]
+            if summary:
+                rates = column('Discount합') if 'Discount합' in df.columns else np.zeros(len(df))
+                self.prefix['discounted_count'] = _prefix_sum(np.where(mask, counts, 0))
+            else:
+                rates = column('Discount')
+                self.prefix['discounted_count'] = _prefix_sum(mask.astype(np.int64))
+            self.prefix['discount_rate_sum'] = _prefix_sum(np.where(mask, rates, 0).astype(np.float64))
+
+    def __len__(self):
+        return len(self.days)
+
+    def bounds(self, start=None, end=None):
+        """[start, end] 기간(양 끝 포함)에 해당하는 정렬 위치 구간 [lo, hi)를 반환합니다. None이면 끝까지입니다."""
+        lo = 0 if start is None else int(np.searchsorted(self.days, _to_day(start), side='left'))
+        hi = len(self.days) if end is None else int(np.searchsorted(self.days, _to_day(end), side='right'))
+        return lo, max(lo, hi)
+
+    def range_totals(self, start=None, end=None):
+        """
+        기간 합계를 계산합니다. 키 이름은 kpi_totals와 같습니다.
+
+        Returns:
+            {
+                'transactions': 거래 건수,
+                'sales_sum', 'sales_count': 금액 합계와 평균 계산용 건수,
+                'quantity_sum': 수량 합계,
+                'discount_amount_sum': 할인액 합계 (할인액 컬럼이 없으면 None),
+                'discounted_count', 'discount_rate_sum': 할인 거래 건수와 할인율 합계
+                                                        (판단할 컬럼이 없으면 None),
+            }
+        """
+        lo, hi = self.bounds(start, end)
+        totals = {key: prefix[hi] - prefix[lo] for key, prefix in self.prefix.items()}
+        for key in ('transactions', 'sales_count', 'discounted_count'):
+            if key in totals:
+                totals[key] = int(totals[key])
+        totals.setdefault('quantity_sum', 0)
+        totals.setdefault('discount_amount_sum', None)
+        totals.setdefault('discounted_count', None)
+        totals.setdefault('discount_rate_sum', None)
+        return totals
+
+
+# 같은 데이터프레임 객체에 대해서는 한 번만 정렬/누적 (기간 필터, KPI, 기간 비교가 공유)
+date_index = FrameMemo(_build_date_index)
+time_index = FrameMemo(TimeIndex)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시계열 엔진 모듈
+날짜순 데이터를 첫 날부터 마지막 날까지 빈 날 없는 일별 배열(매출액, 거래건수, 판매수량)로 한 번 만들고,
+일/ISO 주/월/분기/회계연도 단위 합계, 이동 합계/평균, 누적 합계, 전년 동기 대비 증감률을
+모두 일별 누적합 배열의 구간 차로 계산합니다. 단위를 바꿔도 그룹 집계를 다시 하지 않습니다.
+"""
+
+import numpy as np
+import pandas as pd
+from config import TIMESERIES_CONFIG
+from time_keys import GRANULARITIES, YEAR_OVER_YEAR_LAGS, period_keys, period_label
+from .frame_memo import FrameMemo
+from .partial import COUNT_COLUMN, is_summary
+from .time_index import date_index
+
+# 일별 배열로 만드는 측정값 (결과 컬럼 -> 원본 컬럼, None이면 거래 건수)
+SERIES_MEASURES = {
+    '매출액': '금액',
+    '거래건수': None,
+    '판매수량': '수량',
+}
+
+
+def _window_sums(prefix, window):
+    """
+    앞에 0을 붙인 누적합 배열로 길이 window의 이동 합계를 계산합니다.
+    기간이 window개 미만인 앞부분은 NaN입니다. (pandas rolling의 min_periods=window와 같음)
+    """
+    n = len(prefix) - 1
+    sums = np.full(n, np.nan)
+    if n >= window:
+        sums[window - 1:] = prefix[window:] - prefix[:n - window + 1]
+    return sums
+
+
+class DailySeries:
+    """빈 날 없는 일별 측정값 누적합 배열로 기간 단위 시계열을 계산하는 클래스"""
+
+    def __init__(self, df):
+        """
+        Args:
+            df: 행 단위 또는 요약(큐브) 데이터프레임 (날짜 컬럼 필요, 날짜가 없는 행은 제외)
+        """
+        days, order = date_index(df)
+        dated = days != np.iinfo(np.int64).min   # 결측 날짜(NaT)는 최소 정수로 변환됨
+        self.first_day = int(days[dated][0]) if dated.any() else 0
+        n_days = int(days[dated][-1]) - self.first_day + 1 if dated.any() else 0
+        offsets = days[dated] - self.first_day
+
+        def column(name):
+            values = df[name].to_numpy()
+            values = values if order is None else values[order]
+            return np.nan_to_num(values[dated].astype(np.float64))
+
+        # 일별 합계 -> 앞에 0을 붙인 누적합 (구간 [lo, hi)의 합 = prefix[hi] - prefix[lo])
+        self.prefix = {}
+        for name, col in SERIES_MEASURES.items():
+            if col is None:
+                weights = column(COUNT_COLUMN) if is_summary(df) else None
+            elif col in df.columns:
+                weights = column(col)
+            else:
+                continue
+            daily = np.bincount(offsets, weights=weights, minlength=n_days)[:n_days].astype(np.float64)
+            self.prefix[name] = np.r_[0.0, np.cumsum(daily)]
+        self.days = np.arange(self.first_day, self.first_day + n_days, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.days)
+
+    def resample(self, granularity='month', fiscal_year_start_month=None):
+        """
+        기간 단위 합계를 계산합니다. 첫 날과 마지막 날 사이의 빈 기간도 0으로 포함합니다.
+
+        Args:
+            granularity: 'day', 'week'(ISO 주), 'month', 'quarter', 'fiscal_year'
+            fiscal_year_start_month: 회계연도 시작 월 (None이면 TIMESERIES_CONFIG 설정)
+
+        Returns:
+            기간키, 기간(표시 라벨), 시작일, 매출액, 거래건수, 판매수량 컬럼의 데이터프레임 (시간순)
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"지원하지 않는 기간 단위입니다: {granularity}")
+        fiscal_year_start_month = fiscal_year_start_month or TIMESERIES_CONFIG['fiscal_year_start_month']
+        keys = period_keys(self.days, granularity, fiscal_year_start_month)
+        # 일별 키는 정렬되어 있으므로 키가 바뀌는 위치가 기간 경계
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.array([], dtype=np.int64)
+        ends = np.r_[starts[1:], len(keys)].astype(np.int64)
+
+        result = pd.DataFrame({
+            '기간키': keys[starts],
+            '기간': period_label(keys[starts], granularity).to_numpy(),
+            '시작일': self.days[starts].astype('datetime64[D]'),
+        })
+        for name, prefix in self.prefix.items():
+            result[name] = prefix[ends] - prefix[starts]
+        result['거래건수'] = result['거래건수'].astype(np.int64)
+        return result
+
+    def series(self, granularity='month', window=None, measure='매출액', fiscal_year_start_month=None):
+        """
+        기간 단위 합계에 이동 합계/평균, 누적 합계, 전년 동기 값과 증감률을 더합니다.
+        모든 값은 기간 합계의 누적합 배열에서 구간 차와 키 검색으로 계산합니다.
+
+        Args:
+            granularity: resample 참고
+            window: 이동 합계/평균 기간 수 (None이면 TIMESERIES_CONFIG 단위별 설정)
+            measure: 이동/누적/전년 대비를 계산할 측정값 컬럼
+            fiscal_year_start_month: resample 참고
+
+        Returns:
+            resample 결과 + 이동합계, 이동평균, 누적합계, 전년동기, 전년대비(%) 컬럼
+            (이동 값은 기간이 window개 미만이면 NaN, 전년 동기가 데이터 범위 밖이거나 0이면 NaN)
+        """
+        window = window or TIMESERIES_CONFIG['rolling_windows'][granularity]
+        result = self.resample(granularity, fiscal_year_start_month)
+        values = result[measure].to_numpy(dtype=np.float64)
+        prefix = np.r_[0.0, np.cumsum(values)]
+
+        rolling = _window_sums(prefix, window)
+        result['이동합계'] = rolling
+        result['이동평균'] = rolling / window
+        result['누적합계'] = prefix[1:]
+
+        # 전년 동기 기간 키를 정렬된 기간 키에서 이진 탐색 (기간 사이에 빈 키가 있는 주 단위도 정확히 찾음)
+        keys = result['기간키'].to_numpy()
+        previous_keys = keys - YEAR_OVER_YEAR_LAGS[granularity]
+        previous = np.full(len(keys), np.nan)
+        if len(keys):
+            position = np.minimum(np.searchsorted(keys, previous_keys), len(keys) - 1)
+            found = keys[position] == previous_keys
+            previous[found] = values[position[found]]
+        result['전년동기'] = previous
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = np.where(previous > 0, (values - previous) / previous * 100, np.nan)
+        result['전년대비(%)'] = np.round(growth, 1)
+        return result
+
+
+# 같은 데이터프레임 객체에 대해서는 일별 배열을 한 번만 생성
+daily_series = FrameMemo(DailySeries)
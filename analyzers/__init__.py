@@ -9,12 +9,15 @@ from .timeseries_analyzer import TimeSeriesAnalyzer
 from .product_analyzer import ProductAnalyzer
 from .customer_analyzer import CustomerAnalyzer
 from .discount_analyzer import DiscountAnalyzer
+from .memo import RESULT_CACHE, get_memo_stats
 
 __all__ = [
     'KPIAnalyzer',
     'TimeSeriesAnalyzer',
     'ProductAnalyzer',
     'CustomerAnalyzer',
-    'DiscountAnalyzer'
+    'DiscountAnalyzer',
+    'RESULT_CACHE',
+    'get_memo_stats',
 ]
 
@@ -2,13 +2,17 @@
 # -*- coding: utf-8 -*-
 """
 거래처 분석 모듈
-거래처별 매출, 거래 건수 등을 분석합니다.
+거래처별 매출, 거래 건수, 매출 집중도, 첫 구매 월 코호트별 유지율, RFM 세그먼트 등을 분석합니다.
 """
 
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from config import COLORS, PLOTLY_LAYOUT, REPORT_CONFIG
+from config import COLORS, PLOTLY_LAYOUT, REPORT_CONFIG, RFM_CONFIG
+from time_keys import year_month_label
+from aggregates import get_cube, cohort_matrices, quantile_scores, Concentration
+from .grouping import group_agg, top_n_per_group
+from .memo import memoized
 
 
 class CustomerAnalyzer:
@@ -17,22 +21,24 @@ class CustomerAnalyzer:
     def __init__(self, df):
         """
         Args:
-            df: 판매 데이터프레임
+            df: 판매 데이터프레임 (행 단위 데이터는 집계 큐브로 한 번 집계하여 분석)
         """
-        self.df = df
+        self.df = get_cube(df)
     
+    @memoized
     def get_customer_sales(self):
         """거래처별 매출을 계산합니다."""
-        customer = self.df.groupby('거래처명').agg({
+        customer = group_agg(self.df, '거래처명', {
             '금액': 'sum',
             '판매ID': 'count',
             '수량': 'sum'
-        }).reset_index()
+        })
         customer.columns = ['거래처명', '매출액', '거래건수', '판매수량']
         customer = customer.sort_values('매출액', ascending=False)
         customer['매출비중'] = (customer['매출액'] / customer['매출액'].sum() * 100).round(1)
         return customer
     
+    @memoized
     def get_top_customers(self, top_n=10):
         """거래처별 TOP N 매출을 계산합니다."""
         customer = self.get_customer_sales()
@@ -123,6 +129,7 @@ class CustomerAnalyzer:
         fig.update_layout(**layout)
         return fig
     
+    @memoized
     def get_customer_transaction_count(self):
         """거래처별 거래 건수를 계산합니다."""
         customer = self.get_customer_sales()
@@ -203,6 +210,7 @@ class CustomerAnalyzer:
         fig.update_layout(**layout)
         return fig
     
+    @memoized
     def get_customer_detail(self):
         """주요 거래처 상세 정보를 반환합니다."""
         customer = self.get_customer_sales()
@@ -218,20 +226,281 @@ class CustomerAnalyzer:
         
         return customer[['순위', '거래처명', '매출액', '거래건수', '평균거래금액', '매출비중']]
     
-    def get_customer_concentration(self):
-        """거래처 집중도를 분석합니다."""
+    @memoized
+    def get_customer_pareto(self):
+        """
+        거래처별 매출액 집중도 엔진을 반환합니다.
+        거래처별 매출을 한 번 정렬한 누적합으로 파레토 곡선, ABC 등급, 지니 계수, HHI와
+        임의의 상위 N개 비중(top_share) / 목표 비중에 필요한 거래처 수(count_for_share)를 계산합니다.
+        """
         customer = self.get_customer_sales()
-        total_sales = customer['매출액'].sum()
-        
-        # 상위 거래처의 매출 비중 계산
-        top_5_ratio = customer.head(5)['매출액'].sum() / total_sales * 100
-        top_10_ratio = customer.head(10)['매출액'].sum() / total_sales * 100
-        top_20_ratio = customer.head(20)['매출액'].sum() / total_sales * 100
-        
-        return {
-            'top_5': round(top_5_ratio, 1),
-            'top_10': round(top_10_ratio, 1),
-            'top_20': round(top_20_ratio, 1),
-            'total_customers': len(customer)
-        }
-
+        return Concentration(customer.set_index('거래처명')['매출액'])
+    
+    @memoized
+    def get_customer_concentration(self):
+        """
+        거래처 집중도를 분석합니다.
+        
+        Returns:
+            {'top_5', 'top_10', 'top_20': 상위 거래처 매출 비중(%), 'total_customers': 거래처 수,
+             'gini': 지니 계수, 'hhi': HHI, 'abc': ABC 등급별 거래처 수}
+        """
+        summary = self.get_customer_pareto().summary()
+        summary['total_customers'] = summary.pop('count')
+        return summary
+    
+    @memoized
+    def get_top_customers_by_category(self, top_n=3, ties='first'):
+        """
+        제품 분류별 TOP N 매출 거래처를 계산합니다.
+        
+        Args:
+            top_n: 분류별 거래처 수
+            ties: 동점 처리 방식 ('first', 'min', 'dense' - top_n_per_group 참고)
+        """
+        sales = group_agg(self.df, ['분류명', '거래처명'], {
+            '금액': 'sum',
+            '판매ID': 'count'
+        })
+        sales.columns = ['분류명', '거래처명', '매출액', '거래건수']
+        
+        # 분류명은 매출액 순으로 나열
+        category_order = sales.groupby('분류명', observed=True)['매출액'].sum().sort_values(ascending=False).index
+        top_customers = top_n_per_group(sales, '분류명', '매출액', top_n, ties=ties,
+                                        group_order=category_order, rank_column='분류내순위')
+        return top_customers[['분류명', '분류내순위', '거래처명', '매출액', '거래건수']]
+    
+    @memoized
+    def get_top_products_by_customer(self, top_n=3, ties='first'):
+        """
+        거래처별 TOP N 매출 제품을 계산합니다. 거래처는 매출액 순으로 나열합니다.
+        
+        Args:
+            top_n: 거래처별 제품 수
+            ties: 동점 처리 방식 ('first', 'min', 'dense' - top_n_per_group 참고)
+        """
+        sales = group_agg(self.df, ['거래처명', '제품코드', '제품명'], {
+            '금액': 'sum',
+            '수량': 'sum'
+        })
+        sales.columns = ['거래처명', '제품코드', '제품명', '매출액', '판매수량']
+        
+        customer_order = self.get_customer_sales()['거래처명'].tolist()
+        top_products = top_n_per_group(sales, '거래처명', '매출액', top_n, ties=ties,
+                                       group_order=customer_order, rank_column='거래처내순위')
+        return top_products[['거래처명', '거래처내순위', '제품명', '매출액', '판매수량']]
+    
+    @memoized
+    def get_cohort_matrix(self, value='retention'):
+        """
+        첫 구매 월(코호트) × 경과 개월 행렬을 계산합니다.
+        
+        Args:
+            value: 'retention' (유지율 %, 코호트 거래처 중 해당 월에 구매한 비율),
+                   'customers' (활성 거래처 수), 'revenue' (매출액)
+        
+        Returns:
+            코호트(년-월), 거래처수, 0개월, 1개월, ... 컬럼의 데이터프레임 (코호트 시간순)
+            데이터 마지막 월 이후로 관측할 수 없는 칸은 NaN입니다.
+        """
+        customers = self.df['거래처명']
+        if isinstance(customers.dtype, pd.CategoricalDtype):
+            codes, n_customers = customers.array.codes, len(customers.cat.categories)
+        else:
+            codes, uniques = pd.factorize(customers)
+            n_customers = len(uniques)
+        months = self.df['년월키'].to_numpy(dtype=np.float64)
+        codes = np.where(np.isnan(months), -1, codes)
+        matrices = cohort_matrices(codes, np.nan_to_num(months), self.df['금액'].to_numpy(), n_customers)
+        
+        if value == 'retention':
+            values = (matrices['active'] / matrices['sizes'][:, None] * 100).round(1)
+        elif value == 'customers':
+            values = matrices['active']
+        elif value == 'revenue':
+            values = matrices['revenue']
+        else:
+            raise ValueError(f"지원하지 않는 코호트 값입니다: {value}")
+        
+        cohort = pd.DataFrame(values, columns=[f'{age}개월' for age in range(values.shape[1])])
+        cohort.insert(0, '코호트', year_month_label(matrices['cohorts']).to_numpy())
+        cohort.insert(1, '거래처수', matrices['sizes'])
+        return cohort
+    
+    def create_cohort_retention_chart(self):
+        """
+        첫 구매 월 코호트별 유지율 히트맵을 생성합니다.
+        코호트가 없으면 None을 반환합니다.
+        """
+        retention = self.get_cohort_matrix('retention')
+        if retention.empty:
+            return None
+        customers = self.get_cohort_matrix('customers')
+        ages = retention.columns[2:]
+        
+        fig = go.Figure()
+        
+        fig.add_trace(go.Heatmap(
+            z=retention[ages].to_numpy(),
+            x=list(ages),
+            y=retention['코호트'] + ' (' + retention['거래처수'].astype(str) + ')',
+            customdata=customers[ages].to_numpy(),
+            colorscale=[[0, COLORS['white']], [0.5, COLORS['light_blue']], [1, COLORS['primary_blue']]],
+            zmin=0,
+            zmax=100,
+            text=retention[ages].to_numpy(),
+            texttemplate='%{text:.0f}%',
+            textfont=dict(size=9),
+            colorbar=dict(title='유지율 (%)'),
+            hovertemplate='코호트 %{y}<br>경과 %{x}<br>유지율: %{z:.1f}%<br>활성 거래처: %{customdata:,.0f}개<extra></extra>'
+        ))
+        
+        # 레이아웃 설정
+        layout = PLOTLY_LAYOUT.copy()
+        layout.update({
+            'title': {
+                'text': '첫 구매 월 코호트별 거래처 유지율',
+                'font': {'size': 16, 'weight': 'bold', 'color': COLORS['dark_gray']},
+                'x': 0.5,
+                'xanchor': 'center'
+            },
+            'xaxis': {
+                'title': '첫 구매 후 경과 개월',
+                'showgrid': False,
+                'side': 'top',
+                'color': COLORS['dark_gray']
+            },
+            'yaxis': {
+                'title': '코호트 (거래처 수)',
+                'showgrid': False,
+                'autorange': 'reversed',
+                'color': COLORS['dark_gray']
+            },
+            'height': max(400, 30 * len(retention) + 150)
+        })
+        
+        fig.update_layout(**layout)
+        return fig
+    
+    @memoized
+    def get_rfm_scores(self):
+        """
+        거래처별 RFM(최근성, 구매 빈도, 구매 금액) 점수와 세그먼트를 계산합니다.
+        거래처별 최근 구매일, 거래 건수, 매출액을 한 번의 그룹 집계로 구하고 분위수 순위로 점수를 매깁니다.
+        최근성 기준일은 데이터의 마지막 날짜입니다.
+        
+        Returns:
+            거래처명, 최근구매일, 경과일수, 구매빈도, 구매금액, R, F, M, RFM점수, 세그먼트 컬럼의 데이터프레임
+            (세그먼트는 RFM_CONFIG 순서의 범주형, 구매금액 내림차순)
+        """
+        rfm = group_agg(self.df, '거래처명', {
+            '날짜': 'max',
+            '판매ID': 'count',
+            '금액': 'sum'
+        })
+        rfm.columns = ['거래처명', '최근구매일', '구매빈도', '구매금액']
+        rfm = rfm[rfm['구매빈도'] > 0].reset_index(drop=True)
+        rfm['경과일수'] = (rfm['최근구매일'].max() - rfm['최근구매일']).dt.days
+        
+        n_scores = RFM_CONFIG['n_scores']
+        rfm['R'] = quantile_scores(rfm['경과일수'], n_scores, higher_is_better=False)
+        rfm['F'] = quantile_scores(rfm['구매빈도'], n_scores)
+        rfm['M'] = quantile_scores(rfm['구매금액'], n_scores)
+        rfm['RFM점수'] = rfm['R'].astype(str) + rfm['F'].astype(str) + rfm['M'].astype(str)
+        
+        # 세그먼트 규칙을 위에서부터 적용 (처음 맞는 규칙)
+        recency = rfm['R'].to_numpy()
+        frequency_monetary = (rfm['F'].to_numpy() + rfm['M'].to_numpy()) / 2
+        segments = RFM_CONFIG['segments']
+        conditions = [
+            (recency >= rule['R'][0]) & (recency <= rule['R'][1])
+            & (frequency_monetary >= rule['FM'][0]) & (frequency_monetary <= rule['FM'][1])
+            for rule in segments
+        ]
+        codes = np.select(conditions, list(range(len(segments))), default=-1)
+        rfm['세그먼트'] = pd.Categorical.from_codes(codes, categories=[rule['label'] for rule in segments], ordered=True)
+        
+        rfm = rfm.sort_values('구매금액', ascending=False, kind='stable').reset_index(drop=True)
+        return rfm[['거래처명', '최근구매일', '경과일수', '구매빈도', '구매금액', 'R', 'F', 'M', 'RFM점수', '세그먼트']]
+    
+    @memoized
+    def get_rfm_segments(self):
+        """
+        RFM 세그먼트별 거래처 수, 매출액, 비중을 계산합니다.
+        
+        Returns:
+            세그먼트, 거래처수, 거래처비중, 매출액, 매출비중, 평균경과일수, 평균구매빈도 컬럼의 데이터프레임
+            (RFM_CONFIG 순서, 거래처가 없는 세그먼트 포함)
+        """
+        rfm = self.get_rfm_scores()
+        segments = rfm.groupby('세그먼트', observed=False).agg(
+            거래처수=('거래처명', 'size'),
+            매출액=('구매금액', 'sum'),
+            평균경과일수=('경과일수', 'mean'),
+            평균구매빈도=('구매빈도', 'mean')
+        ).reset_index()
+        segments['세그먼트'] = segments['세그먼트'].astype(str)
+        segments['거래처비중'] = (segments['거래처수'] / max(len(rfm), 1) * 100).round(1)
+        total_sales = segments['매출액'].sum()
+        segments['매출비중'] = (segments['매출액'] / total_sales * 100).round(1) if total_sales else 0.0
+        segments['평균경과일수'] = segments['평균경과일수'].round(1)
+        segments['평균구매빈도'] = segments['평균구매빈도'].round(1)
+        return segments[['세그먼트', '거래처수', '거래처비중', '매출액', '매출비중', '평균경과일수', '평균구매빈도']]
+    
+    def create_rfm_segment_chart(self):
+        """RFM 세그먼트별 거래처 비중과 매출 비중 비교 차트를 생성합니다."""
+        segments = self.get_rfm_segments()
+        
+        fig = go.Figure()
+        
+        fig.add_trace(go.Bar(
+            x=segments['세그먼트'],
+            y=segments['거래처비중'],
+            name='거래처 비중',
+            marker=dict(color=COLORS['light_blue']),
+            text=segments['거래처비중'],
+            texttemplate='%{text:.1f}%',
+            textposition='outside',
+            customdata=segments['거래처수'],
+            hovertemplate='%{x}<br>거래처 비중: %{y:.1f}%<br>거래처 수: %{customdata:,}개<extra></extra>'
+        ))
+        
+        fig.add_trace(go.Bar(
+            x=segments['세그먼트'],
+            y=segments['매출비중'],
+            name='매출 비중',
+            marker=dict(color=COLORS['primary_blue']),
+            text=segments['매출비중'],
+            texttemplate='%{text:.1f}%',
+            textposition='outside',
+            customdata=segments['매출액'],
+            hovertemplate='%{x}<br>매출 비중: %{y:.1f}%<br>매출액: ₩%{customdata:,.0f}<extra></extra>'
+        ))
+        
+        # 레이아웃 설정
+        layout = PLOTLY_LAYOUT.copy()
+        layout.update({
+            'title': {
+                'text': 'RFM 세그먼트별 거래처 비중과 매출 비중',
+                'font': {'size': 16, 'weight': 'bold', 'color': COLORS['dark_gray']},
+                'x': 0.5,
+                'xanchor': 'center'
+            },
+            'xaxis': {
+                'title': '세그먼트',
+                'showgrid': False,
+                'color': COLORS['dark_gray']
+            },
+            'yaxis': {
+                'title': '비중 (%)',
+                'showgrid': True,
+                'gridcolor': COLORS['neutral_gray'],
+                'color': COLORS['dark_gray']
+            },
+            'height': 450,
+            'barmode': 'group',
+            'showlegend': True
+        })
+        
+        fig.update_layout(**layout)
+        return fig
@@ -8,7 +8,10 @@
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from config import COLORS, CHART_COLORS, PLOTLY_LAYOUT, REPORT_CONFIG
+from config import COLORS, CHART_COLORS, PLOTLY_LAYOUT, REPORT_CONFIG, DISCOUNT_BANDS
+from aggregates import get_cube, is_summary
+from .grouping import group_agg, column_sum, column_mean, discounted_rows, discounted_mask, transaction_count, band_distribution
+from .memo import memoized
 
 
 class DiscountAnalyzer:
@@ -17,16 +20,18 @@ class DiscountAnalyzer:
     def __init__(self, df):
         """
         Args:
-            df: 판매 데이터프레임
+            df: 판매 데이터프레임 (행 단위 데이터는 집계 큐브로 한 번 집계하여 분석)
         """
-        self.df = df
+        self.df = get_cube(df)
+        self.rows = None if is_summary(df) else df   # 설정과 다른 구간으로 집계할 때만 사용
     
+    @memoized
     def get_discount_application(self):
         """할인 적용 거래 vs 정상가 거래를 비교합니다."""
-        discount_app = self.df.groupby('할인적용').agg({
+        discount_app = group_agg(self.df, '할인적용', {
             '금액': 'sum',
             '판매ID': 'count'
-        }).reset_index()
+        })
         discount_app.columns = ['할인적용', '매출액', '거래건수']
         discount_app['매출비중'] = (discount_app['매출액'] / discount_app['매출액'].sum() * 100).round(1)
         return discount_app
@@ -69,27 +74,37 @@ class DiscountAnalyzer:
         fig.update_layout(**layout)
         return fig
     
-    def get_discount_rate_distribution(self):
-        """할인율별 매출 분포를 계산합니다."""
-        # 할인율 구간 설정
-        df_discount = self.df[self.df['Discount'] > 0].copy()
-        
-        if len(df_discount) == 0:
-            return pd.DataFrame()
-        
-        bins = [0, 0.1, 0.2, 0.3, 0.4, 0.5, 1.0]
-        labels = ['10% 미만', '10-20%', '20-30%', '30-40%', '40-50%', '50% 이상']
+    def get_discount_rate_distribution(self, bands=None):
+        """
+        할인율별 매출 분포를 계산합니다.
+        할인 거래는 마스크로만 고르고 구간별 합계는 bincount로 계산하므로 데이터를 복사하지 않습니다.
         
-        df_discount['할인율구간'] = pd.cut(df_discount['Discount'], bins=bins, labels=labels)
+        Args:
+            bands: 할인율 구간 설정 ({'bins', 'labels'} 또는 분위수 구간 {'quantiles': 구간 수}),
+                   None이면 DISCOUNT_BANDS (결과 캐시 사용). 설정과 다른 구간은 행 단위 데이터로 집계합니다.
+        """
+        if not bands or bands is DISCOUNT_BANDS:
+            return self._get_default_discount_rate_distribution()
+        return self._discount_rate_distribution(bands)
+    
+    @memoized
+    def _get_default_discount_rate_distribution(self):
+        """DISCOUNT_BANDS 구간의 할인율별 매출 분포를 계산합니다."""
+        return self._discount_rate_distribution(DISCOUNT_BANDS)
+    
+    def _discount_rate_distribution(self, bands):
+        """bands 구간의 할인율별 매출 분포를 계산합니다."""
+        df = self.df if bands is DISCOUNT_BANDS or self.rows is None else self.rows
         
-        discount_dist = df_discount.groupby('할인율구간', observed=False).agg({
-            '금액': 'sum',
-            '판매ID': 'count',
-            '할인액': 'sum'
-        }).reset_index()
-        discount_dist.columns = ['할인율구간', '매출액', '거래건수', '할인액']
+        discounted = discounted_mask(df)
+        if not discounted.any():
+            return pd.DataFrame()
         
-        return discount_dist
+        return band_distribution(df, 'Discount', bands, {
+            '매출액': '금액',
+            '거래건수': None,
+            '할인액': '할인액'
+        }, '할인율구간', mask=discounted)
     
     def create_discount_rate_chart(self):
         """할인율별 매출 분포 차트를 생성합니다."""
@@ -137,13 +152,14 @@ class DiscountAnalyzer:
         fig.update_layout(**layout)
         return fig
     
+    @memoized
     def get_category_discount(self):
         """제품 분류별 평균 할인율을 계산합니다."""
-        category_discount = self.df.groupby('분류명').agg({
+        category_discount = group_agg(self.df, '분류명', {
             'Discount': 'mean',
             '금액': 'sum',
             '할인액': 'sum'
-        }).reset_index()
+        })
         category_discount.columns = ['분류명', '평균할인율', '매출액', '할인액']
         category_discount['평균할인율'] = (category_discount['평균할인율'] * 100).round(1)
         category_discount['할인비율'] = (category_discount['할인액'] / (category_discount['매출액'] + category_discount['할인액']) * 100).round(1)
@@ -194,16 +210,18 @@ class DiscountAnalyzer:
         fig.update_layout(**layout)
         return fig
     
+    @memoized
     def get_discount_summary(self):
         """할인 관련 요약 정보를 반환합니다."""
-        total_discount = self.df['할인액'].sum() if '할인액' in self.df.columns else 0
-        discount_count = len(self.df[self.df['Discount'] > 0])
-        avg_discount_rate = self.df[self.df['Discount'] > 0]['Discount'].mean() * 100 if discount_count > 0 else 0
+        total_discount = column_sum(self.df, '할인액') if '할인액' in self.df.columns else 0
+        discounted = discounted_rows(self.df)
+        discount_count = transaction_count(discounted)
+        avg_discount_rate = column_mean(discounted, 'Discount') * 100 if discount_count > 0 else 0
         
         return {
             'total_discount': total_discount,
             'discount_count': discount_count,
-            'discount_ratio': round(discount_count / len(self.df) * 100, 1),
+            'discount_ratio': round(discount_count / transaction_count(self.df) * 100, 1),
             'avg_discount_rate': round(avg_discount_rate, 1)
         }
 
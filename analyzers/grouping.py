@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+그룹 집계 헬퍼 모듈
+행 단위 데이터와 부분 집계(요약) 데이터를 같은 방식으로 집계합니다.
+"""
+
+import numpy as np
+import pandas as pd
+from aggregates import (COUNT_COLUMN, is_summary, transaction_count, summary_mean_columns,
+                        resolve_bands, bin_codes, binned_totals)
+
+# top_n_per_group의 동점 처리 방식
+TIE_METHODS = ('first', 'min', 'dense')
+
+
+def _mean_columns(df, col):
+    """
+    요약 데이터에서 평균 계산에 쓰는 (합계 컬럼, 개수 컬럼)을 반환합니다.
+    개수는 결측이 아닌 값의 개수이므로 값이 비어 있는 행은 행 단위 mean()처럼 평균에서 빠집니다.
+    (결측 아닌 개수 컬럼이 없는 이전 요약 데이터는 판매건수 사용)
+    """
+    sum_col, count_col = summary_mean_columns(col)
+    return sum_col, count_col if count_col in df.columns else COUNT_COLUMN
+
+
+def group_agg(df, keys, spec, observed=True):
+    """
+    keys별로 집계합니다.
+
+    Args:
+        df: 행 단위 또는 요약 데이터프레임
+        keys: 그룹 키 컬럼
+        spec: {컬럼: 'sum' | 'count' | 'mean' | 'min' | 'max'} 형식의 집계 방법
+        observed: 범주형 키에서 관측된 값만 사용할지 여부
+
+    Returns:
+        키 컬럼과 집계 컬럼으로 구성된 데이터프레임 (spec의 컬럼명 유지)
+    """
+    if not is_summary(df):
+        return df.groupby(keys, observed=observed).agg(spec).reset_index()
+
+    # 요약 데이터: count는 판매건수 합계, mean은 합계 / 결측 아닌 개수, min/max는 요약 행의 최소/최대로 계산
+    needed = {COUNT_COLUMN: 'sum'}
+    for col, func in spec.items():
+        if func == 'sum':
+            needed[col] = 'sum'
+        elif func == 'mean':
+            for mean_col in _mean_columns(df, col):
+                needed[mean_col] = 'sum'
+        elif func in ('min', 'max'):
+            needed[col] = func
+        elif func != 'count':
+            raise ValueError(f"지원하지 않는 집계 방법: {func}")
+
+    sums = df.groupby(keys, observed=observed).agg(needed)
+    result = sums[[]].copy()
+    for col, func in spec.items():
+        if func in ('sum', 'min', 'max'):
+            result[col] = sums[col]
+        elif func == 'count':
+            result[col] = sums[COUNT_COLUMN]
+        else:
+            sum_col, count_col = _mean_columns(df, col)
+            result[col] = sums[sum_col] / sums[count_col]
+    return result.reset_index()
+
+
+def column_sum(df, col):
+    """컬럼 합계를 계산합니다."""
+    return df[col].sum()
+
+
+def column_mean(df, col):
+    """컬럼 평균을 계산합니다. 요약 데이터는 합계를 결측 아닌 값의 개수로 나눕니다."""
+    if not is_summary(df):
+        return df[col].mean()
+    sum_col, count_col = _mean_columns(df, col)
+    count = df[count_col].sum()
+    return df[sum_col].sum() / count if count > 0 else float('nan')
+
+
+def discounted_mask(df):
+    """할인이 적용된 거래(또는 요약 행)의 불리언 배열을 반환합니다."""
+    if is_summary(df):
+        return (df['할인적용'] == '할인').to_numpy()
+    return df['Discount'].to_numpy() > 0
+
+
+def discounted_rows(df):
+    """할인이 적용된 거래만 반환합니다."""
+    if is_summary(df):
+        return df[df['할인적용'] == '할인']
+    return df[df['Discount'] > 0]
+
+
+def top_n_per_group(df, group, value, n, ties='first', group_order=None, rank_column='순위'):
+    """
+    그룹별 value 상위 N개 행을 반환합니다.
+    전체를 한 번 정렬한 뒤 그룹 내 순위를 벡터 연산으로 매기고 잘라내므로
+    비용은 그룹 수와 관계없이 O(행 수 × log 행 수)입니다.
+    
+    Args:
+        df: 집계된 데이터프레임 (예: 분류명 × 제품별 매출액)
+        group: 그룹 컬럼 (또는 컬럼 리스트)
+        value: 순위 기준 컬럼 (큰 값이 상위, 결측은 제외)
+        n: 그룹별 선택할 순위
+        ties: 동점 처리 방식
+            'first' - 먼저 나온 행 우선, 그룹별 최대 n행 (nlargest keep='first'와 동일)
+            'min'   - 동점은 같은 순위(1, 2, 2, 4), 순위가 n 이하인 행 모두 포함
+            'dense' - 동점은 같은 순위(1, 2, 2, 3), 상위 n개 값에 해당하는 행 모두 포함
+        group_order: 결과에 나열할 그룹 순서 (None이면 그룹 키 순서, 목록에 없는 그룹은 제외)
+        rank_column: 그룹 내 순위를 담을 컬럼명
+    
+    Returns:
+        그룹 순서, 그룹 내 순위 순으로 정렬되고 순위 컬럼이 추가된 데이터프레임
+    """
+    if ties not in TIE_METHODS:
+        raise ValueError(f"지원하지 않는 동점 처리 방식: {ties} (가능: {', '.join(TIE_METHODS)})")
+    
+    values = df[value].to_numpy(dtype=np.float64)
+    if group_order is not None:
+        position = pd.Categorical(df[group], categories=list(group_order)).codes.astype(np.int64)
+    else:
+        position = df.groupby(group, sort=True, observed=True, dropna=False).ngroup().to_numpy()
+    valid = (position >= 0) & ~np.isnan(values)
+    rows = np.flatnonzero(valid)
+    
+    # 그룹 위치 오름차순, 값 내림차순으로 한 번 정렬 (lexsort는 안정 정렬이라 동점은 원래 순서 유지)
+    order = rows[np.lexsort((-values[rows], position[rows]))]
+    position, values = position[order], values[order]
+    
+    index = np.arange(len(order))
+    group_start = np.ones(len(order), dtype=bool)
+    group_start[1:] = position[1:] != position[:-1]
+    start_index = np.maximum.accumulate(np.where(group_start, index, 0))
+    
+    if ties == 'first':
+        rank = index - start_index + 1
+    else:
+        value_start = group_start.copy()
+        value_start[1:] |= values[1:] != values[:-1]
+        if ties == 'min':
+            # 같은 값 구간의 첫 행 순위를 구간 전체에 사용 (값 구간은 그룹 경계에서도 새로 시작)
+            run_start = np.maximum.accumulate(np.where(value_start, index, 0))
+            rank = run_start - start_index + 1
+        else:
+            steps = np.cumsum(value_start)
+            rank = steps - steps[start_index] + 1
+    
+    keep = rank <= n
+    result = df.iloc[order[keep]].reset_index(drop=True)
+    result[rank_column] = rank[keep]
+    return result
+
+
+def band_distribution(df, value_column, bands, measures, band_column, mask=None):
+    """
+    value_column 값을 bands 구간으로 나누어 구간별 합계와 거래 건수를 계산합니다.
+    구간이 비어 있어도 모든 구간을 결과에 포함합니다.
+    
+    Args:
+        df: 행 단위 또는 요약 데이터프레임
+        value_column: 구간을 나눌 값 컬럼 (예: '단가')
+        bands: 구간 설정 (resolve_bands 참고)
+        measures: {결과 컬럼명: 합계를 낼 컬럼, None이면 거래 건수}
+        band_column: 결과의 구간 컬럼명. 요약 데이터는 값 대신 이 범주형 컬럼의 구간을 사용하므로
+                     bands의 라벨이 요약 데이터의 구간과 같아야 합니다.
+        mask: 포함할 행의 불리언 배열 (None이면 전체)
+    
+    Returns:
+        구간 컬럼과 measures 컬럼으로 구성된 데이터프레임
+    """
+    summary = is_summary(df)
+    if summary:
+        bands_in_data = df[band_column].cat.categories
+        if 'quantiles' in bands or list(bands.get('labels') or []) != list(bands_in_data):
+            raise ValueError(f"요약 데이터는 저장된 {band_column} 구간으로만 집계할 수 있습니다.")
+        labels = list(bands_in_data)
+        codes = df[band_column].array.codes
+        counts = df[COUNT_COLUMN].to_numpy()   # 요약 행의 거래 건수
+    else:
+        values = df[value_column].to_numpy(dtype=np.float64)
+        if mask is not None and 'quantiles' in bands:
+            # 분위수는 집계 대상 행의 값으로 계산
+            values_for_edges = values[mask]
+        else:
+            values_for_edges = values
+        edges, labels = resolve_bands(bands, values_for_edges)
+        codes = bin_codes(values, edges)
+        counts = None   # 행 단위 데이터의 거래 건수는 행 수
+    
+    weights = {name: counts if col is None else df[col].to_numpy()
+               for name, col in measures.items()}
+    totals = binned_totals(codes, len(labels), weights, mask)
+    
+    result = pd.DataFrame({band_column: pd.Categorical(labels, categories=labels, ordered=True)})
+    for name, col in measures.items():
+        result[name] = np.rint(totals[name]).astype(np.int64) if col is None else totals[name]
+    return result
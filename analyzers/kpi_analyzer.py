@@ -8,6 +8,8 @@ KPI 분석 모듈
 import pandas as pd
 import numpy as np
 from config import COLORS, REPORT_CONFIG
+from aggregates import get_cube, kpi_totals, time_index
+from .memo import memoized
 
 
 class KPIAnalyzer:
@@ -16,13 +18,13 @@ class KPIAnalyzer:
     def __init__(self, df):
         """
         Args:
-            df: 판매 데이터프레임
+            df: 판매 데이터프레임 (행 단위 데이터는 집계 큐브로 한 번 집계하여 분석)
         """
-        self.df = df
+        self.df = get_cube(df)
         self.kpis = {}
     
     def calculate_all_kpis(self):
-        """모든 KPI를 계산합니다."""
+        """모든 KPI를 계산합니다. 필요한 값은 KPI 커널이 컬럼당 한 번의 연산으로 계산합니다."""
         self.kpis = {
             'total_sales': self._calculate_total_sales(),
             'total_transactions': self._calculate_total_transactions(),
@@ -35,38 +37,43 @@ class KPIAnalyzer:
         }
         return self.kpis
     
-    def _calculate_total_sales(self):
+    @property
+    def totals(self):
+        """KPI 계산에 필요한 합계와 고유 개수를 한 번에 계산한 결과입니다."""
+        return kpi_totals(self.df)
+    
+    def _calculate_total_sales(self, totals=None):
         """총 매출액을 계산합니다."""
-        total = self.df['금액'].sum()
+        total = (totals or self.totals)['sales_sum']
         return {
             'value': total,
             'formatted': f"{REPORT_CONFIG['currency_symbol']}{total:,.0f}",
             'label': '총 매출액'
         }
     
-    def _calculate_total_transactions(self):
+    def _calculate_total_transactions(self, totals=None):
         """총 거래 건수를 계산합니다."""
-        count = len(self.df)
+        count = (totals or self.totals)['transactions']
         return {
             'value': count,
             'formatted': f"{count:,}건",
             'label': '총 거래 건수'
         }
     
-    def _calculate_avg_transaction(self):
+    def _calculate_avg_transaction(self, totals=None):
         """평균 거래 금액을 계산합니다."""
-        avg = self.df['금액'].mean()
+        totals = totals or self.totals
+        avg = totals['sales_sum'] / totals['sales_count'] if totals['sales_count'] > 0 else float('nan')
         return {
             'value': avg,
             'formatted': f"{REPORT_CONFIG['currency_symbol']}{avg:,.0f}",
             'label': '평균 거래 금액'
         }
     
-    def _calculate_total_discount(self):
+    def _calculate_total_discount(self, totals=None):
         """총 할인액을 계산합니다."""
-        if '할인액' in self.df.columns:
-            total = self.df['할인액'].sum()
-        else:
+        total = (totals or self.totals)['discount_amount_sum']
+        if total is None:
             total = 0
         return {
             'value': total,
@@ -76,19 +83,18 @@ class KPIAnalyzer:
     
     def _calculate_customer_count(self):
         """거래처 수를 계산합니다."""
-        count = self.df['거래처명'].nunique()
+        count = self.totals['distinct']['거래처명']
         return {
             'value': count,
             'formatted': f"{count:,}개",
             'label': '거래처 수'
         }
     
-    def _calculate_avg_discount_rate(self):
+    def _calculate_avg_discount_rate(self, totals=None):
         """평균 할인율을 계산합니다."""
-        if 'Discount' in self.df.columns:
-            avg_rate = self.df[self.df['Discount'] > 0]['Discount'].mean() * 100
-            if pd.isna(avg_rate):
-                avg_rate = 0
+        totals = totals or self.totals
+        if totals['discounted_count']:
+            avg_rate = totals['discount_rate_sum'] / totals['discounted_count'] * 100
         else:
             avg_rate = 0
         return {
@@ -97,9 +103,9 @@ class KPIAnalyzer:
             'label': '평균 할인율'
         }
     
-    def _calculate_total_quantity(self):
+    def _calculate_total_quantity(self, totals=None):
         """총 판매 수량을 계산합니다."""
-        total = self.df['수량'].sum()
+        total = (totals or self.totals)['quantity_sum']
         return {
             'value': total,
             'formatted': f"{total:,.0f}개",
@@ -108,19 +114,65 @@ class KPIAnalyzer:
     
     def _calculate_unique_products(self):
         """판매된 제품 종류를 계산합니다."""
-        count = self.df['제품명'].nunique()
+        count = self.totals['distinct']['제품명']
         return {
             'value': count,
             'formatted': f"{count:,}종",
             'label': '제품 종류'
         }
     
+    def get_range_kpis(self, start=None, end=None):
+        """
+        기간 KPI(총 매출액, 거래 건수, 평균 거래 금액, 총 할인액, 평균 할인율, 총 판매 수량)를 계산합니다.
+        날짜순 누적합 인덱스에서 이진 탐색 두 번과 뺄셈으로 계산하므로 행 데이터를 읽지 않습니다.
+        (고유 개수 KPI는 누적합으로 구할 수 없어 포함하지 않음)
+        
+        Args:
+            start: 시작일 (None이면 처음부터)
+            end: 종료일, 포함 (None이면 끝까지)
+        """
+        totals = time_index(self.df).range_totals(start, end)
+        return {
+            'total_sales': self._calculate_total_sales(totals),
+            'total_transactions': self._calculate_total_transactions(totals),
+            'avg_transaction': self._calculate_avg_transaction(totals),
+            'total_discount': self._calculate_total_discount(totals),
+            'avg_discount_rate': self._calculate_avg_discount_rate(totals),
+            'total_quantity': self._calculate_total_quantity(totals),
+        }
+    
+    def compare_periods(self, current, previous):
+        """
+        두 기간의 KPI를 비교합니다.
+        
+        Args:
+            current: 비교 기간 (시작일, 종료일)
+            previous: 기준 기간 (시작일, 종료일)
+        
+        Returns:
+            {KPI 키: {'current', 'previous': KPI 정보, 'change_pct': 증감률(%), 기준값이 0이면 None}}
+        """
+        current_kpis = self.get_range_kpis(*current)
+        previous_kpis = self.get_range_kpis(*previous)
+        comparison = {}
+        for key, kpi in current_kpis.items():
+            base = previous_kpis[key]['value']
+            valid = base and not np.isnan(base) and not np.isnan(kpi['value'])
+            comparison[key] = {
+                'current': kpi,
+                'previous': previous_kpis[key],
+                'change_pct': (kpi['value'] - base) / abs(base) * 100 if valid else None,
+            }
+        return comparison
+    
+    @memoized
     def get_kpis(self):
         """계산된 KPI를 반환합니다."""
         if not self.kpis:
             self.calculate_all_kpis()
         return self.kpis
     
+    @memoized
     def get_kpi_summary(self):
         """KPI 요약 정보를 반환합니다."""
         kpis = self.get_kpis()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+분석 결과 메모이제이션 모듈
+분석기 메서드의 결과를 (메서드, 인자, 입력 데이터 지문) 키로 저장하여
+같은 데이터에 대한 중간 집계 테이블을 한 번만 계산합니다.
+"""
+
+import copy
+import functools
+import hashlib
+import inspect
+import threading
+from collections import OrderedDict
+import pandas as pd
+from config import MEMO_CONFIG
+from aggregates import FrameMemo
+
+# pandas 3 이상(또는 Copy-on-Write 옵션 사용 시)은 얕은 복사본에 값을 써도 원본이 바뀌지 않음
+_COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3 or pd.get_option('mode.copy_on_write') is True
+
+def _compute_fingerprint(df):
+    """데이터프레임의 내용 지문(컬럼, dtype, 값 해시)을 계산합니다."""
+    digest = hashlib.sha256()
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# 같은 데이터프레임 객체에 대해서는 지문을 한 번만 계산
+frame_fingerprint = FrameMemo(_compute_fingerprint)
+
+
+def _read_only_view(value):
+    """
+    캐시된 결과를 호출자에게 넘길 사본을 만듭니다. 호출자가 사본을 수정해도 캐시는 바뀌지 않습니다.
+    데이터프레임은 Copy-on-Write가 적용되면 데이터를 복사하지 않는 얕은 사본을 반환합니다.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=not _COPY_ON_WRITE)
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+
+class ResultCache:
+    """분석 결과 LRU 캐시 클래스 (세션/분석기 인스턴스 간 공유)"""
+    
+    def __init__(self, max_entries=None):
+        """
+        Args:
+            max_entries: 보관할 최대 결과 수 (None이면 MEMO_CONFIG 설정)
+        """
+        self.max_entries = max_entries or MEMO_CONFIG['max_entries']
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._pending = {}   # 키 -> 계산 중인 스레드가 잡고 있는 잠금
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """(찾았는지 여부, 값)을 반환합니다."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, self._entries[key]
+    
+    def get_or_compute(self, key, compute):
+        """
+        키의 결과를 반환하고, 없으면 compute()로 계산하여 저장합니다.
+        여러 스레드가 동시에 같은 키를 요청하면 한 스레드만 계산하고 나머지는 결과를 기다립니다.
+        """
+        found, value = self.get(key)
+        if found:
+            return value
+        with self._lock:
+            pending = self._pending.setdefault(key, threading.Lock())
+        
+        with pending:
+            with self._lock:
+                found = key in self._entries
+                value = self._entries.get(key)
+            if found:
+                return value
+            try:
+                value = compute()
+                self.put(key, value)
+                return value
+            finally:
+                with self._lock:
+                    self._pending.pop(key, None)
+    
+    def put(self, key, value):
+        """결과를 저장하고, 한도를 넘으면 가장 오래 사용하지 않은 결과를 제거합니다."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def stats(self):
+        """적중/미적중 횟수와 저장된 결과 수를 반환합니다."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+    
+    def clear(self):
+        """저장된 결과와 통계를 모두 삭제합니다."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def __len__(self):
+        return len(self._entries)
+
+
+# 모든 분석기가 공유하는 결과 캐시
+RESULT_CACHE = ResultCache()
+
+
+def memoized(method):
+    """
+    분석기 메서드 결과를 RESULT_CACHE에 저장하는 데코레이터입니다.
+    키는 (클래스.메서드, 인자, self.df 지문)이므로 같은 데이터에 대해서는
+    분석기 인스턴스가 달라도 한 번만 계산합니다.
+    """
+    name = method.__qualname__
+    signature = inspect.signature(method)
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # 기본값을 채워 get_top_customers()와 get_top_customers(10)이 같은 키가 되도록 함
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = tuple(item for item in bound.arguments.items() if item[0] != 'self')
+        key = (name, arguments, frame_fingerprint(self.df))
+        value = RESULT_CACHE.get_or_compute(key, lambda: method(self, *args, **kwargs))
+        return _read_only_view(value)
+    
+    return wrapper
+
+
+def get_memo_stats():
+    """분석 결과 캐시의 적중/미적중 통계를 반환합니다."""
+    return RESULT_CACHE.stats()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+분석 병렬 실행 모듈
+분석기 생성, 집계 테이블 계산, 차트 생성처럼 같은 데이터를 읽기만 하는 독립 작업을
+스레드 풀에서 동시에 실행하고, 결과는 완료 순서와 관계없이 작업 목록 순서로 모읍니다.
+분석기들은 결과 캐시(RESULT_CACHE)와 집계 큐브를 공유하므로 프로세스가 아닌 스레드를 사용합니다.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import PARALLEL_CONFIG
+
+# 보고서/대시보드 차트 목록 (차트 ID, 분석기 이름, 메서드 이름) - 보고서의 차트 순서
+CHART_BUILDERS = [
+    ('monthly-sales-chart', 'timeseries', 'create_monthly_sales_chart'),
+    ('monthly-transactions-chart', 'timeseries', 'create_monthly_transactions_chart'),
+    ('quarterly-sales-chart', 'timeseries', 'create_quarterly_sales_chart'),
+    ('weekday-chart', 'timeseries', 'create_weekday_chart'),
+    ('rolling-sales-chart', 'timeseries', 'create_rolling_sales_chart'),
+    ('cumulative-sales-chart', 'timeseries', 'create_cumulative_sales_chart'),
+    ('yoy-chart', 'timeseries', 'create_yoy_chart'),
+    ('category-pie-chart', 'product', 'create_category_pie_chart'),
+    ('category-bar-chart', 'product', 'create_category_bar_chart'),
+    ('price-distribution-chart', 'product', 'create_price_distribution_chart'),
+    ('top-customers-chart', 'customer', 'create_top_customers_chart'),
+    ('customer-transactions-chart', 'customer', 'create_customer_transaction_chart'),
+    ('cohort-retention-chart', 'customer', 'create_cohort_retention_chart'),
+    ('discount-application-chart', 'discount', 'create_discount_application_chart'),
+    ('discount-rate-chart', 'discount', 'create_discount_rate_chart'),
+    ('category-discount-chart', 'discount', 'create_category_discount_chart'),
+]
+
+# 분석기별 집계 테이블 메서드 (분석 단계에서 미리 계산해 결과 캐시에 두면 보고서/차트는 캐시를 읽음)
+ANALYSIS_TABLES = {
+    'kpi': ['get_kpi_summary'],
+    'timeseries': ['get_monthly_sales', 'get_monthly_transactions', 'get_quarterly_sales',
+                   'get_weekday_pattern', 'get_period_sales'],
+    'product': ['get_category_sales', 'get_top_products_by_category', 'get_price_distribution'],
+    'customer': ['get_customer_sales', 'get_customer_transaction_count', 'get_customer_detail',
+                 'get_cohort_matrix'],
+    'discount': ['get_discount_application', 'get_discount_rate_distribution', 'get_category_discount',
+                 'get_discount_summary'],
+}
+
+
+def _timed(func, args):
+    """작업을 실행하고 (결과, 소요 시간(초))를 반환합니다."""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def run_tasks(tasks, mode=None, max_workers=None):
+    """
+    이름 붙은 작업들을 실행합니다.
+    
+    Args:
+        tasks: [(이름, 함수, 인자...)] 리스트 (이름은 서로 달라야 함)
+        mode: 'parallel' 또는 'serial' (None이면 PARALLEL_CONFIG 설정)
+        max_workers: 스레드 수 (None이면 PARALLEL_CONFIG 설정, 없으면 CPU 코어 수)
+    
+    Returns:
+        ({이름: 결과}, {이름: 소요 시간(초)}) - 두 딕셔너리 모두 작업 목록 순서
+        실패한 작업이 있으면 목록 순서상 첫 번째 실패 작업의 예외를 다시 발생시킵니다.
+    """
+    mode = mode or PARALLEL_CONFIG['analysis_mode']
+    if mode not in ('parallel', 'serial'):
+        raise ValueError(f"지원하지 않는 실행 모드입니다: {mode}")
+    names = [task[0] for task in tasks]
+    if len(set(names)) != len(names):
+        raise ValueError("작업 이름이 중복되었습니다.")
+    
+    max_workers = min(max_workers or PARALLEL_CONFIG['analysis_workers'] or os.cpu_count() or 1, len(tasks))
+    if mode == 'serial' or max_workers <= 1:
+        outcomes = [_timed(task[1], task[2:]) for task in tasks]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_timed, task[1], task[2:]) for task in tasks]
+            outcomes = [future.result() for future in futures]
+    
+    results = {name: outcome[0] for name, outcome in zip(names, outcomes)}
+    timings = {name: outcome[1] for name, outcome in zip(names, outcomes)}
+    return results, timings
+
+
+def compute_tables(analyzer_class, df, key):
+    """
+    분석기를 만들고 ANALYSIS_TABLES[key]의 집계 테이블을 계산합니다. (run_tasks 작업용)
+    계산 결과는 결과 캐시에 저장되므로 이후 같은 데이터의 호출은 다시 집계하지 않습니다.
+    
+    Returns:
+        분석기 객체
+    """
+    analyzer = analyzer_class(df)
+    for method_name in ANALYSIS_TABLES[key]:
+        getattr(analyzer, method_name)()
+    return analyzer
+
+
+def build_charts(analyzers, convert=None, mode=None, max_workers=None, sections=None):
+    """
+    CHART_BUILDERS의 차트를 생성합니다.
+    
+    Args:
+        analyzers: {'timeseries', 'product', 'customer', 'discount': 분석기 객체}
+                   (sections를 주면 해당 분석기만 있으면 됨)
+        convert: (Figure, 차트 ID)를 받아 변환하는 함수 (예: 보고서 스크립트 변환, 작업 안에서 함께 실행)
+        mode, max_workers: run_tasks 참고
+        sections: 생성할 차트의 분석기 이름 리스트 (None이면 전체, 예: 대시보드의 선택한 탭)
+    
+    Returns:
+        ({차트 ID: Figure 또는 변환 결과}, {차트 ID: 소요 시간(초)})
+        차트를 만들 데이터가 없으면(None) 결과에서 제외합니다.
+    """
+    def build(chart_id, analyzer, method_name):
+        fig = getattr(analyzer, method_name)()
+        if fig is None or convert is None:
+            return fig
+        return convert(fig, chart_id)
+    
+    tasks = [
+        (chart_id, build, chart_id, analyzers[key], method_name)
+        for chart_id, key, method_name in CHART_BUILDERS
+        if sections is None or key in sections
+    ]
+    charts, timings = run_tasks(tasks, mode, max_workers)
+    return {chart_id: chart for chart_id, chart in charts.items() if chart is not None}, timings
+
+
+def format_timings(timings, elapsed=None):
+    """
+    작업별 소요 시간을 출력용 문자열 리스트로 만듭니다.
+    elapsed(전체 경과 시간)를 주면 작업 시간 합계 대비 비율(병렬 효과)을 마지막 줄에 붙입니다.
+    """
+    lines = [f"{name}: {seconds * 1000:,.1f}ms" for name, seconds in timings.items()]
+    if elapsed is not None and elapsed > 0:
+        total = sum(timings.values())
+        lines.append(f"작업 합계 {total * 1000:,.1f}ms / 경과 {elapsed * 1000:,.1f}ms (x{total / elapsed:.2f})")
+    return lines
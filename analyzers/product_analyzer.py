@@ -2,14 +2,17 @@
 # -*- coding: utf-8 -*-
 """
 제품 분석 모듈
-제품별, 제품 분류별, 색상별 판매 현황을 분석합니다.
+제품별, 제품 분류별, 색상별 판매 현황과 매출 집중도를 분석합니다.
 """
 
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
-from config import COLORS, CHART_COLORS, PLOTLY_LAYOUT, REPORT_CONFIG
+from config import COLORS, CHART_COLORS, PLOTLY_LAYOUT, REPORT_CONFIG, PRICE_BANDS
+from aggregates import get_cube, is_summary, Concentration
+from .grouping import group_agg, top_n_per_group, band_distribution
+from .memo import memoized
 
 
 class ProductAnalyzer:
@@ -18,17 +21,19 @@ class ProductAnalyzer:
     def __init__(self, df):
         """
         Args:
-            df: 판매 데이터프레임
+            df: 판매 데이터프레임 (행 단위 데이터는 집계 큐브로 한 번 집계하여 분석)
         """
-        self.df = df
+        self.df = get_cube(df)
+        self.rows = None if is_summary(df) else df   # 설정과 다른 구간으로 집계할 때만 사용
     
+    @memoized
     def get_category_sales(self):
         """제품 분류별 매출을 계산합니다."""
-        category = self.df.groupby('분류명').agg({
+        category = group_agg(self.df, '분류명', {
             '금액': 'sum',
             '판매ID': 'count',
             '수량': 'sum'
-        }).reset_index()
+        })
         category.columns = ['분류명', '매출액', '거래건수', '판매수량']
         category = category.sort_values('매출액', ascending=False)
         category['매출비중'] = (category['매출액'] / category['매출액'].sum() * 100).round(1)
@@ -116,59 +121,81 @@ class ProductAnalyzer:
         fig.update_layout(**layout)
         return fig
     
+    @memoized
     def get_top_products(self, top_n=10):
         """제품별 TOP N 매출을 계산합니다."""
-        products = self.df.groupby(['제품코드', '제품명', '분류명']).agg({
+        products = group_agg(self.df, ['제품코드', '제품명', '분류명'], {
             '금액': 'sum',
             '판매ID': 'count',
             '수량': 'sum'
-        }).reset_index()
+        })
         products.columns = ['제품코드', '제품명', '분류명', '매출액', '거래건수', '판매수량']
         products = products.sort_values('매출액', ascending=False).head(top_n)
         products['순위'] = range(1, len(products) + 1)
         return products[['순위', '제품명', '분류명', '매출액', '거래건수', '판매수량']]
     
-    def get_top_products_by_category(self, top_n=3):
-        """제품 분류별 TOP N 매출 제품을 계산합니다. (테이블 형식)"""
-        products = self.df.groupby(['분류명', '제품코드', '제품명']).agg({
+    @memoized
+    def get_product_pareto(self):
+        """
+        제품별 매출액 집중도 엔진을 반환합니다. (파레토 곡선, ABC 등급, 지니 계수, HHI, 상위 N개 비중 조회)
+        제품명이 같고 제품코드가 다른 제품은 따로 집계합니다.
+        """
+        products = group_agg(self.df, ['제품코드', '제품명'], {'금액': 'sum'})
+        products.columns = ['제품코드', '제품명', '매출액']
+        return Concentration(products.set_index('제품명')['매출액'])
+    
+    @memoized
+    def get_category_pareto(self):
+        """제품 분류별 매출액 집중도 엔진을 반환합니다."""
+        category = self.get_category_sales()
+        return Concentration(category.set_index('분류명')['매출액'])
+    
+    @memoized
+    def get_top_products_by_category(self, top_n=3, ties='first'):
+        """
+        제품 분류별 TOP N 매출 제품을 계산합니다. (테이블 형식)
+        
+        Args:
+            top_n: 분류별 제품 수
+            ties: 동점 처리 방식 ('first', 'min', 'dense' - top_n_per_group 참고)
+        """
+        products = group_agg(self.df, ['분류명', '제품코드', '제품명'], {
             '금액': 'sum',
             '판매ID': 'count',
             '수량': 'sum'
-        }).reset_index()
+        })
         products.columns = ['분류명', '제품코드', '제품명', '매출액', '거래건수', '판매수량']
         
-        # 분류명을 매출액 순으로 정렬
+        # 분류명은 매출액 순, 분류 안에서는 제품 매출액 순으로 상위 N개 선택
         category_order = self.get_category_sales()['분류명'].tolist()
-        
-        # 각 분류별로 상위 N개 제품 선택
-        top_products_list = []
-        for category in category_order:
-            category_data = products[products['분류명'] == category].nlargest(top_n, '매출액').copy()
-            # 분류 내 순위 추가
-            category_data['분류내순위'] = range(1, len(category_data) + 1)
-            top_products_list.append(category_data)
-        
-        top_products = pd.concat(top_products_list, ignore_index=True)
+        top_products = top_n_per_group(products, '분류명', '매출액', top_n, ties=ties,
+                                       group_order=category_order, rank_column='분류내순위')
         
         # 테이블 형식에 맞게 컬럼 재정렬
         return top_products[['분류명', '분류내순위', '제품명', '매출액', '거래건수', '판매수량']]
     
-    def get_price_distribution(self):
-        """단가대별 제품 분포를 계산합니다."""
-        # 단가대 구간 설정
-        bins = [0, 50000, 100000, 200000, 500000, 1000000, float('inf')]
-        labels = ['5만원 미만', '5-10만원', '10-20만원', '20-50만원', '50-100만원', '100만원 이상']
-        
-        df_temp = self.df.copy()
-        df_temp['단가대'] = pd.cut(df_temp['단가'], bins=bins, labels=labels)
-        
-        price_dist = df_temp.groupby('단가대', observed=False).agg({
-            '금액': 'sum',
-            '판매ID': 'count'
-        }).reset_index()
-        price_dist.columns = ['단가대', '매출액', '거래건수']
+    def get_price_distribution(self, bands=None):
+        """
+        단가대별 제품 분포를 계산합니다.
+        구간 번호를 searchsorted로, 구간별 합계를 bincount로 계산하므로 데이터를 복사하지 않습니다.
         
-        return price_dist
+        Args:
+            bands: 단가 구간 설정 ({'bins', 'labels'} 또는 분위수 구간 {'quantiles': 구간 수}),
+                   None이면 PRICE_BANDS (결과 캐시 사용). 설정과 다른 구간은 행 단위 데이터로 집계합니다.
+        """
+        if not bands or bands is PRICE_BANDS:
+            return self._get_default_price_distribution()
+        return self._price_distribution(bands)
+    
+    @memoized
+    def _get_default_price_distribution(self):
+        """PRICE_BANDS 구간의 단가대별 제품 분포를 계산합니다."""
+        return self._price_distribution(PRICE_BANDS)
+    
+    def _price_distribution(self, bands):
+        """bands 구간의 단가대별 제품 분포를 계산합니다."""
+        df = self.df if bands is PRICE_BANDS or self.rows is None else self.rows
+        return band_distribution(df, '단가', bands, {'매출액': '금액', '거래건수': None}, '단가대')
     
     def create_price_distribution_chart(self):
         """단가대별 제품 분포 차트를 생성합니다."""
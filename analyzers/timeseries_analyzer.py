@@ -2,14 +2,18 @@
 # -*- coding: utf-8 -*-
 """
 시계열 분석 모듈
-월별, 분기별, 요일별 판매 추이를 분석합니다.
+월별, 분기별, 요일별 판매 추이와 기간 단위(일/주/월/분기/회계연도)별 이동 평균, 누적 합계, 전년 동기 대비를 분석합니다.
 """
 
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
-from config import COLORS, CHART_COLORS, PLOTLY_LAYOUT, REPORT_CONFIG
+from config import COLORS, CHART_COLORS, PLOTLY_LAYOUT, REPORT_CONFIG, TIMESERIES_CONFIG
+from time_keys import GRANULARITIES, year_month_label, quarter_label, weekday_label
+from aggregates import get_cube, daily_series
+from .grouping import group_agg
+from .memo import memoized
 
 
 class TimeSeriesAnalyzer:
@@ -18,24 +22,26 @@ class TimeSeriesAnalyzer:
     def __init__(self, df):
         """
         Args:
-            df: 판매 데이터프레임
+            df: 판매 데이터프레임 (행 단위 데이터는 집계 큐브로 한 번 집계하여 분석)
         """
-        self.df = df
+        self.df = get_cube(df)
     
+    @memoized
     def get_monthly_sales(self):
         """월별 매출액을 계산합니다."""
-        # 년월별로 그룹화하여 매출액 합계와 거래건수 계산
-        monthly = self.df.groupby(['년', '월'], as_index=False).agg({
+        # 정수 년월키로 그룹화하여 매출액 합계와 거래건수 계산 (키 순서 = 시간 순서)
+        monthly = group_agg(self.df, '년월키', {
             '금액': 'sum',
             '수량': 'sum'
         })
-        monthly.columns = ['년', '월', '매출액', '거래건수']
-        
-        # 년월 컬럼 생성 (정렬 및 표시용)
-        monthly['년월'] = monthly['년'].astype(str) + '-' + monthly['월'].astype(str).str.zfill(2)
-        
-        # 년, 월 순으로 정렬
-        monthly = monthly.sort_values(['년', '월'])
+        keys = monthly['년월키']
+        monthly = pd.DataFrame({
+            '년': keys // 12,
+            '월': keys % 12 + 1,
+            '매출액': monthly['금액'],
+            '거래건수': monthly['수량'],
+            '년월': year_month_label(keys),  # 표시용 라벨
+        })
         
         return monthly
     
@@ -99,14 +105,17 @@ class TimeSeriesAnalyzer:
         fig.update_layout(**layout)
         return fig
     
+    @memoized
     def get_quarterly_sales(self):
         """분기별 매출을 계산합니다."""
-        quarterly = self.df.groupby(['년', '분기']).agg({
+        quarterly = group_agg(self.df, '분기키', {
             '금액': 'sum',
             '판매ID': 'count'
-        }).reset_index()
-        quarterly['분기명'] = quarterly['년'].astype(str) + 'Q' + quarterly['분기'].astype(str)
-        quarterly = quarterly.sort_values(['년', '분기'])
+        })
+        keys = quarterly.pop('분기키')
+        quarterly.insert(0, '년', keys // 4)
+        quarterly.insert(1, '분기', keys % 4 + 1)
+        quarterly['분기명'] = quarter_label(keys)
         return quarterly
     
     def create_quarterly_sales_chart(self):
@@ -152,18 +161,18 @@ class TimeSeriesAnalyzer:
         fig.update_layout(**layout)
         return fig
     
+    @memoized
     def get_weekday_pattern(self):
         """요일별 판매 패턴을 분석합니다."""
-        요일_순서 = ['월요일', '화요일', '수요일', '목요일', '금요일', '토요일', '일요일']
-        weekday = self.df.groupby('요일명').agg({
+        # 요일번호(0=월요일) 순으로 그룹화되므로 별도 정렬이 필요 없음
+        weekday = group_agg(self.df, '요일번호', {
             '금액': 'sum',
             '판매ID': 'count'
-        }).reset_index()
+        })
         weekday.columns = ['요일', '매출액', '거래건수']
         
-        # 요일 순서 정렬
-        weekday['요일'] = pd.Categorical(weekday['요일'], categories=요일_순서, ordered=True)
-        weekday = weekday.sort_values('요일')
+        # 표시용 한글 요일명
+        weekday['요일'] = weekday_label(weekday['요일'])
         
         return weekday
     
@@ -212,6 +221,7 @@ class TimeSeriesAnalyzer:
         fig.update_layout(**layout)
         return fig
     
+    @memoized
     def get_monthly_transactions(self):
         """월별 거래 건수를 계산합니다."""
         monthly = self.get_monthly_sales()
@@ -276,4 +286,158 @@ class TimeSeriesAnalyzer:
         
         fig.update_layout(**layout)
         return fig
-
+    
+    @memoized
+    def get_period_sales(self, granularity='month', window=None):
+        """
+        기간 단위별 매출과 이동 합계/평균, 누적 합계, 전년 동기 대비 증감률을 계산합니다.
+        
+        Args:
+            granularity: 'day', 'week'(ISO 주), 'month', 'quarter', 'fiscal_year'
+            window: 이동 합계/평균 기간 수 (None이면 TIMESERIES_CONFIG 단위별 설정)
+        """
+        return daily_series(self.df).series(granularity, window)
+    
+    def _period_layout(self, title, x_title, y_title, height=450):
+        """기간 단위 차트의 공통 레이아웃을 만듭니다."""
+        layout = PLOTLY_LAYOUT.copy()
+        layout.update({
+            'title': {
+                'text': title,
+                'font': {'size': 16, 'weight': 'bold', 'color': COLORS['dark_gray']},
+                'x': 0.5,
+                'xanchor': 'center'
+            },
+            'xaxis': {
+                'title': x_title,
+                'showgrid': False,
+                'color': COLORS['dark_gray']
+            },
+            'yaxis': {
+                'title': y_title,
+                'showgrid': True,
+                'gridcolor': COLORS['neutral_gray'],
+                'color': COLORS['dark_gray']
+            },
+            'height': height,
+            'showlegend': True
+        })
+        return layout
+    
+    def create_rolling_sales_chart(self, granularity='day', window=None):
+        """기간 단위 매출과 이동 평균 추이 차트를 생성합니다."""
+        window = window or TIMESERIES_CONFIG['rolling_windows'][granularity]
+        period = self.get_period_sales(granularity, window)
+        unit = GRANULARITIES[granularity]
+        
+        fig = go.Figure()
+        
+        # 기간 매출 (일 단위는 기간이 많으므로 막대 대신 얇은 선)
+        if granularity == 'day':
+            fig.add_trace(go.Scatter(
+                x=period['기간'],
+                y=period['매출액'],
+                mode='lines',
+                name=f'{unit}별 매출액',
+                line=dict(color=COLORS['light_blue'], width=1),
+                hovertemplate='%{x}<br>매출액: ₩%{y:,.0f}<extra></extra>'
+            ))
+        else:
+            fig.add_trace(go.Bar(
+                x=period['기간'],
+                y=period['매출액'],
+                name=f'{unit}별 매출액',
+                marker=dict(color=COLORS['light_blue']),
+                hovertemplate='%{x}<br>매출액: ₩%{y:,.0f}<extra></extra>'
+            ))
+        
+        # 이동 평균
+        fig.add_trace(go.Scatter(
+            x=period['기간'],
+            y=period['이동평균'],
+            mode='lines',
+            name=f'{window}{unit} 이동평균',
+            line=dict(color=COLORS['primary_blue'], width=3),
+            hovertemplate='%{x}<br>이동평균: ₩%{y:,.0f}<extra></extra>'
+        ))
+        
+        layout = self._period_layout(f'{unit}별 매출 및 {window}{unit} 이동평균', f'기간 ({unit})', '매출액 (원)')
+        fig.update_layout(**layout)
+        return fig
+    
+    def create_cumulative_sales_chart(self, granularity='day'):
+        """기간 단위 누적 매출 추이 차트를 생성합니다."""
+        period = self.get_period_sales(granularity)
+        unit = GRANULARITIES[granularity]
+        
+        fig = go.Figure()
+        
+        fig.add_trace(go.Scatter(
+            x=period['기간'],
+            y=period['누적합계'],
+            mode='lines',
+            name='누적 매출액',
+            fill='tozeroy',
+            line=dict(color=COLORS['primary_blue'], width=2),
+            fillcolor=COLORS['light_blue'],
+            hovertemplate='%{x}<br>누적 매출액: ₩%{y:,.0f}<extra></extra>'
+        ))
+        
+        layout = self._period_layout('누적 매출 추이', f'기간 ({unit})', '누적 매출액 (원)', height=400)
+        layout['showlegend'] = False
+        fig.update_layout(**layout)
+        return fig
+    
+    def create_yoy_chart(self, granularity='month'):
+        """
+        기간 단위 전년 동기 대비 매출 차트를 생성합니다.
+        전년 동기 데이터가 있는 기간이 없으면 None을 반환합니다.
+        """
+        period = self.get_period_sales(granularity)
+        if period['전년동기'].isna().all():
+            return None
+        unit = GRANULARITIES[granularity]
+        
+        fig = go.Figure()
+        
+        fig.add_trace(go.Bar(
+            x=period['기간'],
+            y=period['전년동기'],
+            name='전년 동기',
+            marker=dict(color=COLORS['neutral_gray']),
+            hovertemplate='%{x}<br>전년 동기: ₩%{y:,.0f}<extra></extra>'
+        ))
+        
+        fig.add_trace(go.Bar(
+            x=period['기간'],
+            y=period['매출액'],
+            name='당기',
+            marker=dict(color=COLORS['primary_blue']),
+            hovertemplate='%{x}<br>매출액: ₩%{y:,.0f}<extra></extra>'
+        ))
+        
+        # 증감률 (보조 축)
+        fig.add_trace(go.Scatter(
+            x=period['기간'],
+            y=period['전년대비(%)'],
+            mode='lines+markers',
+            name='전년 대비 증감률',
+            yaxis='y2',
+            line=dict(color=COLORS['secondary_blue'], width=2),
+            marker=dict(size=6, color=COLORS['secondary_blue']),
+            hovertemplate='%{x}<br>전년 대비: %{y:+.1f}%<extra></extra>'
+        ))
+        
+        layout = self._period_layout(f'{unit}별 전년 동기 대비 매출', f'기간 ({unit})', '매출액 (원)')
+        layout.update({
+            'yaxis2': {
+                'title': '전년 대비 증감률 (%)',
+                'overlaying': 'y',
+                'side': 'right',
+                'showgrid': False,
+                'color': COLORS['dark_gray']
+            },
+            'barmode': 'group'
+        })
+        fig.update_layout(**layout)
+        return fig
@@ -10,19 +10,45 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from datetime import datetime
+from datetime import datetime, timedelta
+import io
 import sys
+import time
 
 # 모듈 임포트
-from data_loader import SalesDataLoader
+from data_loader import (
+    SalesDataLoader,
+    load_sales_file,
+    load_partitions,
+    ALL_SHEETS,
+    PARTITION_COLUMN,
+    file_type_of,
+    missing_required_columns,
+    collect_data_info
+)
+from data_cache import UploadCache, frame_nbytes
+from aggregates import (
+    get_cube,
+    date_range_slice,
+    kpi_totals,
+    time_index,
+    transaction_count,
+    distinct_sketches,
+    frame_distinct,
+    use_sketch
+)
 from analyzers import (
     KPIAnalyzer,
     TimeSeriesAnalyzer,
     ProductAnalyzer,
     CustomerAnalyzer,
-    DiscountAnalyzer
+    DiscountAnalyzer,
+    RESULT_CACHE
 )
-from config import COLORS, REPORT_CONFIG
+from analyzers.memo import frame_fingerprint
+from analyzers.parallel import build_charts, format_timings
+from config import COLORS, REPORT_CONFIG, STREAMING_CONFIG, CACHE_CONFIG, RFM_CONFIG
+from time_keys import GRANULARITIES
 
 
 # 페이지 설정
@@ -145,9 +171,14 @@ st.markdown(f"""
 """, unsafe_allow_html=True)
 
 
-@st.cache_data
+@st.cache_resource
 def load_data_from_file(file_path, sheet_name='Sheet1'):
-    """파일 경로로부터 데이터를 로드하고 캐싱합니다."""
+    """
+    파일 경로로부터 데이터를 로드하고 캐싱합니다.
+    세션마다 복사본을 만들지 않도록 모든 세션이 같은 데이터프레임을 공유합니다.
+    (컬럼 저장소 캐시를 쓰면 데이터는 메모리 매핑되어 다른 프로세스와도 페이지 캐시를 공유)
+    필터와 분석에 쓰는 일자 롤업도 디스크 캐시에서 함께 읽습니다.
+    """
     loader = SalesDataLoader(file_path, sheet_name)
     df = loader.load_data()
     
@@ -155,117 +186,130 @@ def load_data_from_file(file_path, sheet_name='Sheet1'):
         st.error("❌ 데이터 검증 실패")
         st.stop()
     
+    loader.get_daily_rollup()
     data_info = loader.get_data_info()
     return df, data_info
 
 
+@st.cache_resource
+def get_upload_cache():
+    """세션 간에 공유되는 업로드 파일 캐시를 반환합니다."""
+    return UploadCache(CACHE_CONFIG['upload_cache_max_bytes'])
+
+
 def load_data_from_upload(uploaded_file, sheet_name='Sheet1'):
-    """업로드된 파일로부터 데이터를 로드합니다. (Excel 및 CSV 지원)"""
+    """
+    업로드된 파일로부터 데이터를 로드합니다. (Excel 및 CSV 지원)
+    파싱 결과는 업로드 내용 해시로 캐싱되므로 위젯 조작으로 재실행되어도 다시 읽지 않습니다.
+    """
     try:
-        # 파일 확장자 확인
-        file_name = uploaded_file.name
-        file_extension = file_name.split('.')[-1].lower()
-        
-        # 파일 형식에 따라 읽기
-        if file_extension == 'csv':
-            # CSV 파일 읽기 (여러 인코딩 시도)
-            encodings = ['utf-8', 'cp949', 'euc-kr', 'latin1']
-            df = None
-            
-            for encoding in encodings:
-                try:
-                    uploaded_file.seek(0)  # 파일 포인터 초기화
-                    df = pd.read_csv(uploaded_file, encoding=encoding)
-                    st.sidebar.success(f"✅ CSV 인코딩: {encoding.upper()}")
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            if df is None:
-                st.error("❌ CSV 파일의 인코딩을 인식할 수 없습니다.")
-                st.info("💡 파일을 UTF-8 형식으로 저장한 후 다시 시도해보세요.")
-                return None, None
-        elif file_extension in ['xlsx', 'xls']:
-            # Excel 파일 읽기
-            df = pd.read_excel(uploaded_file, sheet_name=sheet_name)
-        else:
+        # 파일 형식 확인
+        file_type = file_type_of(uploaded_file.name)
+        if file_type is None:
+            file_extension = uploaded_file.name.split('.')[-1].lower()
             st.error(f"⚠️ 지원하지 않는 파일 형식: .{file_extension}")
             st.info("📋 지원 형식: Excel (.xlsx, .xls) 또는 CSV (.csv)")
             return None, None
         
-        # 컬럼명 정리 (공백 제거)
-        df.columns = df.columns.str.strip()
-        
-        # 날짜 컬럼을 datetime으로 변환
-        if '날짜' in df.columns:
-            df['날짜'] = pd.to_datetime(df['날짜'])
+        data = uploaded_file.getvalue()
+        cache = get_upload_cache()
+        cache_key = UploadCache.make_key(data, sheet_name if file_type == 'excel' else None)
+        entry = cache.get(cache_key)
         
-        # 파생 컬럼 생성 (data_loader와 동일한 로직)
-        if '날짜' in df.columns:
-            df['년'] = df['날짜'].dt.year
-            df['월'] = df['날짜'].dt.month
-            df['분기'] = df['날짜'].dt.quarter
-            df['요일'] = df['날짜'].dt.day_name()
-            df['년월'] = df['날짜'].dt.to_period('M').astype(str)
+        if entry is None:
+            # 대용량 CSV는 청크 단위로 읽어 요약 데이터로 집계
+            stream = file_type == 'csv' and len(data) >= STREAMING_CONFIG['csv_stream_threshold_bytes']
+            df, diagnostics = load_sales_file(io.BytesIO(data), file_type, sheet_name, stream=stream)
             
-            요일_매핑 = {
-                'Monday': '월요일',
-                'Tuesday': '화요일',
-                'Wednesday': '수요일',
-                'Thursday': '목요일',
-                'Friday': '금요일',
-                'Saturday': '토요일',
-                'Sunday': '일요일'
-            }
-            df['요일명'] = df['요일'].map(요일_매핑)
-        
-        if 'Discount' in df.columns:
-            df['할인율'] = df['Discount'] * 100
-        
-        if '단가' in df.columns and '수량' in df.columns and 'Discount' in df.columns:
-            df['할인전금액'] = df['단가'] * df['수량']
-            df['할인액'] = df['할인전금액'] * df['Discount']
-        
-        if 'Discount' in df.columns:
-            df['할인적용'] = df['Discount'].apply(lambda x: '할인' if x > 0 else '정상가')
+            # 데이터 검증
+            missing_columns = missing_required_columns(df)
+            if missing_columns:
+                st.error(f"⚠️ 필수 컬럼 누락: {', '.join(missing_columns)}")
+                st.info("📋 필수 컬럼: 날짜, 거래처명, 분류명, 제품명, 단가, 수량, 금액")
+                return None, None
+            
+            entry = (df, collect_data_info(df), diagnostics)
+            cache.put(cache_key, entry, frame_nbytes(df))
         
-        # 데이터 정보 수집
-        data_info = {
-            '총_거래건수': len(df),
-            '데이터_시작일': df['날짜'].min() if '날짜' in df.columns else None,
-            '데이터_종료일': df['날짜'].max() if '날짜' in df.columns else None,
-            '컬럼_목록': list(df.columns),
-            '거래처_수': df['거래처명'].nunique() if '거래처명' in df.columns else 0,
-            '제품_수': df['제품명'].nunique() if '제품명' in df.columns else 0,
-            '제품분류_수': df['분류명'].nunique() if '분류명' in df.columns else 0,
-        }
+        df, data_info, diagnostics = entry
+        display_load_diagnostics(df, diagnostics)
+        return df, data_info
+    
+    except UnicodeError:
+        st.error("❌ CSV 파일의 인코딩을 인식할 수 없습니다.")
+        st.info("💡 파일을 UTF-8 형식으로 저장한 후 다시 시도해보세요.")
+        return None, None
+    except Exception as e:
+        st.error(f"❌ 파일 로드 중 오류 발생: {e}")
+        return None, None
+
+
+def load_data_from_uploads(uploaded_files, sheet_name='Sheet1'):
+    """
+    여러 업로드 파일(또는 엑셀의 모든 시트)을 프로세스 풀에서 병렬로 읽어 하나로 합칩니다.
+    모든 파티션의 컬럼 구성이 같아야 하며, 각 행의 출처는 '출처' 컬럼에 기록됩니다.
+    """
+    try:
+        unsupported = [f.name for f in uploaded_files if file_type_of(f.name) is None]
+        if unsupported:
+            st.error(f"⚠️ 지원하지 않는 파일 형식: {', '.join(unsupported)}")
+            st.info("📋 지원 형식: Excel (.xlsx, .xls) 또는 CSV (.csv)")
+            return None, None
         
-        # 데이터 검증
-        required_columns = ['날짜', '거래처명', '분류명', '제품명', '단가', '수량', '금액']
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        sources = [(f.getvalue(), f.name) for f in uploaded_files]
+        cache = get_upload_cache()
+        cache_key = UploadCache.make_key([data for data, _ in sources], sheet_name)
+        entry = cache.get(cache_key)
         
-        if missing_columns:
-            st.error(f"⚠️ 필수 컬럼 누락: {', '.join(missing_columns)}")
-            st.info("📋 필수 컬럼: 날짜, 거래처명, 분류명, 제품명, 단가, 수량, 금액")
-            return None, None
+        if entry is None:
+            df, partitions = load_partitions(sources, sheet_name)
+            
+            # 데이터 검증
+            missing_columns = missing_required_columns(df)
+            if missing_columns:
+                st.error(f"⚠️ 필수 컬럼 누락: {', '.join(missing_columns)}")
+                st.info("📋 필수 컬럼: 날짜, 거래처명, 분류명, 제품명, 단가, 수량, 금액")
+                return None, None
+            
+            entry = (df, collect_data_info(df), partitions)
+            cache.put(cache_key, entry, frame_nbytes(df))
         
+        df, data_info, partitions = entry
+        st.sidebar.info(f"ℹ️ {len(partitions)}개 파일/시트를 합쳤습니다.")
         return df, data_info
     
+    except UnicodeError:
+        st.error("❌ CSV 파일의 인코딩을 인식할 수 없습니다.")
+        st.info("💡 파일을 UTF-8 형식으로 저장한 후 다시 시도해보세요.")
+        return None, None
     except Exception as e:
         st.error(f"❌ 파일 로드 중 오류 발생: {e}")
         return None, None
 
 
-def filter_data(df, date_range, categories, customers):
-    """데이터를 필터링합니다."""
-    filtered_df = df.copy()
-    
-    # 날짜 필터
+def display_load_diagnostics(df, diagnostics):
+    """파일 로드 진단 정보를 사이드바에 표시합니다."""
+    if diagnostics['encoding']:
+        detection = diagnostics.get('encoding_detection')
+        detail = f" (앞 {detection['bytes_examined']:,}바이트로 판별)" if detection else ''
+        st.sidebar.success(f"✅ CSV 인코딩: {diagnostics['encoding'].upper()}{detail}")
+    if diagnostics['streamed']:
+        st.sidebar.info(f"ℹ️ 대용량 CSV 스트리밍 모드: {diagnostics['source_rows']:,}행 → 요약 {len(df):,}행")
+
+
+def filter_data(df, date_range, categories, customers, sources=None, segment_customers=None):
+    """
+    데이터를 필터링합니다.
+    날짜순으로 정렬된 일자 롤업에서 기간을 이진 탐색으로 먼저 잘라내므로,
+    나머지 조건은 선택한 기간의 행에만 적용됩니다.
+    DISTINCT_CONFIG에 따라 고유 개수는 스케치 추정값을 결과에 연결해 둡니다.
+    segment_customers는 선택한 RFM 세그먼트에 속한 거래처 목록입니다. (None이면 세그먼트 필터 없음)
+    """
+    filtered_df = df
+    
+    # 날짜 필터 (종료일 포함)
     if date_range:
-        filtered_df = filtered_df[
-            (filtered_df['날짜'] >= pd.Timestamp(date_range[0])) &
-            (filtered_df['날짜'] <= pd.Timestamp(date_range[1]))
-        ]
+        filtered_df = date_range_slice(filtered_df, date_range[0], date_range[1])
     
     # 제품 분류 필터
     if categories and len(categories) > 0:
@@ -275,12 +319,89 @@ def filter_data(df, date_range, categories, customers):
     if customers and len(customers) > 0:
         filtered_df = filtered_df[filtered_df['거래처명'].isin(customers)]
     
+    # 출처(파일/시트) 필터
+    if sources and len(sources) > 0:
+        filtered_df = filtered_df[filtered_df[PARTITION_COLUMN].isin(sources)]
+    
+    # RFM 세그먼트 필터
+    if segment_customers is not None:
+        filtered_df = filtered_df[filtered_df['거래처명'].isin(segment_customers)]
+    
+    # 대용량 데이터의 거래처 수/제품 종류는 (일자 × 분류) 스케치를 병합해 추정 (기간/분류 필터만 있을 때)
+    if not customers and not sources and segment_customers is None and use_sketch(df):
+        start, end = date_range if date_range else (None, None)
+        frame_distinct.put(filtered_df, distinct_sketches(df).estimate_all(start, end, categories))
+    
     return filtered_df
 
 
-def display_kpi_section(kpis):
-    """KPI 대시보드 섹션을 표시합니다."""
+def previous_period_deltas(cube, date_range, min_date):
+    """
+    선택 기간과 바로 앞의 같은 길이 기간의 KPI 증감률을 {KPI 라벨: 표시 문자열}로 계산합니다.
+    직전 기간이 데이터 시작일보다 앞서면 None을 반환합니다.
+    """
+    start, end = date_range
+    previous_end = start - timedelta(days=1)
+    previous_start = previous_end - (end - start)
+    if previous_start < min_date:
+        return None
+    comparison = KPIAnalyzer(cube).compare_periods((start, end), (previous_start, previous_end))
+    return {
+        item['current']['label']: f"{item['change_pct']:+.1f}% (직전 기간 대비)"
+        for item in comparison.values() if item['change_pct'] is not None
+    }
+
+
+class SectionPlaceholder:
+    """탭 상태를 지원하지 않는 Streamlit 버전에서 탭 대신 쓰는 섹션 (선택한 섹션만 open)"""
+    
+    def __init__(self, container, open):
+        self.container = container
+        self.open = open
+    
+    def __enter__(self):
+        return self.container.__enter__()
+    
+    def __exit__(self, *exc_info):
+        return self.container.__exit__(*exc_info)
+
+
+def create_tabs(labels):
+    """
+    탭을 만듭니다. 탭을 바꾸면 앱을 다시 실행하도록 하여 각 탭의 open 속성으로 선택한 탭만 계산합니다.
+    탭 상태를 지원하지 않는 Streamlit 버전에서는 가로 라디오 버튼으로 섹션을 고르게 하여
+    마찬가지로 선택한 섹션만 계산합니다.
+    """
+    try:
+        return st.tabs(labels, key="active_tab", on_change="rerun")
+    except TypeError:
+        selected = st.radio("섹션", labels, horizontal=True, key="active_tab", label_visibility="collapsed")
+        return [SectionPlaceholder(st.container(), label == selected) for label in labels]
+
+
+def is_open(tab):
+    """탭이 선택되어 있는지(또는 탭 상태를 알 수 없는지) 확인합니다."""
+    return getattr(tab, 'open', None) is not False
+
+
+def section_charts(analyzer, section, timings):
+    """
+    탭 하나(분석기 이름 section)의 차트를 생성합니다.
+    같은 필터 결과에 대한 차트는 결과 캐시에 보관하므로 다른 탭을 보고 돌아오면 다시 만들지 않습니다.
+    차트별 생성 시간은 timings에 추가합니다.
+    """
+    key = ('dashboard_charts', section, frame_fingerprint(analyzer.df))
+    charts, chart_timings = RESULT_CACHE.get_or_compute(
+        key, lambda: build_charts({section: analyzer}, sections=[section])
+    )
+    timings.update(chart_timings)
+    return charts
+
+
+def display_kpi_section(kpis, deltas=None):
+    """KPI 대시보드 섹션을 표시합니다. deltas가 있으면 직전 기간 대비 증감을 함께 표시합니다."""
     st.header("📊 대시보드 개요")
+    deltas = deltas or {}
     
     # 메인 KPI
     col1, col2, col3, col4 = st.columns(4)
@@ -290,25 +411,29 @@ def display_kpi_section(kpis):
     with col1:
         st.metric(
             label=main_kpis[0]['label'],
-            value=main_kpis[0]['formatted']
+            value=main_kpis[0]['formatted'],
+            delta=deltas.get(main_kpis[0]['label'])
         )
     
     with col2:
         st.metric(
             label=main_kpis[1]['label'],
-            value=main_kpis[1]['formatted']
+            value=main_kpis[1]['formatted'],
+            delta=deltas.get(main_kpis[1]['label'])
         )
     
     with col3:
         st.metric(
             label=main_kpis[2]['label'],
-            value=main_kpis[2]['formatted']
+            value=main_kpis[2]['formatted'],
+            delta=deltas.get(main_kpis[2]['label'])
         )
     
     with col4:
         st.metric(
             label=main_kpis[3]['label'],
-            value=main_kpis[3]['formatted']
+            value=main_kpis[3]['formatted'],
+            delta=deltas.get(main_kpis[3]['label'])
         )
     
     st.markdown("---")
@@ -321,35 +446,39 @@ def display_kpi_section(kpis):
     with col5:
         st.metric(
             label=sub_kpis[0]['label'],
-            value=sub_kpis[0]['formatted']
+            value=sub_kpis[0]['formatted'],
+            delta=deltas.get(sub_kpis[0]['label'])
         )
     
     with col6:
         st.metric(
             label=sub_kpis[1]['label'],
-            value=sub_kpis[1]['formatted']
+            value=sub_kpis[1]['formatted'],
+            delta=deltas.get(sub_kpis[1]['label'])
         )
     
     with col7:
         st.metric(
             label=sub_kpis[2]['label'],
-            value=sub_kpis[2]['formatted']
+            value=sub_kpis[2]['formatted'],
+            delta=deltas.get(sub_kpis[2]['label'])
         )
     
     with col8:
         st.metric(
             label=sub_kpis[3]['label'],
-            value=sub_kpis[3]['formatted']
+            value=sub_kpis[3]['formatted'],
+            delta=deltas.get(sub_kpis[3]['label'])
         )
 
 
-def display_timeseries_section(timeseries_analyzer):
+def display_timeseries_section(timeseries_analyzer, charts):
     """시계열 분석 섹션을 표시합니다."""
     st.header("📈 시계열 분석")
     
     # 월별 매출 추이
     st.plotly_chart(
-        timeseries_analyzer.create_monthly_sales_chart(),
+        charts['monthly-sales-chart'],
         use_container_width=True,
         key="monthly_sales"
     )
@@ -359,27 +488,80 @@ def display_timeseries_section(timeseries_analyzer):
     
     with col1:
         st.plotly_chart(
-            timeseries_analyzer.create_monthly_transactions_chart(),
+            charts['monthly-transactions-chart'],
             use_container_width=True,
             key="monthly_transactions"
         )
     
     with col2:
         st.plotly_chart(
-            timeseries_analyzer.create_quarterly_sales_chart(),
+            charts['quarterly-sales-chart'],
             use_container_width=True,
             key="quarterly_sales"
         )
     
     # 요일별 패턴
     st.plotly_chart(
-        timeseries_analyzer.create_weekday_chart(),
+        charts['weekday-chart'],
         use_container_width=True,
         key="weekday"
     )
+    
+    # 기간 단위 추이 (기본 단위 차트는 탭 차트 캐시를 사용하고, 다른 단위를 고르면 그 단위로 생성)
+    st.subheader("기간 단위 추이")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        granularity = st.selectbox(
+            "추이 단위",
+            options=list(GRANULARITIES),
+            format_func=GRANULARITIES.get,
+            key="trend_granularity"
+        )
+    
+    with col2:
+        yoy_granularity = st.selectbox(
+            "전년 대비 단위",
+            options=[g for g in GRANULARITIES if g != 'day'],
+            index=1,
+            format_func=GRANULARITIES.get,
+            key="yoy_granularity"
+        )
+    
+    if granularity == 'day':
+        rolling_chart = charts['rolling-sales-chart']
+        cumulative_chart = charts['cumulative-sales-chart']
+    else:
+        rolling_chart = timeseries_analyzer.create_rolling_sales_chart(granularity)
+        cumulative_chart = timeseries_analyzer.create_cumulative_sales_chart(granularity)
+    
+    st.plotly_chart(
+        rolling_chart,
+        use_container_width=True,
+        key="rolling_sales"
+    )
+    
+    st.plotly_chart(
+        cumulative_chart,
+        use_container_width=True,
+        key="cumulative_sales"
+    )
+    
+    if yoy_granularity == 'month':
+        yoy_chart = charts.get('yoy-chart')
+    else:
+        yoy_chart = timeseries_analyzer.create_yoy_chart(yoy_granularity)
+    if yoy_chart:
+        st.plotly_chart(
+            yoy_chart,
+            use_container_width=True,
+            key="yoy"
+        )
+    else:
+        st.info("전년 동기 데이터가 없어 전년 대비 증감률을 계산할 수 없습니다.")
 
 
-def display_product_section(product_analyzer):
+def display_product_section(product_analyzer, charts):
     """제품 분석 섹션을 표시합니다."""
     st.header("📦 제품 분석")
     
@@ -388,14 +570,14 @@ def display_product_section(product_analyzer):
     
     with col1:
         st.plotly_chart(
-            product_analyzer.create_category_pie_chart(),
+            charts['category-pie-chart'],
             use_container_width=True,
             key="category_pie"
         )
     
     with col2:
         st.plotly_chart(
-            product_analyzer.create_category_bar_chart(),
+            charts['category-bar-chart'],
             use_container_width=True,
             key="category_bar"
         )
@@ -410,26 +592,26 @@ def display_product_section(product_analyzer):
     
     # 단가대별 분포
     st.plotly_chart(
-        product_analyzer.create_price_distribution_chart(),
+        charts['price-distribution-chart'],
         use_container_width=True,
         key="price_distribution"
     )
 
 
-def display_customer_section(customer_analyzer):
+def display_customer_section(customer_analyzer, charts):
     """거래처 분석 섹션을 표시합니다."""
     st.header("🏢 거래처 분석")
     
     # TOP 10 거래처
     st.plotly_chart(
-        customer_analyzer.create_top_customers_chart(10),
+        charts['top-customers-chart'],
         use_container_width=True,
         key="top_customers"
     )
     
     # 거래 건수
     st.plotly_chart(
-        customer_analyzer.create_customer_transaction_chart(10),
+        charts['customer-transactions-chart'],
         use_container_width=True,
         key="customer_transactions"
     )
@@ -442,9 +624,59 @@ def display_customer_section(customer_analyzer):
     customer_detail_display['평균거래금액'] = customer_detail_display['평균거래금액'].apply(lambda x: f"₩{x:,.0f}")
     customer_detail_display['매출비중'] = customer_detail_display['매출비중'].apply(lambda x: f"{x}%")
     st.dataframe(customer_detail_display, use_container_width=True, hide_index=True)
+    
+    # 분류별 주요 거래처 / 거래처별 주요 제품
+    with st.expander("제품 분류별 TOP 3 거래처"):
+        top_customers = customer_analyzer.get_top_customers_by_category(3).copy()
+        top_customers['매출액'] = top_customers['매출액'].apply(lambda x: f"₩{x:,.0f}")
+        top_customers.columns = ['분류명', '순위', '거래처명', '매출액', '거래건수']
+        st.dataframe(top_customers, use_container_width=True, hide_index=True)
+    
+    with st.expander("거래처별 TOP 3 제품"):
+        top_products = customer_analyzer.get_top_products_by_customer(3).copy()
+        top_products['매출액'] = top_products['매출액'].apply(lambda x: f"₩{x:,.0f}")
+        top_products.columns = ['거래처명', '순위', '제품명', '매출액', '판매수량']
+        st.dataframe(top_products, use_container_width=True, hide_index=True)
+    
+    # 거래처 매출 집중도 (파레토/ABC)
+    with st.expander("거래처 매출 집중도 (파레토/ABC)"):
+        pareto = customer_analyzer.get_customer_pareto()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("지니 계수", f"{pareto.gini:.3f}")
+        col2.metric("HHI", f"{pareto.hhi:,.0f}")
+        col3.metric("상위 20% 거래처 매출 비중", f"{pareto.top_percent_share(20):.1f}%")
+        
+        # 목표 비중에 필요한 거래처 수는 누적합 이진 탐색으로 바로 계산
+        target = st.slider("목표 매출 비중(%)", min_value=10, max_value=100, value=80, step=5,
+                           key="pareto_target")
+        st.caption(f"매출의 {target}%는 상위 {pareto.count_for_share(target):,}개 거래처(전체 {len(pareto):,}개)가 차지합니다.")
+        
+        abc = pareto.abc_summary()
+        abc['매출액'] = abc['매출액'].apply(lambda x: f"₩{x:,.0f}")
+        abc['항목비중'] = abc['항목비중'].apply(lambda x: f"{x}%")
+        abc['비중'] = abc['비중'].apply(lambda x: f"{x}%")
+        abc.columns = ['등급', '거래처수', '거래처비중', '매출액', '매출비중']
+        st.dataframe(abc, use_container_width=True, hide_index=True)
+    
+    # 첫 구매 월 코호트별 유지율
+    cohort_chart = charts.get('cohort-retention-chart')
+    if cohort_chart:
+        st.plotly_chart(
+            cohort_chart,
+            use_container_width=True,
+            key="cohort_retention"
+        )
+        
+        with st.expander("코호트별 경과 개월 매출액"):
+            cohort_revenue = customer_analyzer.get_cohort_matrix('revenue')
+            st.dataframe(
+                cohort_revenue.style.format('₩{:,.0f}', subset=cohort_revenue.columns[2:], na_rep=''),
+                use_container_width=True,
+                hide_index=True
+            )
 
 
-def display_discount_section(discount_analyzer):
+def display_discount_section(charts):
     """할인 분석 섹션을 표시합니다."""
     st.header("💰 할인 분석")
     
@@ -453,13 +685,13 @@ def display_discount_section(discount_analyzer):
     
     with col1:
         st.plotly_chart(
-            discount_analyzer.create_discount_application_chart(),
+            charts['discount-application-chart'],
             use_container_width=True,
             key="discount_application"
         )
     
     with col2:
-        discount_rate_chart = discount_analyzer.create_discount_rate_chart()
+        discount_rate_chart = charts.get('discount-rate-chart')
         if discount_rate_chart:
             st.plotly_chart(
                 discount_rate_chart,
@@ -471,12 +703,45 @@ def display_discount_section(discount_analyzer):
     
     # 제품 분류별 할인율
     st.plotly_chart(
-        discount_analyzer.create_category_discount_chart(),
+        charts['category-discount-chart'],
         use_container_width=True,
         key="category_discount"
     )
 
 
+def display_segment_section(customer_analyzer, selected_segments=None):
+    """RFM 고객 세그먼트 섹션을 표시합니다."""
+    st.header("👥 고객 세그먼트 (RFM)")
+    st.caption(
+        "최근 구매 후 경과 일수(R), 거래 건수(F), 매출액(M)을 분위수 기준 "
+        f"1~{RFM_CONFIG['n_scores']}점으로 평가한 세그먼트입니다. (불러온 전체 데이터 기준)"
+    )
+    
+    # 세그먼트별 거래처 비중과 매출 비중
+    st.plotly_chart(
+        customer_analyzer.create_rfm_segment_chart(),
+        use_container_width=True,
+        key="rfm_segments"
+    )
+    
+    # 세그먼트 요약
+    segments = customer_analyzer.get_rfm_segments().copy()
+    segments['매출액'] = segments['매출액'].apply(lambda x: f"₩{x:,.0f}")
+    segments['거래처비중'] = segments['거래처비중'].apply(lambda x: f"{x}%")
+    segments['매출비중'] = segments['매출비중'].apply(lambda x: f"{x}%")
+    st.dataframe(segments, use_container_width=True, hide_index=True)
+    
+    # 거래처별 RFM 점수 (사이드바에서 세그먼트를 선택했으면 해당 세그먼트만)
+    with st.expander("거래처별 RFM 점수"):
+        scores = customer_analyzer.get_rfm_scores()
+        if selected_segments:
+            scores = scores[scores['세그먼트'].isin(selected_segments)]
+        scores = scores.copy()
+        scores['최근구매일'] = scores['최근구매일'].dt.strftime('%Y-%m-%d')
+        scores['구매금액'] = scores['구매금액'].apply(lambda x: f"₩{x:,.0f}")
+        st.dataframe(scores, use_container_width=True, hide_index=True)
+
+
 def main():
     """메인 함수"""
     
@@ -491,23 +756,31 @@ def main():
     # 모바일 사용 안내
     st.sidebar.info("📱 **모바일 팁**: 좌측 상단 '>' 버튼으로 메뉴를 열고 닫을 수 있습니다.")
     
-    # 파일 업로더
-    uploaded_file = st.sidebar.file_uploader(
+    # 파일 업로더 (월별/지점별 파일을 여러 개 올리면 하나로 합쳐 분석)
+    uploaded_files = st.sidebar.file_uploader(
         "Excel 또는 CSV 파일 업로드 (선택사항)",
         type=['xlsx', 'xls', 'csv'],
-        help="판매 데이터 파일을 업로드하세요. Excel (.xlsx, .xls) 또는 CSV (.csv) 형식을 지원합니다. 업로드하지 않으면 기본 파일(판매.xlsx)을 사용합니다."
+        accept_multiple_files=True,
+        help="판매 데이터 파일을 업로드하세요. Excel (.xlsx, .xls) 또는 CSV (.csv) 형식을 지원합니다. 여러 파일을 올리면 하나로 합쳐 분석합니다. 업로드하지 않으면 기본 파일(판매.xlsx)을 사용합니다."
     )
     
     # 시트명 입력 (Excel 파일인 경우에만 필요)
     sheet_name = "Sheet1"
-    if uploaded_file is not None:
-        file_extension = uploaded_file.name.split('.')[-1].lower()
-        if file_extension in ['xlsx', 'xls']:
-            sheet_name = st.sidebar.text_input(
-                "시트명 (Excel 전용)",
-                value="Sheet1",
-                help="Excel 파일의 시트명을 입력하세요."
+    if uploaded_files:
+        if any(file_type_of(f.name) == 'excel' for f in uploaded_files):
+            all_sheets = st.sidebar.checkbox(
+                "모든 시트 불러오기",
+                value=False,
+                help="지역별 시트 등 Excel 파일의 모든 시트를 합쳐서 분석합니다."
             )
+            if all_sheets:
+                sheet_name = ALL_SHEETS
+            else:
+                sheet_name = st.sidebar.text_input(
+                    "시트명 (Excel 전용)",
+                    value="Sheet1",
+                    help="Excel 파일의 시트명을 입력하세요."
+                )
         else:
             st.sidebar.info("ℹ️ CSV 파일은 시트명이 필요하지 않습니다.")
     
@@ -517,11 +790,14 @@ def main():
     df = None
     data_info = None
     
-    if uploaded_file is not None:
+    if uploaded_files:
         # 업로드된 파일 사용
-        st.sidebar.success(f"✅ 업로드된 파일: {uploaded_file.name}")
+        st.sidebar.success(f"✅ 업로드된 파일: {', '.join(f.name for f in uploaded_files)}")
         with st.spinner('업로드된 파일을 로드하는 중...'):
-            df, data_info = load_data_from_upload(uploaded_file, sheet_name)
+            if len(uploaded_files) == 1 and sheet_name != ALL_SHEETS:
+                df, data_info = load_data_from_upload(uploaded_files[0], sheet_name)
+            else:
+                df, data_info = load_data_from_uploads(uploaded_files, sheet_name)
     else:
         # 기본 파일 사용
         st.sidebar.info("ℹ️ 기본 파일(판매.xlsx) 사용 중")
@@ -538,7 +814,7 @@ def main():
         st.stop()
     
     # 데이터 로드 성공 메시지
-    st.sidebar.success(f"✅ 데이터 로드 완료: {len(df):,}건")
+    st.sidebar.success(f"✅ 데이터 로드 완료: {transaction_count(df):,}건")
     
     # 사이드바 - 필터
     st.sidebar.markdown("---")
@@ -558,6 +834,15 @@ def main():
         key="date_range"
     )
     
+    # 선택 기간 합계 (날짜순 누적합 인덱스로 바로 계산하므로 행 데이터를 읽지 않음)
+    cube = get_cube(df)
+    if len(date_range) == 2:
+        period = time_index(cube).range_totals(*date_range)
+        st.sidebar.caption(
+            f"선택 기간: {period['transactions']:,}건 · "
+            f"{REPORT_CONFIG['currency_symbol']}{period['sales_sum']:,.0f}"
+        )
+    
     # 제품 분류 선택
     st.sidebar.subheader("📦 제품 분류")
     all_categories = sorted(df['분류명'].unique().tolist())
@@ -578,6 +863,30 @@ def main():
         key="customers"
     )
     
+    # RFM 세그먼트 선택 (점수는 전체 데이터 기준으로 한 번 계산해 결과 캐시에 두므로 필터를 바꿔도 다시 계산하지 않음)
+    st.sidebar.subheader("👥 고객 세그먼트")
+    rfm = CustomerAnalyzer(cube).get_rfm_scores()
+    selected_segments = st.sidebar.multiselect(
+        "RFM 세그먼트 선택 (전체 선택 시 비워두세요)",
+        options=rfm['세그먼트'].cat.categories.tolist(),
+        default=[],
+        key="segments"
+    )
+    segment_customers = None
+    if selected_segments:
+        segment_customers = rfm.loc[rfm['세그먼트'].isin(selected_segments), '거래처명']
+    
+    # 출처 선택 (여러 파일/시트를 합친 경우에만)
+    selected_sources = []
+    if PARTITION_COLUMN in df.columns:
+        st.sidebar.subheader("🗂️ 출처 (파일/시트)")
+        selected_sources = st.sidebar.multiselect(
+            "출처 선택 (전체 선택 시 비워두세요)",
+            options=df[PARTITION_COLUMN].cat.categories.tolist(),
+            default=[],
+            key="sources"
+        )
+    
     # 필터 적용 버튼
     apply_filter = st.sidebar.button("✅ 필터 적용", type="primary", use_container_width=True)
     reset_filter = st.sidebar.button("🔄 필터 초기화", use_container_width=True)
@@ -586,60 +895,73 @@ def main():
     if reset_filter:
         st.rerun()
     
-    # 데이터 필터링
-    if apply_filter or (not selected_categories and not selected_customers):
-        filtered_df = filter_data(df, date_range, selected_categories, selected_customers)
+    # 데이터 필터링 (행 단위 데이터 대신 일자 롤업(집계 큐브)을 필터링)
+    if apply_filter or (not selected_categories and not selected_customers and not selected_sources and not selected_segments):
+        filtered_df = filter_data(cube, date_range, selected_categories, selected_customers, selected_sources,
+                                  segment_customers)
     else:
-        filtered_df = df
+        filtered_df = cube
     
     # 필터링된 데이터 정보 표시
     st.sidebar.markdown("---")
     st.sidebar.subheader("📊 데이터 요약")
-    st.sidebar.metric("총 거래 건수", f"{len(filtered_df):,}건")
-    st.sidebar.metric("거래처 수", f"{filtered_df['거래처명'].nunique():,}개")
-    st.sidebar.metric("제품 종류", f"{filtered_df['제품명'].nunique():,}종")
-    
-    # 데이터 분석
-    with st.spinner('데이터를 분석하는 중...'):
-        # KPI 분석
-        kpi_analyzer = KPIAnalyzer(filtered_df)
-        kpis = kpi_analyzer.get_kpi_summary()
-        
-        # 시계열 분석
-        timeseries_analyzer = TimeSeriesAnalyzer(filtered_df)
-        
-        # 제품 분석
-        product_analyzer = ProductAnalyzer(filtered_df)
-        
-        # 거래처 분석
-        customer_analyzer = CustomerAnalyzer(filtered_df)
-        
-        # 할인 분석
-        discount_analyzer = DiscountAnalyzer(filtered_df)
+    totals = kpi_totals(filtered_df)
+    st.sidebar.metric("총 거래 건수", f"{totals['transactions']:,}건")
+    st.sidebar.metric("거래처 수", f"{totals['distinct']['거래처명']:,}개")
+    st.sidebar.metric("제품 종류", f"{totals['distinct']['제품명']:,}종")
     
-    # 탭 생성
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+    # 탭 생성 (선택한 탭의 분석과 차트만 계산하고, 다른 탭은 열 때 계산하거나 결과 캐시에서 가져옴)
+    tab1, tab2, tab3, tab4, tab5, tab6 = create_tabs([
         "📊 대시보드 개요",
         "📈 시계열 분석",
         "📦 제품 분석",
         "🏢 거래처 분석",
-        "💰 할인 분석"
+        "💰 할인 분석",
+        "👥 고객 세그먼트"
     ])
+    timings = {}
+    started = time.perf_counter()
     
     with tab1:
-        display_kpi_section(kpis)
+        if is_open(tab1):
+            with st.spinner('KPI를 계산하는 중...'):
+                kpis = KPIAnalyzer(filtered_df).get_kpi_summary()
+                
+                # 직전 동일 기간 대비 증감 (기간 외 필터가 없을 때만 전체 큐브의 누적합 인덱스로 계산)
+                kpi_deltas = None
+                if len(date_range) == 2 and not (selected_categories or selected_customers or selected_sources
+                                                 or selected_segments):
+                    kpi_deltas = previous_period_deltas(cube, date_range, min_date)
+            display_kpi_section(kpis, kpi_deltas)
     
     with tab2:
-        display_timeseries_section(timeseries_analyzer)
+        if is_open(tab2):
+            timeseries_analyzer = TimeSeriesAnalyzer(filtered_df)
+            display_timeseries_section(timeseries_analyzer, section_charts(timeseries_analyzer, 'timeseries', timings))
     
     with tab3:
-        display_product_section(product_analyzer)
+        if is_open(tab3):
+            product_analyzer = ProductAnalyzer(filtered_df)
+            display_product_section(product_analyzer, section_charts(product_analyzer, 'product', timings))
     
     with tab4:
-        display_customer_section(customer_analyzer)
+        if is_open(tab4):
+            customer_analyzer = CustomerAnalyzer(filtered_df)
+            display_customer_section(customer_analyzer, section_charts(customer_analyzer, 'customer', timings))
     
     with tab5:
-        display_discount_section(discount_analyzer)
+        if is_open(tab5):
+            display_discount_section(section_charts(DiscountAnalyzer(filtered_df), 'discount', timings))
+    
+    with tab6:
+        if is_open(tab6):
+            # 사이드바 필터와 같은 전체 데이터 기준 세그먼트 (결과 캐시 사용)
+            display_segment_section(CustomerAnalyzer(cube), selected_segments)
+    
+    # 분석 소요 시간 (이번 실행에서 표시한 탭, 캐시에서 가져온 차트는 처음 생성할 때의 시간)
+    with st.sidebar.expander("⏱ 분석 소요 시간"):
+        for line in format_timings(timings, time.perf_counter() - started):
+            st.caption(line)
     
     # 푸터
     st.markdown("---")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+증분 추가 벤치마크
+판매 데이터 파일을 판매ID 순으로 잘라 이력 파일, 이력 + 신규 행 파일, 신규 행만 담은 파일을
+임시 폴더에 만들고, 전체 파일을 다시 처리하는 방식과 증분 추가(append_new_rows)를 비교합니다.
+증분 추가는 기존 파트를 읽지 않으므로 전체 데이터프레임 로드(get_data)는 따로 측정합니다.
+저장소의 데이터, 롤업, 데이터 정보가 전체 처리 결과와 같은지도 확인합니다.
+
+사용법:
+    python benchmarks/bench_append.py --source 판매.xlsx --history 1500 --middle 1700
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregates import compute_rollups
+from data_loader import SalesDataLoader, collect_data_info, load_sales_file, read_raw_file
+
+
+def write_slices(source, sheet_name, history, middle, out_dir):
+    """
+    판매ID 순으로 자른 세 파일을 만듭니다.
+    hist: 처음 history건, mid: 처음 middle건(이력 포함), tail: middle건 이후의 신규 행만
+    """
+    raw, _ = read_raw_file(source, 'excel', sheet_name)
+    raw = raw.sort_values('판매ID', kind='stable').reset_index(drop=True)
+    slices = {
+        'hist': raw.iloc[:history],
+        'mid': raw.iloc[:middle],
+        'tail': raw.iloc[middle:],
+    }
+    paths = {}
+    for name, rows in slices.items():
+        paths[name] = os.path.join(out_dir, f'{name}.xlsx')
+        rows.to_excel(paths[name], sheet_name=sheet_name, index=False)
+    paths['full'] = os.path.join(out_dir, 'full.xlsx')
+    raw.to_excel(paths['full'], sheet_name=sheet_name, index=False)
+    return paths
+
+
+def timed(func, *args):
+    """함수를 실행하고 (결과, 소요 시간(초))를 반환합니다."""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def assert_same_rollups(store_rollups, expected):
+    """저장소 롤업이 전체 데이터로 계산한 롤업과 같은지 확인합니다."""
+    for name, rollup in expected.items():
+        keys = list(rollup.columns[:1])
+        stored = store_rollups[name].sort_values(keys).reset_index(drop=True)
+        rollup = rollup.sort_values(keys).reset_index(drop=True)
+        for col in rollup.columns[1:]:
+            assert np.allclose(stored[col].to_numpy(dtype=np.float64),
+                               rollup[col].to_numpy(dtype=np.float64), equal_nan=True), (name, col)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='증분 추가 벤치마크')
+    parser.add_argument('--source', default='판매.xlsx')
+    parser.add_argument('--sheet', default='Sheet1')
+    parser.add_argument('--history', type=int, default=1500)
+    parser.add_argument('--middle', type=int, default=1700)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_slices(args.source, args.sheet, args.history, args.middle, tmp)
+        (full, _), full_time = timed(load_sales_file, paths['full'], 'excel', args.sheet)
+
+        loader = SalesDataLoader(paths['hist'], args.sheet, use_cache=False,
+                                 store_dir=os.path.join(tmp, 'store'))
+        _, build_time = timed(loader.append_new_rows)
+        # 이력이 포함된 파일을 넘기면 저장된 최대 판매ID 이후 행만 추가
+        _, middle_time = timed(loader.append_new_rows, paths['mid'])
+        # 신규 행만 담은 파일을 넘기면 파일 읽기도 신규 행 수에 비례
+        _, tail_time = timed(loader.append_new_rows, paths['tail'])
+        # 데이터 정보는 메타 정보와 롤업으로 갱신됨 (파트를 읽지 않음)
+        expected_info = collect_data_info(full)
+        for key, value in loader.get_data_info().items():
+            assert value == expected_info[key], (key, value, expected_info[key])
+
+        stored, load_time = timed(loader.get_data)
+        stored = stored.sort_values('판매ID').reset_index(drop=True)
+        assert len(stored) == len(full)
+        assert np.array_equal(stored['판매ID'].to_numpy(), full['판매ID'].sort_values().to_numpy())
+        assert np.isclose(stored['금액'].sum(), full['금액'].sum())
+        assert_same_rollups(loader.get_rollups(), compute_rollups(full))
+
+        print(f"{'단계':<28} {'행 수':>8} {'소요(s)':>9}")
+        print(f"{'전체 파일 다시 처리':<28} {len(full):>8,} {full_time:>9.3f}")
+        print(f"{'저장소 생성 (hist)':<28} {args.history:>8,} {build_time:>9.3f}")
+        print(f"{'증분 추가 (mid, 이력 포함)':<28} {args.middle - args.history:>8,} {middle_time:>9.3f}")
+        print(f"{'증분 추가 (tail, 신규 행만)':<28} {len(full) - args.middle:>8,} {tail_time:>9.3f}")
+        print(f"{'저장소 전체 로드 (get_data)':<28} {len(stored):>8,} {load_time:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
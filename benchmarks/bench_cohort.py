@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+코호트 행렬 벤치마크
+거래처별 첫 구매 월을 groupby/transform으로 붙이고 (코호트, 경과 개월)별 nunique/sum을 계산하는 방식과
+코호트 집계 엔진(cohort_matrices)의 정수 코드 + bincount 방식을 비교합니다.
+
+사용법:
+    python benchmarks/bench_cohort.py --customers 100000 --rows 2000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregates import cohort_matrices
+
+
+def make_frame(rows, customers, months, seed=0):
+    """거래처 코드, 년월키, 금액 컬럼의 합성 데이터프레임을 생성합니다."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        '거래처': rng.integers(0, customers, rows),
+        '년월키': 2023 * 12 + rng.integers(0, months, rows),
+        '금액': rng.integers(10, 500, rows) * 1000.0,
+    })
+
+
+def groupby_cohorts(df):
+    """첫 구매 월을 붙인 뒤 (코호트, 경과 개월)별로 groupby합니다. (일반적인 방식)"""
+    first = df.groupby('거래처')['년월키'].transform('min')
+    grouped = df.assign(코호트=first, 경과=df['년월키'] - first).groupby(['코호트', '경과'])
+    active = grouped['거래처'].nunique().unstack()
+    revenue = grouped['금액'].sum().unstack()
+    return active, revenue
+
+
+def bincount_cohorts(df, customers):
+    """코호트 집계 엔진으로 같은 행렬을 계산합니다."""
+    return cohort_matrices(df['거래처'].to_numpy(), df['년월키'].to_numpy(), df['금액'].to_numpy(), customers)
+
+
+def best_of(func, repeat, *args):
+    """repeat번 실행한 중 가장 짧은 시간(초)과 결과를 반환합니다."""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='코호트 행렬 벤치마크')
+    parser.add_argument('--customers', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--months', type=int, default=36)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'거래처 수':>12} {'행 수':>12} {'groupby(s)':>11} {'bincount(s)':>12} {'배속':>6}")
+    for customers in args.customers:
+        df = make_frame(args.rows, customers, args.months)
+        base_time, (active, revenue) = best_of(groupby_cohorts, args.repeat, df)
+        fast_time, matrices = best_of(bincount_cohorts, args.repeat, df, customers)
+
+        # 같은 값을 계산했는지 확인 (관측 기간 밖 칸은 groupby 결과에 없으므로 0과 비교)
+        columns = range(matrices['active'].shape[1])
+        expected = active.reindex(index=matrices['cohorts'], columns=columns).fillna(0).to_numpy()
+        assert np.array_equal(np.nan_to_num(matrices['active']), expected)
+        expected = revenue.reindex(index=matrices['cohorts'], columns=columns).fillna(0).to_numpy()
+        assert np.allclose(np.nan_to_num(matrices['revenue']), expected)
+
+        print(f"{customers:>12,} {args.rows:>12,} {base_time:>11.3f} {fast_time:>12.3f} {base_time / fast_time:>5.1f}x")
+        del df
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+집중도 조회 벤치마크
+상위 N개 비중 / 목표 비중에 필요한 항목 수를 물을 때마다 매출을 정렬하고 자르는 방식과
+집중도 엔진(Concentration)에서 한 번 만든 누적합을 조회하는 방식을 비교합니다.
+
+사용법:
+    python benchmarks/bench_concentration.py --items 10000 1000000 --queries 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregates import Concentration
+
+
+def make_sales(items, seed=0):
+    """파레토 분포를 따르는 항목별 매출액 시리즈를 생성합니다."""
+    rng = np.random.default_rng(seed)
+    return pd.Series(rng.pareto(1.2, items) * 1_000_000, name='매출액')
+
+
+def sort_queries(sales, top_ns, shares):
+    """질의마다 정렬 후 head/cumsum으로 답합니다. (일반적인 방식)"""
+    total = sales.sum()
+    top = [sales.sort_values(ascending=False).head(n).sum() / total * 100 for n in top_ns]
+    needed = []
+    for share in shares:
+        cumulative = sales.sort_values(ascending=False).cumsum() / total * 100
+        needed.append(int((cumulative < share).sum()) + 1)
+    return np.array(top), np.array(needed)
+
+
+def engine_queries(sales, top_ns, shares):
+    """집중도 엔진을 한 번 만든 뒤 누적합 조회와 이진 탐색으로 답합니다."""
+    engine = Concentration(sales)
+    return engine.top_share(top_ns), engine.count_for_share(shares)
+
+
+def best_of(func, repeat, *args):
+    """repeat번 실행한 중 가장 짧은 시간(초)과 결과를 반환합니다."""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='집중도 조회 벤치마크')
+    parser.add_argument('--items', type=int, nargs='+', default=[10_000, 1_000_000])
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'항목 수':>12} {'질의 수':>8} {'정렬(s)':>10} {'엔진(s)':>10} {'배속':>7}")
+    for items in args.items:
+        sales = make_sales(items)
+        rng = np.random.default_rng(1)
+        top_ns = rng.integers(1, items, args.queries)
+        shares = rng.uniform(1, 99, args.queries)
+        base_time, (top, needed) = best_of(sort_queries, args.repeat, sales, top_ns, shares)
+        fast_time, (fast_top, fast_needed) = best_of(engine_queries, args.repeat, sales, top_ns, shares)
+
+        # 같은 값을 계산했는지 확인
+        assert np.allclose(top, fast_top)
+        assert np.array_equal(needed, fast_needed)
+
+        print(f"{items:>12,} {args.queries * 2:>8,} {base_time:>10.3f} {fast_time:>10.4f} {base_time / fast_time:>6.0f}x")
+
+
+if __name__ == '__main__':
+    main()
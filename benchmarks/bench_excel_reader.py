@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+엑셀 읽기 벤치마크
+pd.read_excel과 openpyxl 스트리밍 리더(read_excel_columns)의 읽기 시간과 메모리를 비교합니다.
+
+사용법:
+    python benchmarks/bench_excel_reader.py --rows 10000 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_loader import read_excel_columns
+
+HEADER = ['판매ID', '날짜', '거래처명', '분류명', '제품코드', '제품명', '색상', '단가', '수량', 'Discount', '금액']
+
+
+def write_workbook(path, rows, seed=0):
+    """판매 데이터 형식의 합성 엑셀 파일을 생성합니다."""
+    rng = np.random.default_rng(seed)
+    customers = [f'거래처{i:03d}' for i in range(200)]
+    categories = ['의류', '잡화', '신발', '가방', '액세서리']
+    colors = ['블랙', '화이트', '레드', '블루']
+    start = datetime(2023, 1, 1)
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sheet1')
+    sheet.append(HEADER)
+    days = rng.integers(0, 730, rows)
+    codes = rng.integers(1000, 1500, rows)
+    prices = rng.integers(10, 500, rows) * 1000
+    quantities = rng.integers(1, 20, rows)
+    discounts = rng.choice([0.0, 0.0, 0.05, 0.1, 0.2], rows)
+    for i in range(rows):
+        code = int(codes[i])
+        amount = float(prices[i] * quantities[i] * (1 - discounts[i]))
+        sheet.append([
+            i + 1, start + timedelta(days=int(days[i])), customers[i % len(customers)],
+            categories[code % len(categories)], code, f'제품{code}', colors[code % len(colors)],
+            int(prices[i]), int(quantities[i]), float(discounts[i]), amount,
+        ])
+    workbook.save(path)
+
+
+def measure(read, memory=False):
+    """
+    읽기 함수의 실행 시간(초)을 측정합니다.
+    memory=True이면 별도 실행에서 tracemalloc으로 최대 할당 메모리(MB)를 측정합니다.
+    (tracemalloc은 실행 시간을 크게 늘리므로 시간 측정과 분리)
+    """
+    started = time.perf_counter()
+    df = read()
+    elapsed = time.perf_counter() - started
+    peak = float('nan')
+    if memory:
+        tracemalloc.start()
+        read()
+        peak = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        tracemalloc.stop()
+    return df, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='엑셀 읽기 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--memory', action='store_true', help='최대 할당 메모리도 측정 (느림)')
+    args = parser.parse_args()
+
+    print(f"{'행 수':>10} {'read_excel(s)':>14} {'stream(s)':>10} {'배속':>6} {'read_excel(MB)':>15} {'stream(MB)':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, f'sales_{rows}.xlsx')
+            write_workbook(path, rows)
+
+            base, base_time, base_peak = measure(lambda: pd.read_excel(path, sheet_name='Sheet1'), args.memory)
+            fast, fast_time, fast_peak = measure(lambda: read_excel_columns(path, 'Sheet1'), args.memory)
+
+            # 같은 값을 읽었는지 확인
+            assert len(base) == len(fast)
+            for col in HEADER:
+                left, right = base[col].to_numpy(), fast[col].to_numpy()
+                if col == '날짜':
+                    left, right = left.astype('datetime64[us]'), right.astype('datetime64[us]')
+                assert (pd.Series(left) == pd.Series(np.asarray(right, dtype=left.dtype))).all(), col
+
+            print(f"{rows:>10,} {base_time:>14.2f} {fast_time:>10.2f} {base_time / fast_time:>5.1f}x "
+                  f"{base_peak:>15.1f} {fast_peak:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
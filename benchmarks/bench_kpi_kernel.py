@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+KPI 커널 벤치마크
+KPI 8개와 데이터 정보(거래 건수, 기간, 고유 개수)를 컬럼별 pandas 연산으로 따로 계산하는 방식과
+KPI 커널(compute_kpi_totals) 한 번으로 계산하는 방식을 비교합니다.
+
+사용법:
+    python benchmarks/bench_kpi_kernel.py --rows 1000000 10000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregates import compute_kpi_totals
+
+
+def make_frame(rows, seed=0):
+    """전처리가 끝난 판매 데이터와 같은 dtype의 합성 데이터프레임을 생성합니다."""
+    rng = np.random.default_rng(seed)
+    customers = pd.Categorical.from_codes(rng.integers(0, 500, rows), categories=[f'거래처{i:03d}' for i in range(500)])
+    products = pd.Categorical.from_codes(rng.integers(0, 5000, rows), categories=[f'제품{i:04d}' for i in range(5000)])
+    categories = pd.Categorical.from_codes(rng.integers(0, 6, rows), categories=[f'분류{i}' for i in range(6)])
+    discount = rng.choice([0.0, 0.0, 0.05, 0.1, 0.2], rows)
+    quantity = rng.integers(1, 20, rows).astype(np.int8)
+    price = rng.integers(10, 500, rows) * 1000
+    amount = price * quantity * (1 - discount)
+    return pd.DataFrame({
+        '날짜': np.datetime64('2023-01-01') + rng.integers(0, 730, rows).astype('timedelta64[D]'),
+        '거래처명': customers,
+        '분류명': categories,
+        '제품명': products,
+        '수량': quantity,
+        'Discount': discount,
+        '금액': amount,
+        '할인액': price * quantity - amount,
+    })
+
+
+def separate_scans(df):
+    """KPI와 데이터 정보를 컬럼별 pandas 연산으로 각각 계산합니다. (기존 방식)"""
+    discounted = df[df['Discount'] > 0]
+    return {
+        'total_sales': df['금액'].sum(),
+        'total_transactions': len(df),
+        'avg_transaction': df['금액'].mean(),
+        'total_discount': df['할인액'].sum(),
+        'customer_count': df['거래처명'].nunique(),
+        'avg_discount_rate': discounted['Discount'].mean() * 100,
+        'total_quantity': df['수량'].sum(),
+        'unique_products': df['제품명'].nunique(),
+        # data_info / 사이드바
+        'date_min': df['날짜'].min(),
+        'date_max': df['날짜'].max(),
+        'customers': df['거래처명'].nunique(),
+        'products': df['제품명'].nunique(),
+        'categories': df['분류명'].nunique(),
+    }
+
+
+def fused_kernel(df):
+    """KPI 커널 한 번으로 같은 값을 계산합니다."""
+    totals = compute_kpi_totals(df)
+    return {
+        'total_sales': totals['sales_sum'],
+        'total_transactions': totals['transactions'],
+        'avg_transaction': totals['sales_sum'] / totals['sales_count'],
+        'total_discount': totals['discount_amount_sum'],
+        'customer_count': totals['distinct']['거래처명'],
+        'avg_discount_rate': totals['discount_rate_sum'] / totals['discounted_count'] * 100,
+        'total_quantity': totals['quantity_sum'],
+        'unique_products': totals['distinct']['제품명'],
+        'date_min': totals['date_min'],
+        'date_max': totals['date_max'],
+        'customers': totals['distinct']['거래처명'],
+        'products': totals['distinct']['제품명'],
+        'categories': totals['distinct']['분류명'],
+    }
+
+
+def best_of(func, df, repeat):
+    """repeat번 실행한 중 가장 짧은 시간(초)과 결과를 반환합니다."""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(df)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='KPI 커널 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'행 수':>12} {'기존(s)':>10} {'커널(s)':>10} {'배속':>6}")
+    for rows in args.rows:
+        df = make_frame(rows)
+        base_time, expected = best_of(separate_scans, df, args.repeat)
+        fused_time, actual = best_of(fused_kernel, df, args.repeat)
+
+        # 같은 값을 계산했는지 확인
+        for key, value in expected.items():
+            if isinstance(value, float):
+                assert np.isclose(value, actual[key], rtol=1e-9), key
+            else:
+                assert value == actual[key], key
+
+        print(f"{rows:>12,} {base_time:>10.3f} {fused_time:>10.3f} {base_time / fused_time:>5.1f}x")
+        del df
+
+
+if __name__ == '__main__':
+    main()
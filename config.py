@@ -87,3 +87,100 @@ REPORT_CONFIG = {
     'decimal_format': '{:,.2f}'
 }
 
+
+# 데이터 로더 설정
+LOADER_CONFIG = {
+    'excel_reader': 'pandas',   # 'pandas' (pd.read_excel) 또는 'stream' (openpyxl 스트리밍 → NumPy 버퍼)
+    'encoding_sample_bytes': 64 * 1024,   # CSV 인코딩 판별 시 한 번에 검사할 바이트 수
+}
+
+# 누적 데이터 저장소 설정 (증분 추가 모드)
+STORE_CONFIG = {
+    'store_dir': '.sales_store',   # 전처리 데이터 파트와 롤업 집계를 저장할 폴더
+    'format_version': 4,           # 저장 형식 변경 시 올림 (이전 버전 저장소에는 추가하지 않고 rebuild_store()로 다시 만듦)
+    'max_parts': 8,                # 파트 수가 이보다 많아지면 최근 파트부터 크기가 비슷한 파트끼리 병합
+}
+
+# 데이터 캐시 설정
+CACHE_CONFIG = {
+    'enabled': True,
+    'cache_dir': '.sales_cache',    # 전처리된 데이터 캐시 저장 폴더
+    'backend': 'mmap',              # 'mmap' (컬럼별 파일, 세션/프로세스 간 메모리 매핑 공유) 또는 'parquet'
+    'format_version': 4,            # 전처리 로직 변경 시 올려서 기존 캐시 무효화
+    'upload_cache_max_bytes': 512 * 1024 * 1024,  # 업로드 파일 메모리 캐시 한도 (LRU 방식으로 제거)
+}
+
+# 분석 결과 메모이제이션 설정
+MEMO_CONFIG = {
+    'max_entries': 512,   # 분석기 중간 결과 캐시에 보관할 최대 결과 수 (LRU 방식으로 제거)
+}
+
+# 고유 개수(거래처 수, 제품 종류) 계산 설정
+DISTINCT_CONFIG = {
+    'method': 'auto',             # 'exact' (항상 정확히 계산), 'sketch' (HyperLogLog 스케치 병합), 'auto'
+    'sketch_min_rows': 1_000_000, # 'auto'일 때 일자 롤업이 이 행 수 이상이면 스케치 사용
+    'precision': 14,              # 스케치 레지스터 수 = 2^precision (14이면 표준 오차 약 0.8%)
+}
+
+# 헤비 히터(상위 거래처/제품 추적) 설정
+HEAVY_HITTERS_CONFIG = {
+    'capacity': 1000,   # 요약마다 보관할 최대 키 수 (오차 상한 = 전체 합계 / capacity)
+}
+
+# RFM(최근성, 구매 빈도, 구매 금액) 고객 세그먼트 설정
+RFM_CONFIG = {
+    'n_scores': 5,   # 점수 단계 수 (분위수 기준, 5이면 상위 20%가 5점)
+    # 세그먼트 규칙 (위에서부터 처음 맞는 규칙 적용)
+    # R = 최근성 점수, FM = 구매 빈도 점수와 구매 금액 점수의 평균, (최소, 최대) 양 끝 포함
+    'segments': [
+        {'label': '최우수 고객', 'R': (4, 5), 'FM': (4, 5)},
+        {'label': '충성 고객', 'R': (3, 5), 'FM': (3, 5)},
+        {'label': '신규/유망 고객', 'R': (4, 5), 'FM': (1, 3)},
+        {'label': '관심 필요 고객', 'R': (3, 3), 'FM': (1, 3)},
+        {'label': '이탈 위험 고객', 'R': (1, 2), 'FM': (3, 5)},
+        {'label': '휴면 고객', 'R': (1, 2), 'FM': (1, 3)},
+    ],
+}
+
+# 파레토/ABC 집중도 분석 설정
+CONCENTRATION_CONFIG = {
+    'top_n': [5, 10, 20],          # 요약에 표시할 상위 항목 수
+    'abc_boundaries': (80, 95),    # ABC 등급 누적 비중 경계(%) (A: ~80%, B: ~95%, C: 나머지)
+}
+
+# 분포 분석 구간 설정
+PRICE_BANDS = {
+    'bins': [0, 50000, 100000, 200000, 500000, 1000000, float('inf')],
+    'labels': ['5만원 미만', '5-10만원', '10-20만원', '20-50만원', '50-100만원', '100만원 이상'],
+}
+
+DISCOUNT_BANDS = {
+    'bins': [0, 0.1, 0.2, 0.3, 0.4, 0.5, 1.0],
+    'labels': ['10% 미만', '10-20%', '20-30%', '30-40%', '40-50%', '50% 이상'],
+}
+
+# 시계열 분석 설정
+TIMESERIES_CONFIG = {
+    'fiscal_year_start_month': 1,   # 회계연도 시작 월 (1이면 달력 연도, 4이면 4월~다음 해 3월)
+    'rolling_windows': {            # 단위별 이동 합계/평균 기간 수
+        'day': 7,
+        'week': 4,
+        'month': 3,
+        'quarter': 4,
+        'fiscal_year': 2,
+    },
+}
+
+# 대용량 CSV 스트리밍 설정
+STREAMING_CONFIG = {
+    'chunk_size': 200_000,                          # 한 번에 읽을 행 수
+    'csv_stream_threshold_bytes': 100 * 1024 * 1024,  # 이 크기 이상의 CSV는 청크 단위로 읽음
+    'compact_every': 8,                             # 부분 집계를 병합(압축)하는 청크 간격
+}
+
+# 병렬 처리 설정
+PARALLEL_CONFIG = {
+    'load_workers': None,   # 여러 파일/시트를 읽을 프로세스 수 (None이면 CPU 코어 수)
+    'analysis_mode': 'parallel',   # 분석/차트 작업 실행 방식: 'parallel'(스레드 풀) 또는 'serial'(순차)
+    'analysis_workers': None,   # 분석/차트 작업 스레드 수 (None이면 CPU 코어 수)
+}
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+데이터 캐시 모듈
+전처리가 끝난 판매 데이터프레임을 컬럼 기반 바이너리 형식(Parquet)으로
+디스크에 저장하여, 다음 로드 시 엑셀 파싱을 건너뛸 수 있게 합니다.
+컬럼 저장소(ColumnStore)는 컬럼마다 고정폭 배열 파일과 문자열 사전 파일을 두어
+여러 세션/프로세스가 메모리 매핑으로 같은 페이지 캐시를 공유하며 읽을 수 있게 합니다.
+업로드 파일은 내용 해시를 키로 하는 메모리 LRU 캐시에 보관합니다.
+"""
+
+import os
+import json
+import hashlib
+import shutil
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from config import CACHE_CONFIG
+
+
+def file_content_hash(file_path, chunk_size=1024 * 1024):
+    """파일 내용의 SHA-256 해시를 계산합니다."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(file_path, sheet_name):
+    """캐시 키로 사용할 원본 파일의 지문(경로, 시트, 크기, 수정시각, 내용 해시)을 만듭니다."""
+    stat = os.stat(file_path)
+    return {
+        'path': os.path.abspath(file_path),
+        'sheet': str(sheet_name),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': file_content_hash(file_path),
+        'format_version': CACHE_CONFIG['format_version'],
+    }
+
+
+class FrameCache:
+    """원본 파일 지문을 키로 하는 Parquet 디스크 캐시 클래스"""
+    
+    def __init__(self, cache_dir=None):
+        """
+        Args:
+            cache_dir: 캐시 저장 폴더 (None이면 CACHE_CONFIG 기본값)
+        """
+        self.cache_dir = cache_dir or CACHE_CONFIG['cache_dir']
+    
+    @staticmethod
+    def _source_prefix(fingerprint):
+        """같은 원본(경로 + 시트)의 캐시 파일을 묶는 접두어를 만듭니다."""
+        source = f"{fingerprint['path']}::{fingerprint['sheet']}"
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]
+    
+    @staticmethod
+    def _cache_key(fingerprint):
+        """지문 전체로부터 캐시 키를 만듭니다."""
+        payload = json.dumps(fingerprint, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:24]
+    
+    def path_for(self, fingerprint):
+        """지문에 해당하는 캐시 파일 경로를 반환합니다."""
+        file_name = f"{self._source_prefix(fingerprint)}-{self._cache_key(fingerprint)}.parquet"
+        return os.path.join(self.cache_dir, file_name)
+    
+    def load(self, fingerprint):
+        """캐시된 데이터프레임을 읽습니다. 캐시가 없으면 None을 반환합니다."""
+        cache_path = self.path_for(fingerprint)
+        if not os.path.exists(cache_path):
+            return None
+        return pd.read_parquet(cache_path)
+    
+    def store(self, fingerprint, df):
+        """데이터프레임을 캐시에 저장하고, 같은 원본의 이전 캐시는 삭제합니다."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cache_path = self.path_for(fingerprint)
+        
+        # 임시 파일에 쓴 뒤 교체하여 다른 프로세스가 쓰다 만 파일을 읽지 않도록 함
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, cache_path)
+        
+        self._prune_stale(fingerprint, keep=cache_path)
+        return cache_path
+    
+    def _prune_stale(self, fingerprint, keep):
+        """원본 파일이 바뀌어 더 이상 쓰이지 않는 캐시 파일을 삭제합니다."""
+        prefix = self._source_prefix(fingerprint) + '-'
+        for file_name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, file_name)
+            if file_name.startswith(prefix) and file_name.endswith('.parquet') and path != keep:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+    
+    def clear(self):
+        """모든 캐시 파일을 삭제합니다."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith('.parquet'):
+                os.remove(os.path.join(self.cache_dir, file_name))
+
+
+class ColumnStore(FrameCache):
+    """
+    원본 파일 지문을 키로 하는 메모리 매핑 컬럼 저장소 클래스
+    
+    저장 형식 (지문별 폴더 하나):
+        manifest.json   컬럼 순서, 종류, dtype, 행 수
+        <번호>.npy      숫자/날짜 컬럼 값 또는 범주형 컬럼의 코드 (고정폭 배열)
+        <번호>.dict.json 범주형 컬럼의 범주 사전
+    
+    load()는 배열을 복사하지 않고 메모리 매핑(copy-on-write)으로 열기 때문에
+    같은 파일을 여는 모든 세션과 프로세스가 운영체제 페이지 캐시를 공유합니다.
+    범주형이 아닌 문자열 컬럼은 사전 인코딩하여 저장하므로 다시 열면 범주형이 됩니다.
+    """
+    
+    MANIFEST = 'manifest.json'
+    
+    def path_for(self, fingerprint):
+        """지문에 해당하는 컬럼 저장소 폴더 경로를 반환합니다."""
+        dir_name = f"{self._source_prefix(fingerprint)}-{self._cache_key(fingerprint)}.cols"
+        return os.path.join(self.cache_dir, dir_name)
+    
+    def load(self, fingerprint):
+        """컬럼 저장소를 메모리 매핑으로 엽니다. 저장소가 없으면 None을 반환합니다."""
+        store_path = self.path_for(fingerprint)
+        manifest_path = os.path.join(store_path, self.MANIFEST)
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        
+        data = {}
+        for i, column in enumerate(manifest['columns']):
+            # memmap 하위 클래스가 연산 결과로 퍼지지 않도록 일반 ndarray 뷰로 사용 (메모리는 공유)
+            values = np.load(os.path.join(store_path, f'{i}.npy'), mmap_mode='c').view(np.ndarray)
+            if column['kind'] == 'category':
+                with open(os.path.join(store_path, f'{i}.dict.json'), encoding='utf-8') as f:
+                    dictionary = json.load(f)
+                data[column['name']] = pd.Categorical.from_codes(
+                    values, categories=dictionary['categories'], ordered=dictionary['ordered'])
+            else:
+                data[column['name']] = values
+        # copy=False: 컬럼별 블록을 유지하여 매핑된 배열을 그대로 사용
+        return pd.DataFrame(data, columns=[column['name'] for column in manifest['columns']], copy=False)
+    
+    @staticmethod
+    def _encode_column(series):
+        """컬럼을 (종류, 배열, 범주 사전)으로 변환합니다. 저장할 수 없는 dtype이면 TypeError를 발생시킵니다."""
+        if not isinstance(series.dtype, pd.CategoricalDtype) and series.dtype.kind in 'biufmM':
+            return 'array', series.to_numpy(), None
+        
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            if series.dtype.kind != 'O' and not pd.api.types.is_string_dtype(series.dtype):
+                raise TypeError(f"컬럼 저장소에 저장할 수 없는 dtype입니다: {series.name} ({series.dtype})")
+            series = series.astype('category')
+        
+        categories = series.cat.categories
+        if not all(isinstance(value, str) for value in categories):
+            raise TypeError(f"문자열이 아닌 범주는 저장할 수 없습니다: {series.name}")
+        dictionary = {'categories': list(categories), 'ordered': bool(series.cat.ordered)}
+        return 'category', series.cat.codes.to_numpy(), dictionary
+    
+    def store(self, fingerprint, df):
+        """데이터프레임을 컬럼별 파일로 저장하고, 같은 원본의 이전 저장소는 삭제합니다."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        store_path = self.path_for(fingerprint)
+        
+        # 임시 폴더에 모두 쓴 뒤 이름을 바꿔, 다른 프로세스가 쓰다 만 저장소를 열지 않도록 함
+        tmp_path = f"{store_path}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        try:
+            columns = []
+            for i, col in enumerate(df.columns):
+                kind, values, dictionary = self._encode_column(df[col])
+                np.save(os.path.join(tmp_path, f'{i}.npy'), np.ascontiguousarray(values))
+                if dictionary is not None:
+                    with open(os.path.join(tmp_path, f'{i}.dict.json'), 'w', encoding='utf-8') as f:
+                        json.dump(dictionary, f, ensure_ascii=False)
+                columns.append({'name': str(col), 'kind': kind, 'dtype': str(values.dtype)})
+            with open(os.path.join(tmp_path, self.MANIFEST), 'w', encoding='utf-8') as f:
+                json.dump({'rows': len(df), 'columns': columns}, f, ensure_ascii=False, indent=2)
+            
+            if os.path.exists(store_path):
+                shutil.rmtree(store_path)
+            os.replace(tmp_path, store_path)
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        
+        self._prune_stale(fingerprint, keep=store_path)
+        return store_path
+    
+    def _prune_stale(self, fingerprint, keep):
+        """원본 파일이 바뀌어 더 이상 쓰이지 않는 컬럼 저장소를 삭제합니다."""
+        prefix = self._source_prefix(fingerprint) + '-'
+        for dir_name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, dir_name)
+            if dir_name.startswith(prefix) and dir_name.endswith('.cols') and path != keep:
+                shutil.rmtree(path, ignore_errors=True)
+    
+    def clear(self):
+        """모든 컬럼 저장소를 삭제합니다."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for dir_name in os.listdir(self.cache_dir):
+            if dir_name.endswith('.cols'):
+                shutil.rmtree(os.path.join(self.cache_dir, dir_name), ignore_errors=True)
+
+
+def open_frame_cache(cache_dir=None, backend=None):
+    """
+    설정된 형식의 디스크 캐시를 반환합니다.
+    
+    Args:
+        cache_dir: 캐시 저장 폴더 (None이면 CACHE_CONFIG 설정)
+        backend: 'parquet' 또는 'mmap' (None이면 CACHE_CONFIG 설정)
+    """
+    backend = backend or CACHE_CONFIG['backend']
+    if backend == 'mmap':
+        return ColumnStore(cache_dir)
+    if backend == 'parquet':
+        return FrameCache(cache_dir)
+    raise ValueError(f"지원하지 않는 캐시 형식: {backend}")
+
+
+def frame_nbytes(df):
+    """데이터프레임의 메모리 사용량(바이트)을 계산합니다."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+class UploadCache:
+    """업로드 파일 내용 해시를 키로 하는 메모리 LRU 캐시 클래스"""
+    
+    def __init__(self, max_bytes=None):
+        """
+        Args:
+            max_bytes: 캐시 메모리 한도 (None이면 CACHE_CONFIG 설정)
+        """
+        self.max_bytes = max_bytes or CACHE_CONFIG['upload_cache_max_bytes']
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(data, sheet_name=None, encoding=None):
+        """업로드 바이트(또는 여러 파일의 바이트 리스트), 시트명, 인코딩으로 캐시 키를 만듭니다."""
+        digest = hashlib.sha256()
+        for chunk in (data if isinstance(data, (list, tuple)) else [data]):
+            digest.update(hashlib.sha256(chunk).digest())
+        return (digest.hexdigest(), str(sheet_name), str(encoding))
+    
+    def get(self, key):
+        """캐시된 값을 반환합니다. 없으면 None을 반환합니다."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+    
+    def put(self, key, value, nbytes):
+        """값을 저장하고, 한도를 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다."""
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            
+            # 한도보다 큰 항목은 저장하지 않음
+            if nbytes > self.max_bytes:
+                return False
+            
+            self._entries[key] = (value, nbytes)
+            self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_bytes
+            return True
+    
+    def clear(self):
+        """모든 항목을 제거합니다."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+    
+    def __len__(self):
+        return len(self._entries)
@@ -7,44 +7,572 @@
 
 import pandas as pd
 import numpy as np
+import openpyxl
+import codecs
+import re
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import glob
+import io
+import os
 import sys
+from config import CACHE_CONFIG, STREAMING_CONFIG, PARALLEL_CONFIG, LOADER_CONFIG
+from aggregates import HeavyHitters, PartialAggregate, is_summary, kpi_totals, get_cube, seed_cube
+from data_cache import file_fingerprint, open_frame_cache
+from data_store import SalesStore
+from schema import SALES_SCHEMA, align_categories, apply_dtype_plan, memory_report
+from time_keys import derive_time_keys
+
+
+# 할인적용 컬럼의 범주 (코드 0=정상가, 1=할인)
+DISCOUNT_FLAG_LABELS = ['정상가', '할인']
+
+# 파일 확장자별 형식
+FILE_TYPES = {'xlsx': 'excel', 'xls': 'excel', 'csv': 'csv'}
+
+# CSV 인코딩 시도 순서
+CSV_ENCODINGS = ['utf-8', 'cp949', 'euc-kr', 'latin1']
+
+# 모든 시트를 읽을 때 사용하는 시트명
+ALL_SHEETS = '*'
+
+# 여러 파일/시트를 합칠 때 출처(파일명:시트명)를 담는 컬럼
+PARTITION_COLUMN = '출처'
+
+# 필수 컬럼
+REQUIRED_COLUMNS = ['날짜', '거래처명', '분류명', '제품명', '단가', '수량', '금액']
+
+
+def file_type_of(file_name):
+    """파일명 확장자로 파일 형식('excel' 또는 'csv')을 반환합니다. 지원하지 않으면 None을 반환합니다."""
+    return FILE_TYPES.get(str(file_name).rsplit('.', 1)[-1].lower())
+
+
+def missing_required_columns(df):
+    """누락된 필수 컬럼 목록을 반환합니다. 요약 데이터는 단가 대신 단가대 컬럼을 가집니다."""
+    required = [col for col in REQUIRED_COLUMNS if not (is_summary(df) and col == '단가')]
+    return [col for col in required if col not in df.columns]
+
+
+def sniff_encoding(source, encodings=None, sample_bytes=None):
+    """
+    CSV 파일 앞부분만 읽어 인코딩을 판별합니다. 파일 전체를 인코딩별로 파싱해 보지 않습니다.
+    
+    - UTF-8 BOM이 있으면 UTF-8로 결정합니다.
+    - ASCII 바이트만 있는 블록은 모든 후보 인코딩에서 같으므로 건너뜁니다.
+    - 처음 비 ASCII 문자가 나온 블록을 후보 인코딩의 증분 디코더로 검증하여 처음 통과한 인코딩을 고릅니다.
+      (파일 끝이 아니면 블록 끝에서 잘린 멀티바이트 문자는 증분 디코더가 오류로 보지 않음)
+    
+    Args:
+        source: 파일 경로 또는 바이너리 파일 객체 (파일 객체는 처음 위치로 되돌림)
+        encodings: 후보 인코딩 목록 (None이면 CSV_ENCODINGS)
+        sample_bytes: 한 번에 검사할 바이트 수 (None이면 LOADER_CONFIG 설정)
+    
+    Returns:
+        {'encoding': 판별된 인코딩, 'method': 'bom' | 'sample' | 'ascii', 'bytes_examined': 검사한 바이트 수}
+    """
+    encodings = encodings or CSV_ENCODINGS
+    sample_bytes = sample_bytes or LOADER_CONFIG['encoding_sample_bytes']
+    
+    handle = source if hasattr(source, 'read') else open(source, 'rb')
+    try:
+        if handle is source:
+            source.seek(0)
+        block = handle.read(sample_bytes)
+        examined = len(block)
+        if block.startswith(codecs.BOM_UTF8):
+            return {'encoding': 'utf-8', 'method': 'bom', 'bytes_examined': len(codecs.BOM_UTF8)}
+        
+        while block and block.isascii():
+            block = handle.read(sample_bytes)
+            examined += len(block)
+        if not block:
+            return {'encoding': encodings[0], 'method': 'ascii', 'bytes_examined': examined}
+        
+        # 첫 비 ASCII 바이트 뒤로 최소 16바이트를 확보해 잘린 문자만으로 검증을 통과하지 않도록 함
+        first = re.search(rb'[\x80-\xff]', block).start()
+        while len(block) - first < 16:
+            more = handle.read(sample_bytes)
+            if not more:
+                break
+            block += more
+            examined += len(more)
+        at_end = not handle.read(1)   # 파일 끝까지 읽었으면 잘린 문자도 오류로 판정
+        
+        for encoding in encodings:
+            try:
+                codecs.getincrementaldecoder(encoding)().decode(block, final=at_end)
+            except UnicodeDecodeError:
+                continue
+            return {'encoding': encoding, 'method': 'sample', 'bytes_examined': examined}
+        raise UnicodeError("CSV 파일의 인코딩을 인식할 수 없습니다.")
+    finally:
+        if handle is source:
+            source.seek(0)
+        else:
+            handle.close()
+
+
+def _read_with_encodings(source, read, encodings):
+    """인코딩을 차례로 시도하여 읽습니다. (결과, 사용된 인코딩)을 반환합니다."""
+    for encoding in encodings:
+        try:
+            if hasattr(source, 'seek'):
+                source.seek(0)  # 파일 포인터 초기화
+            return read(source, encoding), encoding
+        except UnicodeDecodeError:
+            continue
+    raise UnicodeError("CSV 파일의 인코딩을 인식할 수 없습니다.")
+
+
+def _convert_column(values, logical_type):
+    """셀 값 리스트를 스키마 논리 타입에 맞는 NumPy 배열로 변환합니다. 변환할 수 없으면 object 배열을 반환합니다."""
+    try:
+        if logical_type == 'datetime':
+            return np.array(values, dtype='datetime64[us]')
+        if logical_type == 'int':
+            return np.array(values, dtype=np.int64)
+        if logical_type in ('money', 'float'):
+            return np.array(values, dtype=np.float64)   # 빈 셀(None)은 NaN
+    except (TypeError, ValueError, OverflowError):
+        pass
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def read_excel_columns(source, sheet_name='Sheet1', chunk_rows=65536):
+    """
+    openpyxl 읽기 전용(values_only) 스트리밍으로 엑셀 시트를 읽어 컬럼별 NumPy 버퍼에 바로 채웁니다.
+    셀 객체를 만들지 않고, 알려진 스키마(SALES_SCHEMA)로 컬럼 dtype을 정해 pandas의 dtype 추론을 건너뜁니다.
+    
+    Args:
+        source: 엑셀 파일 경로 또는 파일 객체
+        sheet_name: 시트명
+        chunk_rows: 한 번에 열 방향으로 변환할 행 수
+    
+    Returns:
+        원본 컬럼으로 구성된 데이터프레임 (문자열 차원은 범주형)
+    """
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name]
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        
+        columns = [str(name).strip() if name is not None else f'Unnamed: {i}' for i, name in enumerate(header)]
+        types = [SALES_SCHEMA.get(col, 'category') for col in columns]
+        width = len(columns)
+        
+        # 시트 크기를 알면 버퍼를 미리 할당, 모르면 청크 배열을 모아서 이어붙임
+        capacity = (sheet.max_row - 1) if sheet.max_row else None
+        buffers = [None] * width
+        filled = 0
+        parts = [[] for _ in range(width)]
+        
+        def flush(chunk):
+            nonlocal filled
+            for j, values in enumerate(zip(*chunk)):
+                array = _convert_column(values, types[j])
+                if capacity is None:
+                    parts[j].append(array)
+                    continue
+                if buffers[j] is None:
+                    buffers[j] = np.empty(capacity, dtype=array.dtype)
+                elif buffers[j].dtype != array.dtype:
+                    # 앞 청크와 타입이 다르면 object 버퍼로 전환
+                    buffers[j] = buffers[j].astype(object)
+                    array = array.astype(object)
+                buffers[j][filled:filled + len(array)] = array
+            filled += len(chunk)
+        
+        chunk = []
+        for row in rows:
+            if len(row) < width:
+                row = row + (None,) * (width - len(row))
+            elif len(row) > width:
+                row = row[:width]
+            if all(value is None for value in row):
+                continue   # 빈 행 건너뛰기
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                if capacity is not None and filled + len(chunk) > capacity:
+                    capacity = None
+                    parts = [[buffer[:filled]] if buffer is not None else [] for buffer in buffers]
+                flush(chunk)
+                chunk = []
+        if chunk:
+            if capacity is not None and filled + len(chunk) > capacity:
+                capacity = None
+                parts = [[buffer[:filled]] if buffer is not None else [] for buffer in buffers]
+            flush(chunk)
+    finally:
+        workbook.close()
+    
+    data = {}
+    for j, col in enumerate(columns):
+        if capacity is not None:
+            array = buffers[j][:filled] if buffers[j] is not None else np.empty(0, dtype=object)
+        else:
+            arrays = parts[j]
+            if len({a.dtype for a in arrays}) > 1:
+                arrays = [a.astype(object) for a in arrays]
+            array = np.concatenate(arrays) if arrays else np.empty(0, dtype=object)
+        
+        if types[j] == 'category' and array.dtype == object:
+            data[col] = pd.Categorical(array)
+        else:
+            data[col] = array
+    return pd.DataFrame(data)
+
+
+def build_sales_frame(df):
+    """
+    원본 데이터프레임에 컬럼 정리, 파생 컬럼 생성, dtype 계획을 적용합니다.
+    
+    Returns:
+        (전처리된 데이터프레임, 메모리 사용량 보고서)
+    """
+    df = create_derived_columns(prepare_columns(df))
+    
+    # 메모리 절약형 dtype 적용 (범주형 차원, 축소 정수, 정수 금액)
+    before = df.memory_usage(deep=True, index=False)
+    df = apply_dtype_plan(df)
+    return df, memory_report(before, df)
+
+
+def _new_diagnostics(file_type):
+    """로드 진단 정보 딕셔너리의 기본값을 만듭니다."""
+    return {
+        'file_type': file_type,
+        'encoding': None,
+        'encoding_detection': None,
+        'streamed': False,
+        'source_rows': None,
+        'memory_report': None,
+        'heavy_hitters': None,   # 스트리밍 CSV에서 청크마다 갱신한 HeavyHitters
+    }
+
+
+def _csv_encodings(source, encoding, diagnostics):
+    """시도할 CSV 인코딩 목록을 정합니다. 지정되지 않으면 파일 앞부분으로 판별합니다."""
+    if encoding:
+        return [encoding]
+    # 판별된 인코딩으로 한 번만 파싱하고, 뒷부분에서 디코딩 오류가 나면 다음 후보로 넘어감
+    detection = sniff_encoding(source)
+    diagnostics['encoding_detection'] = detection
+    return CSV_ENCODINGS[CSV_ENCODINGS.index(detection['encoding']):]
+
+
+def read_raw_file(source, file_type, sheet_name='Sheet1', encoding=None, excel_reader=None):
+    """
+    판매 데이터 파일을 파생 컬럼 없이 원본 그대로 읽습니다. (컬럼명 정리, 날짜 변환만 적용)
+    
+    Returns:
+        (원본 데이터프레임, 로드 진단 정보 딕셔너리)
+    """
+    diagnostics = _new_diagnostics(file_type)
+    if file_type == 'csv':
+        encodings = _csv_encodings(source, encoding, diagnostics)
+        raw, diagnostics['encoding'] = _read_with_encodings(
+            source, lambda src, enc: pd.read_csv(src, encoding=enc), encodings)
+    elif file_type == 'excel':
+        if (excel_reader or LOADER_CONFIG['excel_reader']) == 'stream':
+            raw = read_excel_columns(source, sheet_name)
+        else:
+            raw = pd.read_excel(source, sheet_name=sheet_name)
+    else:
+        raise ValueError(f"지원하지 않는 파일 형식: {file_type}")
+    
+    diagnostics['source_rows'] = len(raw)
+    return prepare_columns(raw), diagnostics
+
+
+def load_sales_file(source, file_type, sheet_name='Sheet1', encoding=None, stream=False, excel_reader=None):
+    """
+    판매 데이터 파일을 읽어 분석용 데이터프레임을 만듭니다.
+    SalesDataLoader와 Streamlit 업로드가 공통으로 사용하는 로드 파이프라인입니다.
+    
+    Args:
+        source: 파일 경로 또는 파일 객체
+        file_type: 'excel' 또는 'csv'
+        sheet_name: 시트명 (Excel 전용)
+        encoding: CSV 인코딩 (None이면 파일 앞부분으로 판별)
+        stream: CSV를 청크 단위로 읽어 요약 데이터로 집계할지 여부
+        excel_reader: 엑셀 읽기 방식 'pandas' 또는 'stream' (None이면 LOADER_CONFIG 설정)
+    
+    Returns:
+        (데이터프레임, 로드 진단 정보 딕셔너리)
+    """
+    if file_type == 'csv' and stream:
+        diagnostics = _new_diagnostics(file_type)
+        encodings = _csv_encodings(source, encoding, diagnostics)
+        def read(src, enc):
+            # 인코딩을 다시 시도하면 요약도 처음부터 다시 만듦
+            diagnostics['heavy_hitters'] = HeavyHitters()
+            return load_csv_summary(src, encoding=enc, heavy_hitters=diagnostics['heavy_hitters'])
+        
+        (df, source_rows), diagnostics['encoding'] = _read_with_encodings(source, read, encodings)
+        diagnostics.update({'streamed': True, 'source_rows': source_rows})
+        return df, diagnostics
+    
+    raw, diagnostics = read_raw_file(source, file_type, sheet_name, encoding, excel_reader)
+    df, diagnostics['memory_report'] = build_sales_frame(raw)
+    return df, diagnostics
+
+
+def prepare_columns(df):
+    """컬럼명 공백을 제거하고 날짜 컬럼을 datetime으로 변환합니다."""
+    # 컬럼명 정리 (공백 제거)
+    df.columns = df.columns.str.strip()
+    
+    # 날짜 컬럼을 datetime으로 변환
+    if '날짜' in df.columns:
+        df['날짜'] = pd.to_datetime(df['날짜'])
+    return df
+
+
+def create_derived_columns(df):
+    """
+    파생 컬럼을 벡터 연산으로 한 번에 생성합니다.
+    시간 차원은 정수 키(년월키, 분기키, 요일번호)로만 저장하고,
+    한글 라벨은 집계 결과를 표시할 때 time_keys 모듈로 붙입니다.
+    """
+    if '날짜' in df.columns:
+        # 년, 월, 분기, 정수 시간 키 추출
+        for col, values in derive_time_keys(df['날짜']).items():
+            df[col] = values
+    
+    if 'Discount' in df.columns:
+        discount = df['Discount'].to_numpy()
+        
+        # 할인율 계산 (Discount가 비율인 경우)
+        df['할인율'] = discount * 100
+        
+        # 할인 적용 여부 (정상가=0, 할인=1 코드의 범주형)
+        codes = (discount > 0).astype(np.int8)
+        df['할인적용'] = pd.Categorical.from_codes(codes, categories=DISCOUNT_FLAG_LABELS)
+        
+        # 할인액 계산
+        if '단가' in df.columns and '수량' in df.columns:
+            df['할인전금액'] = df['단가'] * df['수량']
+            df['할인액'] = df['할인전금액'] * df['Discount']
+    return df
+
+
+def collect_data_info(df):
+    """데이터의 기본 정보를 수집합니다. 건수와 고유 개수는 KPI 커널 결과를 함께 사용합니다."""
+    totals = kpi_totals(df)
+    return {
+        '총_거래건수': totals['transactions'],
+        '데이터_시작일': totals['date_min'],
+        '데이터_종료일': totals['date_max'],
+        '컬럼_목록': list(df.columns),
+        '거래처_수': totals['distinct']['거래처명'],
+        '제품_수': totals['distinct']['제품명'],
+        '제품분류_수': totals['distinct']['분류명'],
+    }
+
+
+def load_csv_summary(source, encoding='utf-8', chunk_size=None, compact_every=None, heavy_hitters=None):
+    """
+    대용량 CSV를 청크 단위로 읽어 부분 집계(요약 데이터)로 누적합니다.
+    청크마다 파생 컬럼을 만든 뒤 바로 집계하므로 메모리 사용량은 파일 크기가 아니라
+    (일자 × 거래처 × 제품 × 할인/단가 구간) 조합 수에 비례합니다.
+    
+    Args:
+        source: CSV 파일 경로 또는 파일 객체
+        encoding: 인코딩
+        chunk_size: 청크당 행 수 (None이면 STREAMING_CONFIG 설정)
+        compact_every: 부분 집계 병합 간격 (None이면 STREAMING_CONFIG 설정)
+        heavy_hitters: 청크마다 갱신할 HeavyHitters (None이면 갱신하지 않음)
+    
+    Returns:
+        (요약 데이터프레임, 원본 행 수)
+    """
+    chunk_size = chunk_size or STREAMING_CONFIG['chunk_size']
+    partial = PartialAggregate(compact_every or STREAMING_CONFIG['compact_every'])
+    
+    for chunk in pd.read_csv(source, encoding=encoding, chunksize=chunk_size):
+        chunk = create_derived_columns(prepare_columns(chunk))
+        partial.add_rows(chunk)
+        if heavy_hitters is not None:
+            heavy_hitters.add_rows(chunk)
+    
+    summary = partial.get_summary()
+    if summary is None:
+        raise ValueError("CSV 파일에 데이터가 없습니다.")
+    
+    # 요약 데이터 기준으로 시간 파생 컬럼을 다시 생성
+    summary = apply_dtype_plan(create_derived_columns(summary))
+    return summary, partial.row_count
+
+
+def expand_file_patterns(patterns):
+    """파일 경로/글롭 패턴(또는 그 리스트)을 정렬된 실제 파일 경로 리스트로 펼칩니다."""
+    if isinstance(patterns, (str, os.PathLike)):
+        patterns = [patterns]
+    
+    paths = []
+    for pattern in patterns:
+        pattern = str(pattern)
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            raise FileNotFoundError(pattern)
+        paths.extend(path for path in matches if path not in paths)
+    return paths
+
+
+def list_sheet_names(source):
+    """엑셀 파일의 시트명 목록을 반환합니다. (경로 또는 바이트)"""
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    with pd.ExcelFile(source) as workbook:
+        return list(workbook.sheet_names)
+
+
+def _partition_label(name, sheet_name, file_type):
+    """파티션(파일 + 시트)의 표시 이름을 만듭니다."""
+    base = os.path.basename(str(name))
+    return base if file_type == 'csv' else f"{base}:{sheet_name}"
+
+
+def _load_partition(task):
+    """
+    파티션 하나를 로드합니다. (프로세스 풀 작업 함수)
+    
+    Args:
+        task: (원본, 파일명, 시트명, 캐시 사용 여부, 캐시 폴더)
+              원본이 bytes이면 업로드 파일, 아니면 파일 경로
+    """
+    source, name, sheet_name, use_cache, cache_dir = task
+    if isinstance(source, bytes):
+        df, _ = load_sales_file(io.BytesIO(source), file_type_of(name) or 'excel', sheet_name)
+        return df
+    
+    loader = SalesDataLoader(source, sheet_name, use_cache=use_cache, cache_dir=cache_dir)
+    loader._load_single()
+    return loader.df
+
+
+def _check_partition_schemas(frames, labels):
+    """모든 파티션의 컬럼 구성이 같은지 확인합니다. 다르면 ValueError를 발생시킵니다."""
+    expected = set(frames[0].columns)
+    problems = []
+    for frame, label in zip(frames[1:], labels[1:]):
+        columns = set(frame.columns)
+        if columns != expected:
+            missing = sorted(expected - columns)
+            extra = sorted(columns - expected)
+            problems.append(f"{label} (누락: {missing}, 추가: {extra})")
+    if problems:
+        raise ValueError(f"파티션 스키마 불일치 - 기준: {labels[0]} / " + '; '.join(problems))
+
+
+def concat_partitions(frames, labels):
+    """
+    파티션 데이터프레임을 하나로 합치고 출처 컬럼을 추가합니다.
+    범주형 컬럼은 범주를 합집합으로 맞춰 합친 뒤에도 범주형을 유지합니다.
+    """
+    _check_partition_schemas(frames, labels)
+    columns = list(frames[0].columns)
+    frames = align_categories([frame[columns] for frame in frames])
+    df = pd.concat(frames, ignore_index=True)
+    codes = np.repeat(np.arange(len(frames), dtype=np.int32), [len(frame) for frame in frames])
+    df[PARTITION_COLUMN] = pd.Categorical.from_codes(codes, categories=labels)
+    return df
+
+
+def load_partitions(sources, sheet_name='Sheet1', use_cache=None, cache_dir=None, max_workers=None):
+    """
+    여러 파일/시트를 프로세스 풀에서 병렬로 읽어 하나의 데이터프레임으로 합칩니다.
+    
+    Args:
+        sources: 파일 경로/글롭 패턴 리스트, 또는 업로드 파일 (파일명, 바이트) 튜플 리스트
+        sheet_name: 시트명 (ALL_SHEETS이면 각 엑셀 파일의 모든 시트)
+        use_cache: 파일 경로 파티션의 디스크 캐시 사용 여부
+        cache_dir: 캐시 저장 폴더
+        max_workers: 프로세스 수 (None이면 PARALLEL_CONFIG 설정, 1이면 순차 실행)
+    
+    Returns:
+        (출처 컬럼이 추가된 데이터프레임, 파티션 이름 리스트)
+    """
+    use_cache = CACHE_CONFIG['enabled'] if use_cache is None else use_cache
+    if isinstance(sources, (str, os.PathLike)) or (sources and not isinstance(sources[0], tuple)):
+        sources = [(path, path) for path in expand_file_patterns(sources)]
+    
+    tasks, labels = [], []
+    for source, name in sources:
+        file_type = file_type_of(name) or 'excel'
+        if file_type == 'excel' and sheet_name == ALL_SHEETS:
+            sheets = list_sheet_names(source)
+        else:
+            sheets = [sheet_name]
+        for sheet in sheets:
+            tasks.append((source, name, sheet, use_cache, cache_dir))
+            labels.append(_partition_label(name, sheet, file_type))
+    
+    if not tasks:
+        raise ValueError("읽을 파일이 없습니다.")
+    
+    max_workers = min(max_workers or PARALLEL_CONFIG['load_workers'] or os.cpu_count() or 1, len(tasks))
+    if max_workers <= 1:
+        frames = [_load_partition(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(executor.map(_load_partition, tasks))
+    
+    return concat_partitions(frames, labels), labels
 
 
 class SalesDataLoader:
     """판매 데이터를 로드하고 전처리하는 클래스"""
     
-    def __init__(self, file_path='판매.xlsx', sheet_name='판매'):
+    def __init__(self, file_path='판매.xlsx', sheet_name='판매', use_cache=None, cache_dir=None,
+                 max_workers=None, store_dir=None):
         """
         Args:
-            file_path: 엑셀 파일 경로
-            sheet_name: 시트명
+            file_path: 엑셀 파일 경로, 글롭 패턴(예: 'data/*.xlsx') 또는 경로/패턴 리스트
+            sheet_name: 시트명 (ALL_SHEETS이면 모든 시트)
+            use_cache: 전처리 결과 디스크 캐시 사용 여부 (None이면 CACHE_CONFIG 설정)
+            cache_dir: 캐시 저장 폴더 (None이면 CACHE_CONFIG 설정)
+            max_workers: 여러 파일/시트를 읽을 프로세스 수 (None이면 PARALLEL_CONFIG 설정)
+            store_dir: 증분 추가 모드의 누적 저장소 폴더 (None이면 STORE_CONFIG 설정)
         """
         self.file_path = file_path
         self.sheet_name = sheet_name
+        self.use_cache = CACHE_CONFIG['enabled'] if use_cache is None else use_cache
+        self.cache = open_frame_cache(cache_dir)
+        self.max_workers = max_workers
+        self.store = SalesStore(store_dir)
         self.df = None
+        self.from_store = False   # True이면 self.df를 get_data() 호출 시 저장소에서 읽음
+        self.fingerprint = None
         self.data_info = {}
+        self.memory_report = None
+        self.partitions = []
         
     def load_data(self):
         """데이터를 로드하고 기본 전처리를 수행합니다."""
+        self.from_store = False
         try:
-            # 엑셀 파일 읽기
-            self.df = pd.read_excel(self.file_path, sheet_name=self.sheet_name)
-            
-            # 컬럼명 정리 (공백 제거)
-            self.df.columns = self.df.columns.str.strip()
-            
-            # 날짜 컬럼을 datetime으로 변환
-            if '날짜' in self.df.columns:
-                self.df['날짜'] = pd.to_datetime(self.df['날짜'])
-                
-            # 파생 컬럼 생성
-            self._create_derived_columns()
+            if self.is_multi_source():
+                # 여러 파일/시트를 병렬로 읽어 하나로 합침
+                self.df, self.partitions = load_partitions(
+                    self.file_path, self.sheet_name,
+                    use_cache=self.use_cache,
+                    cache_dir=self.cache.cache_dir,
+                    max_workers=self.max_workers
+                )
+                print(f"✓ 데이터 로드 완료: {len(self.partitions)}개 파티션, {len(self.df)}건")
+            else:
+                self._load_single()
             
             # 데이터 정보 수집
             self._collect_data_info()
             
-            print(f"✓ 데이터 로드 완료: {len(self.df)}건")
             return self.df
             
         except FileNotFoundError:
@@ -54,59 +582,189 @@ class SalesDataLoader:
             print(f"❌ 데이터 로드 중 오류 발생: {e}")
             sys.exit(1)
     
-    def _create_derived_columns(self):
-        """파생 컬럼을 생성합니다."""
-        if '날짜' in self.df.columns:
-            # 년, 월, 분기, 요일 추출
-            self.df['년'] = self.df['날짜'].dt.year
-            self.df['월'] = self.df['날짜'].dt.month
-            self.df['분기'] = self.df['날짜'].dt.quarter
-            self.df['요일'] = self.df['날짜'].dt.day_name()
-            self.df['년월'] = self.df['날짜'].dt.to_period('M').astype(str)
-            
-            # 한글 요일명
-            요일_매핑 = {
-                'Monday': '월요일',
-                'Tuesday': '화요일',
-                'Wednesday': '수요일',
-                'Thursday': '목요일',
-                'Friday': '금요일',
-                'Saturday': '토요일',
-                'Sunday': '일요일'
-            }
-            self.df['요일명'] = self.df['요일'].map(요일_매핑)
+    def is_multi_source(self):
+        """여러 파일 또는 여러 시트를 읽는 모드인지 확인합니다."""
+        return (isinstance(self.file_path, (list, tuple))
+                or glob.has_magic(str(self.file_path))
+                or self.sheet_name == ALL_SHEETS)
+    
+    def _load_single(self):
+        """단일 파일/시트를 캐시를 거쳐 로드합니다."""
+        # 캐시 확인 (원본 파일이 바뀌면 지문이 달라져 자동으로 무효화됨)
+        fingerprint = file_fingerprint(self.file_path, self.sheet_name) if self.use_cache else None
+        self.fingerprint = fingerprint
+        self.df = self._load_from_cache(fingerprint)
         
-        # 할인율 계산 (Discount가 비율인 경우)
-        if 'Discount' in self.df.columns:
-            self.df['할인율'] = self.df['Discount'] * 100
-            
-        # 할인액 계산
-        if '단가' in self.df.columns and '수량' in self.df.columns and 'Discount' in self.df.columns:
-            self.df['할인전금액'] = self.df['단가'] * self.df['수량']
-            self.df['할인액'] = self.df['할인전금액'] * self.df['Discount']
+        if self.df is None:
+            self._read_source()
+            self._store_to_cache(fingerprint)
+            print(f"✓ 데이터 로드 완료: {len(self.df)}건")
+        else:
+            print(f"✓ 캐시에서 데이터 로드 완료: {len(self.df)}건")
+    
+    def append_new_rows(self, source=None):
+        """
+        저장소에 있는 데이터보다 새로운 행만 추가합니다. (증분 추가 모드)
+        저장된 최대 판매ID(없으면 최대 날짜)보다 새로운 행에만 파생 컬럼을 만들고,
+        새 파트로 저장한 뒤 월별/거래처별/제품별/분류별/할인율 구간별 롤업에 더합니다.
+        기존 파트는 읽지 않으며, 데이터 정보는 메타 정보와 롤업으로 갱신하고
+        전체 데이터프레임은 get_data()를 호출할 때 저장소에서 읽습니다.
+        저장소가 없으면 전체 데이터를 읽어 저장소를 만듭니다.
+        저장소의 형식 버전이 다르면 기존 이력을 지우지 않도록 추가하지 않고 중단합니다. (rebuild_store() 참고)
+        
+        Args:
+            source: 새 행이 들어 있는 파일 경로 (None이면 원본 파일 전체에서 새 행을 찾음)
+        
+        Returns:
+            추가된 행 수
+        """
+        source = source or self.file_path
+        # 저장소 데이터는 원본 파일 지문과 일치하지 않으므로 일자 롤업을 디스크 캐시에 두지 않음
+        self.fingerprint = None
+        try:
+            if not self.store.exists():
+                self._read_source(source)
+                self.store.rebuild(self.df, source)
+                self.from_store = False
+                added = len(self.df)
+                print(f"✓ 저장소 생성 완료: {added}건")
+                self._collect_data_info()
+            else:
+                self.store.check_compatible()
+                raw, _ = read_raw_file(source, file_type_of(source) or 'excel', self.sheet_name)
+                new_rows = self.store.select_new_rows(raw).reset_index(drop=True)
+                if len(new_rows):
+                    new_rows = apply_dtype_plan(create_derived_columns(new_rows))
+                added = self.store.append(new_rows)
+                self.df = None
+                self.from_store = True
+                self.data_info = self.store.data_info()
+                print(f"✓ 새 데이터 추가 완료: {added}건 (누적 {self.store.meta['rows']}건)")
             
-        # 할인 적용 여부
-        if 'Discount' in self.df.columns:
-            self.df['할인적용'] = self.df['Discount'].apply(lambda x: '할인' if x > 0 else '정상가')
+            return added
+        
+        except FileNotFoundError:
+            print(f"❌ 파일을 찾을 수 없습니다: {source}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"❌ 데이터 추가 중 오류 발생: {e}")
+            sys.exit(1)
+    
+    def rebuild_store(self):
+        """
+        원본 전체 데이터(file_path)로 저장소를 다시 만듭니다.
+        형식 버전이 바뀐 저장소는 이 메서드로 다시 만든 뒤 append_new_rows()로 새 행을 추가합니다.
+        (증분 추가에 넘긴 신규 행 파일로는 저장소를 다시 만들지 않습니다)
+        
+        Returns:
+            저장된 행 수
+        """
+        self.fingerprint = None
+        try:
+            self._read_source(self.file_path)
+            self.store.rebuild(self.df, self.file_path)
+            self.from_store = False
+            print(f"✓ 저장소 재생성 완료: {len(self.df)}건")
+            self._collect_data_info()
+            return len(self.df)
+        
+        except FileNotFoundError:
+            print(f"❌ 파일을 찾을 수 없습니다: {self.file_path}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"❌ 저장소 재생성 중 오류 발생: {e}")
+            sys.exit(1)
+    
+    def get_daily_rollup(self):
+        """
+        일자 단위 롤업(집계 큐브)을 반환합니다.
+        단일 파일은 원본 지문을 키로 디스크 캐시에 함께 저장하므로, 다음 실행부터는
+        행 단위 데이터를 다시 집계하지 않고 저장된 롤업을 읽습니다.
+        읽거나 만든 롤업은 get_cube(self.df)가 반환하도록 데이터프레임에 연결됩니다.
+        """
+        self.get_data()
+        if self.fingerprint is None or is_summary(self.df):
+            return get_cube(self.df)
+        
+        # 시트명에 구분자를 붙여 행 단위 데이터 캐시와 다른 항목으로 저장 (서로 정리 대상이 되지 않음)
+        fingerprint = dict(self.fingerprint, sheet=f"{self.fingerprint['sheet']}::daily")
+        cube = self._load_from_cache(fingerprint)
+        if cube is None:
+            cube = get_cube(self.df)
+            try:
+                self.cache.store(fingerprint, cube)
+            except Exception as e:
+                print(f"⚠ 일자 롤업 캐시 저장 실패 (계속 진행): {e}")
+        else:
+            print(f"✓ 캐시에서 일자 롤업 로드 완료: {len(cube)}행")
+        return seed_cube(self.df, cube)
+    
+    def get_rollups(self):
+        """저장소의 롤업 집계(monthly, customer, category, discount)를 반환합니다."""
+        return self.store.load_rollups()
+    
+    def get_heavy_hitters(self):
+        """
+        저장소의 헤비 히터 요약을 반환합니다. 증분 추가 때마다 새 행만 더해 유지됩니다.
+        
+        사용 예:
+            hh = loader.get_heavy_hitters()
+            hh.top('거래처명', 10, by='금액')        # 추정값과 오차 범위
+            hh.confirm('거래처명', loader.get_data())  # 후보의 정확한 값 확인
+        """
+        return self.store.load_heavy_hitters()
+    
+    def _read_source(self, source=None):
+        """원본 파일을 읽고 전처리합니다."""
+        source = source or self.file_path
+        file_type = file_type_of(source) or 'excel'
+        self.df, diagnostics = load_sales_file(source, file_type, self.sheet_name)
+        self.memory_report = diagnostics['memory_report']
+        
+        detection = diagnostics['encoding_detection']
+        if detection:
+            print(f"✓ CSV 인코딩: {diagnostics['encoding']} "
+                  f"(판별: {detection['encoding']}, 앞 {detection['bytes_examined']:,}바이트 검사)")
+        total = self.memory_report.iloc[-1]
+        print(f"✓ 메모리 최적화: {total['적용전_bytes'] / 1024 ** 2:,.1f}MB → "
+              f"{total['적용후_bytes'] / 1024 ** 2:,.1f}MB ({total['절감률']}% 절감)")
+    
+    def _load_from_cache(self, fingerprint):
+        """캐시된 전처리 결과를 읽습니다. 캐시가 없거나 읽을 수 없으면 None을 반환합니다."""
+        if fingerprint is None:
+            return None
+        try:
+            return self.cache.load(fingerprint)
+        except Exception as e:
+            print(f"⚠ 캐시를 읽을 수 없어 원본 파일을 사용합니다: {e}")
+            return None
+    
+    def _store_to_cache(self, fingerprint):
+        """전처리 결과를 캐시에 저장합니다. 실패해도 로드는 계속 진행합니다."""
+        if fingerprint is None:
+            return
+        try:
+            self.cache.store(fingerprint, self.df)
+        except Exception as e:
+            print(f"⚠ 캐시 저장 실패 (계속 진행): {e}")
     
     def _collect_data_info(self):
         """데이터의 기본 정보를 수집합니다."""
-        self.data_info = {
-            '총_거래건수': len(self.df),
-            '데이터_시작일': self.df['날짜'].min() if '날짜' in self.df.columns else None,
-            '데이터_종료일': self.df['날짜'].max() if '날짜' in self.df.columns else None,
-            '컬럼_목록': list(self.df.columns),
-            '거래처_수': self.df['거래처명'].nunique() if '거래처명' in self.df.columns else 0,
-            '제품_수': self.df['제품명'].nunique() if '제품명' in self.df.columns else 0,
-            '제품분류_수': self.df['분류명'].nunique() if '분류명' in self.df.columns else 0,
-        }
+        self.data_info = collect_data_info(self.df)
     
     def get_data(self):
-        """로드된 데이터프레임을 반환합니다."""
+        """로드된 데이터프레임을 반환합니다. 증분 추가 후에는 저장소의 모든 파트를 이때 읽습니다."""
         if self.df is None:
-            self.load_data()
+            if self.from_store:
+                self.df = self.store.load_frame()
+            else:
+                self.load_data()
         return self.df
     
+    def get_memory_report(self):
+        """dtype 계획 적용 전후의 메모리 사용량 보고서를 반환합니다. (원본 파일을 읽은 경우에만 제공)"""
+        return self.memory_report
+    
     def get_data_info(self):
         """데이터 정보를 반환합니다."""
         if not self.data_info:
@@ -115,14 +773,15 @@ class SalesDataLoader:
     
     def validate_data(self):
         """데이터의 유효성을 검증합니다."""
-        required_columns = ['날짜', '거래처명', '분류명', '제품명', '단가', '수량', '금액']
-        missing_columns = [col for col in required_columns if col not in self.df.columns]
+        self.get_data()
+        missing_columns = missing_required_columns(self.df)
         
         if missing_columns:
             print(f"⚠ 필수 컬럼 누락: {', '.join(missing_columns)}")
             return False
         
         # 결측치 확인
+        required_columns = [col for col in REQUIRED_COLUMNS if col in self.df.columns]
         null_counts = self.df[required_columns].isnull().sum()
         if null_counts.sum() > 0:
             print(f"⚠ 결측치 발견:")
@@ -143,6 +802,10 @@ if __name__ == '__main__':
     for key, value in loader.get_data_info().items():
         print(f"{key}: {value}")
     
+    if loader.get_memory_report() is not None:
+        print("\n=== 메모리 사용량 ===")
+        print(loader.get_memory_report().to_string(index=False))
+    
     print("\n=== 데이터 샘플 ===")
     print(df.head())
 
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+데이터 저장소 모듈
+전처리된 판매 데이터를 파트(Parquet 파일) 단위로 누적 저장하고,
+월별/거래처별/제품별/분류별/할인율 구간별 롤업 집계와 상위 거래처/제품 헤비 히터 요약을 함께 보관합니다.
+새로 들어온 행은 새 파트로 추가하고 롤업과 요약에 더하므로 기존 이력을 다시 쓰지 않습니다.
+파트 수가 STORE_CONFIG['max_parts']를 넘으면 최근 파트부터 크기가 비슷한 파트끼리 병합하므로
+각 행이 병합되는 횟수는 전체 행 수의 로그에 비례합니다.
+"""
+
+import os
+import json
+import shutil
+import pandas as pd
+from config import STORE_CONFIG
+from aggregates import ROLLUP_KEYS, HeavyHitters, compute_rollups, merge_rollups
+from schema import align_categories
+
+
+class SalesStore:
+    """판매 데이터 누적 저장소 클래스"""
+
+    def __init__(self, store_dir=None):
+        """
+        Args:
+            store_dir: 저장소 폴더 (None이면 STORE_CONFIG 설정)
+        """
+        self.store_dir = store_dir or STORE_CONFIG['store_dir']
+        self.meta = self._read_meta()
+
+    @property
+    def _meta_path(self):
+        return os.path.join(self.store_dir, 'meta.json')
+
+    def _part_path(self, name):
+        return os.path.join(self.store_dir, 'parts', name)
+
+    def _rollup_path(self, name):
+        return os.path.join(self.store_dir, 'rollups', f'{name}.parquet')
+
+    def _heavy_hitter_path(self, name):
+        return os.path.join(self.store_dir, 'heavy_hitters', f'{name}.parquet')
+
+    def _read_meta(self):
+        """메타 정보를 읽습니다. 저장소가 없으면 None을 반환합니다. (형식 버전이 달라도 읽음)"""
+        if not os.path.exists(self._meta_path):
+            return None
+        with open(self._meta_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_meta(self, meta):
+        """메타 정보를 저장합니다. 메타 파일 교체가 추가 작업의 완료 시점입니다."""
+        tmp_path = f"{self._meta_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._meta_path)
+        self.meta = meta
+
+    @staticmethod
+    def _write_parquet(df, path):
+        """임시 파일에 쓴 뒤 교체하여 Parquet 파일을 저장합니다."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def _write_heavy_hitters(self, heavy_hitters):
+        """헤비 히터 요약을 저장하고 메타 정보에 넣을 {요약 이름: 전체 합계}를 반환합니다."""
+        frames, totals = heavy_hitters.to_frames()
+        for name, frame in frames.items():
+            self._write_parquet(frame, self._heavy_hitter_path(name))
+        return {'capacity': heavy_hitters.capacity, 'totals': totals}
+
+    def exists(self):
+        """저장된 데이터가 있는지 확인합니다. (형식 버전과 관계없이)"""
+        return self.meta is not None
+
+    def is_compatible(self):
+        """저장소가 현재 형식 버전인지 확인합니다."""
+        return self.exists() and self.meta.get('format_version') == STORE_CONFIG['format_version']
+
+    def check_compatible(self):
+        """
+        저장소에 새 행을 추가할 수 있는지 확인합니다.
+        형식 버전이 다른 저장소는 기존 이력을 지우지 않도록 추가를 거부합니다.
+        """
+        if not self.exists():
+            raise RuntimeError("저장소가 없습니다. 먼저 rebuild()로 전체 데이터를 저장하세요.")
+        if not self.is_compatible():
+            raise RuntimeError(
+                f"저장소 형식 버전이 다릅니다 (저장소 {self.meta.get('format_version')}, "
+                f"현재 {STORE_CONFIG['format_version']}). "
+                "원본 전체 데이터로 저장소를 다시 만드세요. (SalesDataLoader.rebuild_store())"
+            )
+
+    def select_new_rows(self, df):
+        """
+        저장된 데이터보다 새로운 행만 반환합니다.
+        판매ID가 있으면 저장된 최대 판매ID보다 큰 행, 없으면 저장된 최대 날짜보다 늦은 행을 고릅니다.
+        """
+        if not self.exists():
+            return df
+        if '판매ID' in df.columns and self.meta['max_id'] is not None:
+            return df[df['판매ID'] > self.meta['max_id']]
+        return df[df['날짜'] > pd.Timestamp(self.meta['max_date'])]
+
+    @staticmethod
+    def _bounds(df, meta=None):
+        """최소/최대 날짜와 최대 판매ID를 기존 메타 정보와 합쳐 계산합니다."""
+        min_date = df['날짜'].min() if len(df) else None
+        max_date = df['날짜'].max() if len(df) else None
+        max_id = int(df['판매ID'].max()) if '판매ID' in df.columns and len(df) else None
+        if meta:
+            if meta['min_date'] is not None and (min_date is None or pd.Timestamp(meta['min_date']) < min_date):
+                min_date = pd.Timestamp(meta['min_date'])
+            if meta['max_date'] is not None and (max_date is None or pd.Timestamp(meta['max_date']) > max_date):
+                max_date = pd.Timestamp(meta['max_date'])
+            if meta['max_id'] is not None and (max_id is None or meta['max_id'] > max_id):
+                max_id = meta['max_id']
+        return {
+            'min_date': min_date.isoformat() if min_date is not None else None,
+            'max_date': max_date.isoformat() if max_date is not None else None,
+            'max_id': max_id,
+        }
+
+    def rebuild(self, df, source=None):
+        """저장소를 비우고 전체 데이터로 다시 만듭니다."""
+        self.clear()
+        rollups = compute_rollups(df)
+        self._write_parquet(df, self._part_path('part-00000.parquet'))
+        for name, rollup in rollups.items():
+            self._write_parquet(rollup, self._rollup_path(name))
+        heavy_hitters = self._write_heavy_hitters(HeavyHitters().add_rows(df))
+
+        meta = {
+            'format_version': STORE_CONFIG['format_version'],
+            'source': str(source) if source is not None else None,
+            'rows': len(df),
+            'columns': [str(col) for col in df.columns],
+            'parts': ['part-00000.parquet'],
+            'part_rows': [len(df)],
+            'next_part': 1,
+            'rollups': sorted(rollups),
+            'heavy_hitters': heavy_hitters,
+        }
+        meta.update(self._bounds(df))
+        self._write_meta(meta)
+
+    def append(self, new_rows):
+        """
+        새 행을 새 파트로 추가하고 저장된 롤업에 더합니다.
+        기존 파트는 읽거나 다시 쓰지 않으므로 비용은 새 행 수와 롤업 크기에만 비례합니다.
+        (파트 수가 max_parts를 넘을 때만 compact()가 최근의 작은 파트들을 병합)
+        """
+        self.check_compatible()
+        if len(new_rows) == 0:
+            return 0
+
+        part_name = f"part-{self.meta['next_part']:05d}.parquet"
+        self._write_parquet(new_rows, self._part_path(part_name))
+
+        rollups = merge_rollups(self.load_rollups(), compute_rollups(new_rows))
+        for name, rollup in rollups.items():
+            self._write_parquet(rollup, self._rollup_path(name))
+        heavy_hitters = self._write_heavy_hitters(self.load_heavy_hitters().add_rows(new_rows))
+
+        meta = dict(self.meta)
+        meta.update({
+            'rows': self.meta['rows'] + len(new_rows),
+            'parts': self.meta['parts'] + [part_name],
+            'part_rows': self.meta['part_rows'] + [len(new_rows)],
+            'next_part': self.meta['next_part'] + 1,
+            'rollups': sorted(rollups),
+            'heavy_hitters': heavy_hitters,
+        })
+        meta.update(self._bounds(new_rows, self.meta))
+        self._write_meta(meta)
+        self.compact()
+        return len(new_rows)
+
+    def compact(self, max_parts=None):
+        """
+        파트 수가 max_parts 이하가 될 때까지 최근 파트들을 병합합니다.
+        마지막 두 파트부터 시작해, 바로 앞 파트가 지금까지 병합할 행 수보다 크지 않으면 범위를 넓힙니다.
+        큰 이력 파트는 작은 최근 파트들이 그만큼 쌓였을 때만 다시 쓰므로 병합 비용은 분할 상환됩니다.
+
+        Args:
+            max_parts: 최대 파트 수 (None이면 STORE_CONFIG 설정)
+
+        Returns:
+            병합한 파트 수 (병합하지 않았으면 0)
+        """
+        max_parts = max(max_parts or STORE_CONFIG['max_parts'], 1)
+        compacted = 0
+        while len(self.meta['parts']) > max_parts:
+            parts, part_rows = self.meta['parts'], self.meta['part_rows']
+            start = len(parts) - 2
+            merged_rows = part_rows[-1] + part_rows[-2]
+            while start > 0 and part_rows[start - 1] <= merged_rows:
+                start -= 1
+                merged_rows += part_rows[start]
+
+            frames = [pd.read_parquet(self._part_path(name)) for name in parts[start:]]
+            part_name = f"part-{self.meta['next_part']:05d}.parquet"
+            self._write_parquet(pd.concat(align_categories(frames), ignore_index=True), self._part_path(part_name))
+
+            meta = dict(self.meta)
+            meta.update({
+                'parts': parts[:start] + [part_name],
+                'part_rows': part_rows[:start] + [merged_rows],
+                'next_part': self.meta['next_part'] + 1,
+            })
+            self._write_meta(meta)
+            # 메타 교체 후에 이전 파트 삭제 (중간에 실패해도 메타가 가리키는 파트는 항상 온전함)
+            for name in parts[start:]:
+                os.remove(self._part_path(name))
+            compacted += len(parts) - start
+        return compacted
+
+    def load_frame(self):
+        """저장된 모든 파트를 읽어 하나의 데이터프레임으로 합칩니다."""
+        if not self.exists():
+            return None
+        frames = [pd.read_parquet(self._part_path(name)) for name in self.meta['parts']]
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(align_categories(frames), ignore_index=True)
+
+    def data_info(self):
+        """
+        파트를 읽지 않고 메타 정보와 롤업으로 데이터 기본 정보를 만듭니다. (collect_data_info와 같은 형식)
+        고유 개수는 거래처별/제품별/분류별 롤업의 결측이 아닌 키 수입니다.
+        """
+        if not self.exists():
+            return {}
+        rollups = self.load_rollups()
+
+        def distinct(name, key):
+            return int(rollups[name][key].notna().sum()) if name in rollups else None
+
+        return {
+            '총_거래건수': self.meta['rows'],
+            '데이터_시작일': pd.Timestamp(self.meta['min_date']) if self.meta['min_date'] else None,
+            '데이터_종료일': pd.Timestamp(self.meta['max_date']) if self.meta['max_date'] else None,
+            '컬럼_목록': list(self.meta['columns']),
+            '거래처_수': distinct('customer', '거래처명'),
+            '제품_수': distinct('product', '제품명'),
+            '제품분류_수': distinct('category', '분류명'),
+        }
+
+    def load_rollups(self):
+        """저장된 롤업 집계를 {롤업 이름: 데이터프레임}으로 읽습니다."""
+        if not self.exists():
+            return {}
+        return {name: pd.read_parquet(self._rollup_path(name))
+                for name in self.meta.get('rollups', []) if name in ROLLUP_KEYS}
+
+    def load_heavy_hitters(self):
+        """
+        저장된 헤비 히터 요약(거래처명/제품명별 매출액, 거래건수 상위 후보)을 읽습니다.
+        저장소가 없으면 빈 요약을 반환합니다.
+        """
+        info = (self.meta or {}).get('heavy_hitters')
+        if not info:
+            return HeavyHitters()
+        frames = {name: pd.read_parquet(self._heavy_hitter_path(name)) for name in info['totals']
+                  if os.path.exists(self._heavy_hitter_path(name))}
+        return HeavyHitters.from_frames(frames, info['totals'], info['capacity'])
+
+    def clear(self):
+        """저장소를 삭제합니다."""
+        if os.path.isdir(self.store_dir):
+            shutil.rmtree(self.store_dir)
+        os.makedirs(self.store_dir, exist_ok=True)
+        self.meta = None
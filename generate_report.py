@@ -7,10 +7,12 @@
     python generate_report.py
     또는
     py -3 generate_report.py
+    python generate_report.py --serial   (분석/차트 작업을 순차 실행)
 """
 
 import os
 import sys
+import time
 from datetime import datetime
 
 # 모듈 임포트
@@ -22,11 +24,24 @@ from analyzers import (
     CustomerAnalyzer,
     DiscountAnalyzer
 )
+from analyzers.parallel import run_tasks, compute_tables, format_timings
 from report_generator import ReportGenerator
 
 
-def main():
-    """메인 실행 함수"""
+def print_timings(title, timings, elapsed):
+    """작업별 소요 시간을 출력합니다."""
+    print(f"  ⏱ {title}")
+    for line in format_timings(timings, elapsed):
+        print(f"    {line}")
+
+
+def main(mode=None):
+    """
+    메인 실행 함수
+    
+    Args:
+        mode: 분석/차트 작업 실행 방식 'parallel' 또는 'serial' (None이면 PARALLEL_CONFIG 설정)
+    """
     print("=" * 80)
     print("판매 데이터 분석 보고서 생성 시작")
     print("=" * 80)
@@ -45,31 +60,30 @@ def main():
     data_info = loader.get_data_info()
     print()
     
-    # 2. 데이터 분석
+    # 2. 데이터 분석 (모든 분석기가 공유하는 집계 큐브를 먼저 만든 뒤,
+    #    분석기별 집계 테이블 계산을 동시에 실행하고 결과는 작업 순서대로 모음)
     print("📊 2단계: 데이터 분석 중...")
-    
-    # KPI 분석
-    print("  - KPI 분석...")
-    kpi_analyzer = KPIAnalyzer(df)
-    kpis = kpi_analyzer.get_kpi_summary()
-    
-    # 시계열 분석
-    print("  - 시계열 분석...")
-    timeseries_analyzer = TimeSeriesAnalyzer(df)
-    
-    # 제품 분석
-    print("  - 제품 분석...")
-    product_analyzer = ProductAnalyzer(df)
-    
-    # 거래처 분석
-    print("  - 거래처 분석...")
-    customer_analyzer = CustomerAnalyzer(df)
-    
-    # 할인 분석
-    print("  - 할인 분석...")
-    discount_analyzer = DiscountAnalyzer(df)
+    started = time.perf_counter()
+    cube = loader.get_daily_rollup()
+    print(f"✓ 집계 큐브 준비 완료: {len(cube):,}행 ({(time.perf_counter() - started) * 1000:,.1f}ms)")
+    
+    print("  - KPI, 시계열, 제품, 거래처, 할인 분석...")
+    started = time.perf_counter()
+    results, timings = run_tasks([
+        ('KPI 분석', compute_tables, KPIAnalyzer, df, 'kpi'),
+        ('시계열 분석', compute_tables, TimeSeriesAnalyzer, df, 'timeseries'),
+        ('제품 분석', compute_tables, ProductAnalyzer, df, 'product'),
+        ('거래처 분석', compute_tables, CustomerAnalyzer, df, 'customer'),
+        ('할인 분석', compute_tables, DiscountAnalyzer, df, 'discount'),
+    ], mode=mode)
+    kpis = results['KPI 분석'].get_kpi_summary()
+    timeseries_analyzer = results['시계열 분석']
+    product_analyzer = results['제품 분석']
+    customer_analyzer = results['거래처 분석']
+    discount_analyzer = results['할인 분석']
     
     print("✓ 분석 완료")
+    print_timings("분석 소요 시간", timings, time.perf_counter() - started)
     print()
     
     # 3. 보고서 생성
@@ -82,8 +96,9 @@ def main():
         'discount': discount_analyzer
     }
     
-    report_gen = ReportGenerator(data_info, kpis, analyzers)
+    report_gen = ReportGenerator(data_info, kpis, analyzers, mode=mode)
     report_gen.generate_html()
+    print_timings("차트 생성 소요 시간", report_gen.chart_timings, report_gen.chart_elapsed)
     
     # 4. 보고서 저장
     # output 디렉토리 생성
@@ -129,7 +144,7 @@ def main():
 
 if __name__ == '__main__':
     try:
-        output_path = main()
+        output_path = main('serial' if '--serial' in sys.argv[1:] else None)
         
         # Windows에서 자동으로 브라우저 열기 (선택사항)
         try:
@@ -5,28 +5,36 @@
 분석 결과를 HTML 보고서로 생성합니다.
 """
 
+import time
 import pandas as pd
 from datetime import datetime
 from jinja2 import Template
 from config import COLORS, REPORT_CONFIG
+from analyzers.parallel import CHART_BUILDERS, build_charts
 
 
 class ReportGenerator:
     """HTML 보고서 생성 클래스"""
     
-    def __init__(self, data_info, kpis, analyzers):
+    def __init__(self, data_info, kpis, analyzers, mode=None):
         """
         Args:
             data_info: 데이터 정보 딕셔너리
             kpis: KPI 분석 결과
             analyzers: 분석기 객체들 (timeseries, product, customer, discount)
+            mode: 차트 생성 방식 'parallel' 또는 'serial' (None이면 PARALLEL_CONFIG 설정)
         """
         self.data_info = data_info
         self.kpis = kpis
+        self.analyzers = analyzers
         self.timeseries = analyzers['timeseries']
         self.product = analyzers['product']
         self.customer = analyzers['customer']
         self.discount = analyzers['discount']
+        self.mode = mode
+        self.chart_timings = {}   # 차트 ID -> 생성 소요 시간(초)
+        self.chart_elapsed = 0.0   # 전체 차트 생성 경과 시간(초)
+        self.chart_ids = []   # 생성된 차트 ID (데이터가 없어 만들지 않은 차트 제외)
         self.report_html = ""
     
     def generate_html(self):
@@ -310,6 +318,19 @@ class ReportGenerator:
             <div class="chart-container">
                 <div id="weekday-chart"></div>
             </div>
+            <div class="chart-container">
+                <div id="rolling-sales-chart"></div>
+            </div>
+            <div class="grid-2col">
+                <div class="chart-container">
+                    <div id="cumulative-sales-chart"></div>
+                </div>
+                {% if yoy_chart %}
+                <div class="chart-container">
+                    <div id="yoy-chart"></div>
+                </div>
+                {% endif %}
+            </div>
         </div>
         
         <!-- 3. 제품 분석 -->
@@ -341,6 +362,11 @@ class ReportGenerator:
             </div>
             <h3 style="margin-top: 30px; margin-bottom: 15px; color: {{ colors.primary_blue }};">주요 거래처 상세 정보</h3>
             {{ customer_detail_table }}
+            {% if cohort_chart %}
+            <div class="chart-container" style="margin-top: 30px;">
+                <div id="cohort-retention-chart"></div>
+            </div>
+            {% endif %}
         </div>
         
         <!-- 5. 할인 분석 -->
@@ -428,6 +454,8 @@ class ReportGenerator:
             'top_products_by_category_table': top_products_html,
             'customer_detail_table': customer_detail_html,
             'discount_rate_chart': self.discount.get_discount_rate_distribution().empty == False,
+            'yoy_chart': 'yoy-chart' in self.chart_ids,
+            'cohort_chart': 'cohort-retention-chart' in self.chart_ids,
             'chart_scripts': chart_scripts
         }
     
@@ -488,34 +516,17 @@ class ReportGenerator:
         return html
     
     def _generate_chart_scripts(self):
-        """모든 차트의 Plotly 스크립트를 생성합니다."""
-        scripts = []
-        
-        # 시계열 차트
-        scripts.append(self._fig_to_script(self.timeseries.create_monthly_sales_chart(), 'monthly-sales-chart'))
-        scripts.append(self._fig_to_script(self.timeseries.create_monthly_transactions_chart(), 'monthly-transactions-chart'))
-        scripts.append(self._fig_to_script(self.timeseries.create_quarterly_sales_chart(), 'quarterly-sales-chart'))
-        scripts.append(self._fig_to_script(self.timeseries.create_weekday_chart(), 'weekday-chart'))
-        
-        # 제품 차트
-        scripts.append(self._fig_to_script(self.product.create_category_pie_chart(), 'category-pie-chart'))
-        scripts.append(self._fig_to_script(self.product.create_category_bar_chart(), 'category-bar-chart'))
-        scripts.append(self._fig_to_script(self.product.create_price_distribution_chart(), 'price-distribution-chart'))
-        
-        # 거래처 차트
-        scripts.append(self._fig_to_script(self.customer.create_top_customers_chart(), 'top-customers-chart'))
-        scripts.append(self._fig_to_script(self.customer.create_customer_transaction_chart(), 'customer-transactions-chart'))
-        
-        # 할인 차트
-        scripts.append(self._fig_to_script(self.discount.create_discount_application_chart(), 'discount-application-chart'))
-        
-        discount_rate_chart = self.discount.create_discount_rate_chart()
-        if discount_rate_chart:
-            scripts.append(self._fig_to_script(discount_rate_chart, 'discount-rate-chart'))
-        
-        scripts.append(self._fig_to_script(self.discount.create_category_discount_chart(), 'category-discount-chart'))
+        """
+        모든 차트의 Plotly 스크립트를 생성합니다.
+        차트 생성과 스크립트 변환은 차트마다 병렬로 실행하고, 결과는 CHART_BUILDERS 순서로 합칩니다.
+        """
+        started = time.perf_counter()
+        scripts, self.chart_timings = build_charts(self.analyzers, convert=self._fig_to_script, mode=self.mode)
+        self.chart_elapsed = time.perf_counter() - started
+        self.chart_ids = list(scripts)
         
-        return '\n'.join(scripts)
+        # 데이터가 없어 만들지 않은 차트(할인율 분포 등)는 제외
+        return '\n'.join(scripts[chart_id] for chart_id, _, _ in CHART_BUILDERS if chart_id in scripts)
     
     def _fig_to_script(self, fig, div_id):
         """Plotly Figure를 JavaScript 스크립트로 변환합니다."""
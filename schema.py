@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+데이터 스키마 모듈
+판매 데이터 컬럼의 논리 타입과 로드 시 적용할 메모리 절약형 dtype 계획을 정의합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+# 컬럼별 논리 타입
+#   category: 사전 인코딩(범주형) 문자열 차원
+#   int:      결측치가 없으면 가장 작은 정수형으로 축소
+#   money:    모든 값이 정수이면 int64, 아니면 float64 유지
+#   float:    float64 유지 (비율 값은 float32로 줄이면 합계/평균이 달라짐)
+#   datetime: datetime64 유지
+SALES_SCHEMA = {
+    # 원본 컬럼
+    '판매ID': 'int',
+    '날짜': 'datetime',
+    '거래처명': 'category',
+    '분류명': 'category',
+    '제품코드': 'int',
+    '제품명': 'category',
+    '색상': 'category',
+    '단가': 'money',
+    '수량': 'int',
+    'Discount': 'float',
+    '금액': 'money',
+    # 파생 컬럼
+    '년': 'int',
+    '월': 'int',
+    '분기': 'int',
+    '년월키': 'int',
+    '분기키': 'int',
+    '요일번호': 'int',
+    '할인율': 'float',
+    '할인전금액': 'money',
+    '할인액': 'money',
+    '할인적용': 'category',
+    '출처': 'category',
+}
+
+
+def _plan_dtype(series, logical_type):
+    """논리 타입과 실제 값을 보고 적용할 dtype을 결정합니다. 변경이 없으면 None을 반환합니다."""
+    if logical_type == 'category':
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return None
+        return 'category'
+
+    if series.dtype.kind not in 'iuf' or series.isna().any():
+        return None
+
+    if logical_type == 'int':
+        if series.dtype.kind == 'f' and not np.array_equal(series, np.floor(series)):
+            return None
+        return pd.to_numeric(series, downcast='integer').dtype
+
+    if logical_type == 'money':
+        if series.dtype.kind in 'iu':
+            return 'int64'
+        values = series.to_numpy()
+        if np.isfinite(values).all() and np.array_equal(values, np.floor(values)) \
+                and np.abs(values).max(initial=0) < 2 ** 53:
+            return 'int64'
+        return None
+
+    return None
+
+
+def apply_dtype_plan(df, schema=None):
+    """
+    스키마에 따라 컬럼 dtype을 메모리 절약형으로 변환합니다.
+    분석 결과가 달라지지 않도록 값이 정확히 보존되는 경우에만 변환합니다.
+
+    Args:
+        df: 파생 컬럼까지 생성된 판매 데이터프레임
+        schema: {컬럼: 논리 타입} (None이면 SALES_SCHEMA)
+
+    Returns:
+        dtype이 변환된 데이터프레임 (입력 데이터프레임을 직접 수정)
+    """
+    schema = schema or SALES_SCHEMA
+    for col, logical_type in schema.items():
+        if col not in df.columns:
+            continue
+        dtype = _plan_dtype(df[col], logical_type)
+        if dtype is not None and df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def align_categories(frames):
+    """
+    여러 데이터프레임의 공통 범주형 컬럼을 범주 합집합으로 맞춥니다.
+    합친 뒤에도 범주형이 유지되도록 pd.concat 전에 사용합니다.
+    """
+    columns = [col for col in frames[0].columns
+               if all(col in frame.columns and isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames)]
+    for col in columns:
+        categories = pd.api.types.union_categoricals([frame[col] for frame in frames], sort_categories=True).categories
+        frames = [frame.assign(**{col: frame[col].cat.set_categories(categories)}) for frame in frames]
+    return frames
+
+
+def memory_report(before, after):
+    """
+    dtype 계획 적용 전후의 컬럼별 메모리 사용량을 비교합니다.
+
+    Args:
+        before: 컬럼별 메모리 사용량 (바이트, Series) - df.memory_usage(deep=True)
+        after: 적용 후 데이터프레임
+
+    Returns:
+        컬럼, 적용전_bytes, 적용후_bytes, 적용후_dtype, 절감률 컬럼을 가진 데이터프레임
+        (마지막 행은 합계)
+    """
+    after_usage = after.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        '컬럼': after_usage.index,
+        '적용전_bytes': before.reindex(after_usage.index).fillna(0).astype('int64').values,
+        '적용후_bytes': after_usage.values,
+        '적용후_dtype': [str(after[col].dtype) for col in after_usage.index],
+    })
+    total = pd.DataFrame([{
+        '컬럼': '합계',
+        '적용전_bytes': report['적용전_bytes'].sum(),
+        '적용후_bytes': report['적용후_bytes'].sum(),
+        '적용후_dtype': '',
+    }])
+    report = pd.concat([report, total], ignore_index=True)
+    report['절감률'] = (1 - report['적용후_bytes'] / report['적용전_bytes'].where(report['적용전_bytes'] > 0)) * 100
+    report['절감률'] = report['절감률'].round(1)
+    return report
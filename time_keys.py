@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시간 키 모듈
+날짜로부터 정수 시간 키(년월, 분기, 요일)를 만들고,
+집계 결과를 표시할 때만 한글 라벨로 변환합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+# 요일 번호(0=월요일 ~ 6=일요일) 순서의 한글 요일명
+WEEKDAY_NAMES = ['월요일', '화요일', '수요일', '목요일', '금요일', '토요일', '일요일']
+
+# 기간 단위 (이름 -> 표시명)
+GRANULARITIES = {
+    'day': '일',
+    'week': '주',
+    'month': '월',
+    'quarter': '분기',
+    'fiscal_year': '회계연도',
+}
+
+# 단위별 전년 동기 기간 키 차이 (일 단위는 같은 요일이 되도록 52주)
+YEAR_OVER_YEAR_LAGS = {
+    'day': 364,
+    'week': 53,
+    'month': 12,
+    'quarter': 4,
+    'fiscal_year': 1,
+}
+
+
+def derive_time_keys(dates):
+    """
+    날짜 Series로부터 정수 시간 키를 한 번에 계산합니다.
+
+    Returns:
+        {'년', '월', '분기', '년월키', '분기키', '요일번호'} 컬럼 딕셔너리
+        - 년월키: 년 * 12 + (월 - 1)
+        - 분기키: 년 * 4 + (분기 - 1)
+        - 요일번호: 0(월요일) ~ 6(일요일)
+    """
+    if dates.isna().any():
+        # 결측 날짜가 있으면 pandas 접근자로 계산 (결측은 NaN 유지)
+        year, month, weekday = dates.dt.year, dates.dt.month, dates.dt.dayofweek
+        quarter = dates.dt.quarter
+        return {
+            '년': year,
+            '월': month,
+            '분기': quarter,
+            '년월키': year * 12 + month - 1,
+            '분기키': year * 4 + quarter - 1,
+            '요일번호': weekday,
+        }
+
+    values = dates.to_numpy()
+    months = values.astype('datetime64[M]').astype(np.int64)   # 1970-01 기준 월 수
+    days = values.astype('datetime64[D]').astype(np.int64)     # 1970-01-01(목요일) 기준 일 수
+
+    year = (months // 12 + 1970).astype(np.int32)
+    month = (months % 12 + 1).astype(np.int32)
+    quarter = ((month - 1) // 3 + 1).astype(np.int32)
+    return {
+        '년': year,
+        '월': month,
+        '분기': quarter,
+        '년월키': (months + 1970 * 12).astype(np.int32),
+        '분기키': (year * 4 + quarter - 1).astype(np.int32),
+        '요일번호': ((days + 3) % 7).astype(np.int8),
+    }
+
+
+def year_month_label(keys):
+    """년월키를 'YYYY-MM' 형식의 라벨로 변환합니다."""
+    keys = pd.Series(keys).astype('int64')
+    return (keys // 12).astype(str) + '-' + (keys % 12 + 1).astype(str).str.zfill(2)
+
+
+def quarter_label(keys):
+    """분기키를 'YYYYQn' 형식의 라벨로 변환합니다."""
+    keys = pd.Series(keys).astype('int64')
+    return (keys // 4).astype(str) + 'Q' + (keys % 4 + 1).astype(str)
+
+
+def weekday_label(indexes):
+    """요일번호를 순서가 있는 한글 요일명 범주형으로 변환합니다."""
+    return pd.Categorical.from_codes(np.asarray(indexes, dtype=np.int64), categories=WEEKDAY_NAMES, ordered=True)
+
+
+def _day_year(days):
+    """일 수(1970-01-01 기준)의 연도를 계산합니다."""
+    return days.astype('datetime64[D]').astype('datetime64[Y]').astype(np.int64) + 1970
+
+
+def period_keys(days, granularity, fiscal_year_start_month=1):
+    """
+    일 수 배열(1970-01-01 기준)을 기간 단위의 정수 키로 변환합니다. 키 순서 = 시간 순서입니다.
+
+    - day: 일 수 그대로
+    - week: ISO 연도 * 53 + (ISO 주 - 1) (월요일 시작, 목요일이 속한 해가 ISO 연도)
+    - month: 년월키, quarter: 분기키 (derive_time_keys와 같음)
+    - fiscal_year: 회계연도 시작 연도
+    """
+    days = np.asarray(days, dtype=np.int64)
+    if granularity == 'day':
+        return days
+    if granularity == 'week':
+        thursday = days - (days + 3) % 7 + 3
+        iso_year = _day_year(thursday)
+        jan1 = (iso_year - 1970).astype('datetime64[Y]').astype('datetime64[D]').astype(np.int64)
+        return iso_year * 53 + (thursday - jan1) // 7
+    months = days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) + 1970 * 12
+    if granularity == 'month':
+        return months
+    if granularity == 'quarter':
+        return months // 3
+    if granularity == 'fiscal_year':
+        return (months - (fiscal_year_start_month - 1)) // 12
+    raise ValueError(f"지원하지 않는 기간 단위입니다: {granularity}")
+
+
+def period_label(keys, granularity):
+    """period_keys의 기간 키를 표시용 라벨로 변환합니다."""
+    keys = pd.Series(keys).astype('int64')
+    if granularity == 'day':
+        return pd.Series(keys.to_numpy().astype('datetime64[D]')).dt.strftime('%Y-%m-%d')
+    if granularity == 'week':
+        return (keys // 53).astype(str) + '-W' + (keys % 53 + 1).astype(str).str.zfill(2)
+    if granularity == 'month':
+        return year_month_label(keys)
+    if granularity == 'quarter':
+        return quarter_label(keys)
+    if granularity == 'fiscal_year':
+        return 'FY' + keys.astype(str)
+    raise ValueError(f"지원하지 않는 기간 단위입니다: {granularity}")